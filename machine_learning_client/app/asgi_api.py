@@ -0,0 +1,165 @@
+"""
+Async (ASGI) entry point of the sentiment service.
+
+Serves the same POST /analyze contract as api.py without holding a thread
+through the database write: scoring runs on a thread pool and analyses are
+stored with pymongo's AsyncMongoClient. The Flask app in api.py stays the
+default (see the Dockerfile); this module shares its analyzer, limits and
+scoring helpers, so both return the same results.
+
+Run with any ASGI server, e.g.:
+    pip install uvicorn
+    uvicorn asgi_api:app --host 0.0.0.0 --port 5000
+"""
+
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from pymongo import AsyncMongoClient
+
+import api
+
+# Threads scoring requests off the event loop
+SCORE_WORKERS = int(os.environ.get("ASGI_SCORE_WORKERS", "4"))
+
+# Connect to MongoDB (the client connects lazily, on the server's loop)
+try:
+    client = AsyncMongoClient(api.MONGO_URI)
+    analyses = client[api.DB_NAME].analyses
+    DB_CONNECTED = True
+except Exception as e:
+    print(f"Failed to set up the async MongoDB client: {e}")
+    client = analyses = None
+    DB_CONNECTED = False
+
+executor = ThreadPoolExecutor(SCORE_WORKERS, thread_name_prefix="score")
+
+# read_body's result when the client disconnects before the body is complete
+DISCONNECTED = object()
+
+
+async def read_body(receive, limit):
+    """
+    The request body, None once it grows past `limit` bytes, or DISCONNECTED
+    if the client goes away first.
+    """
+    chunks = []
+    size = 0
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return DISCONNECTED
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > limit:
+            return None
+        chunks.append(chunk)
+        if not message.get("more_body", False):
+            return b"".join(chunks)
+
+
+async def respond(send, status, payload, headers=()):
+    """Send `payload` as a JSON response."""
+    body = json.dumps(payload).encode("utf-8")
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("ascii")),
+                *headers,
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+async def analyze(body):
+    """
+    Score and store the text of a POST /analyze body.
+
+    Returns:
+        tuple: (HTTP status, JSON payload), as api.analyze would answer.
+    """
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return 400, {"error": "Invalid JSON"}
+    text = data.get("text", "") if isinstance(data, dict) else ""
+
+    if not text or not isinstance(text, str):
+        return 400, {"error": "No text provided"}
+    if len(text) > api.MAX_TEXT_CHARS:
+        return 413, {"error": f"Text longer than {api.MAX_TEXT_CHARS} characters"}
+
+    # one read of the global, in case of a swap
+    scorer = api.analyzer
+    scores, chunking = await asyncio.get_running_loop().run_in_executor(
+        executor, api.score_text, scorer, text
+    )
+    if chunking is not None and not chunking["scored_chunks"]:
+        return 503, {"error": "Scoring time budget exceeded"}
+    result = api.analysis_result(text, scores, chunking)
+
+    if DB_CONNECTED:
+        try:
+            await analyses.insert_one(
+                dict(
+                    result,
+                    lexicon_version=scorer.lexicon_version,
+                    timestamp=datetime.now(timezone.utc),
+                )
+            )
+        except Exception as storage_error:
+            print(f"Error storing in database: {storage_error}")
+
+    return 200, result
+
+
+async def lifespan(receive, send):
+    """Answer the server's startup and shutdown events."""
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            if client is not None:
+                await client.close()
+            executor.shutdown(wait=False)
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    """ASGI application: POST /analyze, everything else 404 / 405."""
+    if scope["type"] == "lifespan":
+        await lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+    if scope["path"] != "/analyze":
+        await respond(send, 404, {"error": "Not found"})
+        return
+    if scope["method"] != "POST":
+        await respond(send, 405, {"error": "Method not allowed"}, [(b"allow", b"POST")])
+        return
+
+    body = await read_body(receive, api.app.config["MAX_CONTENT_LENGTH"])
+    if body is DISCONNECTED:
+        # nobody is left to answer
+        return
+    if body is None:
+        await respond(send, 413, {"error": "Request body too large"})
+        return
+    status, payload = await analyze(body)
+    await respond(send, status, payload)
+
+
+if __name__ == "__main__":
+    import uvicorn  # pylint: disable=import-error,import-outside-toplevel
+
+    uvicorn.run(app, host="0.0.0.0", port=5000)
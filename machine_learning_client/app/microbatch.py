@@ -0,0 +1,167 @@
+"""
+Adaptive micro-batching of concurrent single-item requests.
+
+Callers submit one item each and block for their own result. There is no
+dispatcher thread: the oldest waiting caller becomes the leader, takes
+whatever has queued up (at most `max_batch` items), passes leadership to the
+oldest caller still waiting, and runs its batch through one batched handler
+call (for the API: one polarity_scores_batch and one insert_many). The
+handler may return an exception in place of an item's result, which is then
+raised from that item's submit only. The next
+batch gathers while this one runs, so the handler must be thread-safe. A lone
+request runs on its own thread without any handoff.
+
+The gathering window adapts to load. The leader only waits for more items
+when the recent arrival rate makes another arrival within the window likely.
+The window doubles (up to `max_wait`) after a wait that gathered more items,
+and halves (down to `max_wait / 32`) after one that gathered nothing.
+
+Usage:
+    batcher = MicroBatcher(score_many, max_batch=64, max_wait=0.002)
+    result = batcher.submit(text)
+"""
+
+import threading
+import time
+
+# weight of the newest inter-arrival gap in the moving average
+ARRIVAL_SMOOTHING = 0.2
+
+# the window never shrinks below max_wait / WINDOW_FLOOR_DIVISOR
+WINDOW_FLOOR_DIVISOR = 32
+
+
+class _Slot:  # pylint: disable=too-few-public-methods
+    """One submitted item, its outcome, and the event its caller waits on."""
+
+    __slots__ = ("item", "result", "error", "done", "lead", "event")
+
+    def __init__(self, item):
+        self.item = item
+        self.result = None
+        self.error = None
+        self.done = False
+        self.lead = False
+        self.event = threading.Event()
+
+
+class MicroBatcher:  # pylint: disable=too-many-instance-attributes
+    """
+    Gather concurrent submits into batches for `handler`.
+
+    Args:
+        handler (callable): Takes a list of items and returns a list of
+            results in the same order; an exception instance as a result is
+            raised from its item's submit.
+        max_batch (int): Most items per handler call.
+        max_wait (float): Longest seconds a batch waits for more items.
+    """
+
+    def __init__(self, handler, max_batch=64, max_wait=0.002):
+        self.handler = handler
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._window = max_wait
+        self._pending = []
+        self._leading = False
+        self._lock = threading.Lock()
+        self._arrived = threading.Condition(self._lock)
+        self._last_arrival = None
+        # start "idle": one expected arrival per second
+        self._mean_gap = 1.0
+        self._counters = {"items": 0, "batches": 0, "waited": 0, "largest": 0}
+
+    def submit(self, item):
+        """Handle `item` in the next batch and return its result."""
+        slot = _Slot(item)
+        now = time.monotonic()
+        with self._lock:
+            if self._last_arrival is not None:
+                self._mean_gap += ARRIVAL_SMOOTHING * (
+                    now - self._last_arrival - self._mean_gap
+                )
+            self._last_arrival = now
+            self._pending.append(slot)
+            if self._leading:
+                self._arrived.notify()
+            else:
+                self._leading = slot.lead = True
+        if not slot.lead:
+            slot.event.wait()
+        if not slot.done:
+            # leading, or handed leadership while still queued
+            self._lead()
+        if slot.error is not None:
+            raise slot.error
+        return slot.result
+
+    def window(self):
+        """Seconds the next partial batch would wait for more items."""
+        with self._lock:
+            return self._current_window()
+
+    def stats(self):
+        """Batch counters and the current window for monitoring."""
+        with self._lock:
+            batches = self._counters["batches"]
+            return dict(
+                self._counters,
+                mean_batch=self._counters["items"] / batches if batches else 0.0,
+                mean_gap_ms=self._mean_gap * 1000,
+                window_ms=self._current_window() * 1000,
+            )
+
+    def _current_window(self):
+        if self._mean_gap >= self._window:
+            return 0.0
+        return self._window
+
+    def _take_batch(self):
+        """Wait out the window (if any), then dequeue up to max_batch slots."""
+        with self._lock:
+            window = self._current_window()
+            if window and len(self._pending) < self.max_batch:
+                self._counters["waited"] += 1
+                gathered = len(self._pending)
+                deadline = time.monotonic() + window
+                while len(self._pending) < self.max_batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._arrived.wait(remaining)
+                if len(self._pending) > gathered:
+                    self._window = min(self.max_wait, self._window * 2)
+                else:
+                    self._window = max(
+                        self.max_wait / WINDOW_FLOOR_DIVISOR, self._window / 2
+                    )
+            batch = self._pending[: self.max_batch]
+            del self._pending[: self.max_batch]
+            self._counters["items"] += len(batch)
+            self._counters["batches"] += 1
+            self._counters["largest"] = max(self._counters["largest"], len(batch))
+        return batch
+
+    def _lead(self):
+        """Take a batch (holding the leader's own slot), hand over, run it."""
+        batch = self._take_batch()
+        with self._lock:
+            if self._pending:
+                self._pending[0].lead = True
+                self._pending[0].event.set()
+            else:
+                self._leading = False
+        try:
+            results = self.handler([slot.item for slot in batch])
+        except Exception as error:  # pylint: disable=broad-except
+            for slot in batch:
+                slot.error = error
+        else:
+            for slot, result in zip(batch, results):
+                if isinstance(result, Exception):
+                    slot.error = result
+                else:
+                    slot.result = result
+        for slot in batch:
+            slot.done = True
+            slot.event.set()
@@ -0,0 +1,233 @@
+"""
+Offline bulk scoring: stream texts through VADER with constant memory.
+
+Reads NDJSON, CSV or plain-text lines from a file or stdin, scores them lazily
+and writes NDJSON or CSV incrementally. Progress and throughput go to stderr.
+
+Usage:
+    python stream_score.py reviews.ndjson -o scored.ndjson
+    cat notes.txt | python stream_score.py --output-format csv > scored.csv
+    python stream_score.py dump.csv --text-field body --workers 4
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+from itertools import tee
+
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer, score_corpus
+
+
+# Mapping functions
+def score_to_color(score):
+    """Maps a compound sentiment score to a color representation."""
+    if score <= -0.6:
+        return "black"
+    if score <= -0.2:
+        return "red"
+    if score < 0.2:
+        return "green"
+    if score < 0.6:
+        return "blue"
+    return "orange"
+
+
+def sentiment_to_interpretation(score):
+    """Maps a compound sentiment score to an interpretation with emoji and emotion labels."""
+    if score <= -0.6:
+        return "⬛️ Very Negative - Shame, Powerlessness"
+    if score <= -0.2:
+        return "🟥 Negative - Anger, Anxiety, Blame"
+    if score < 0.2:
+        return "🟩 Neutral - Calm, Relaxed, Apathy"
+    if score < 0.6:
+        return "🟦 Positive - Hope, Motivation, Optimism"
+    return "🟧 Very Positive - Joy, Gratitude, Love"
+
+
+def detect_format(path):
+    """Guess the input format from a file name ("-" means stdin, read as text)."""
+    lowered = path.lower()
+    if lowered.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    if lowered.endswith(".csv"):
+        return "csv"
+    return "text"
+
+
+def read_records(stream, input_format, text_field="text"):
+    """
+    Lazily yield one dict per input record. Malformed NDJSON lines are
+    reported on stderr with their line number and skipped.
+
+    Args:
+        stream: Open text stream to read from.
+        input_format (str): "ndjson", "csv" or "text".
+        text_field (str): Field holding the text in NDJSON/CSV records.
+
+    Returns:
+        generator: Records with the text under `text_field`.
+    """
+    if input_format == "csv":
+        yield from csv.DictReader(stream)
+        return
+    for line_number, line in enumerate(stream, 1):
+        line = line.rstrip("\r\n")
+        if input_format == "text":
+            yield {text_field: line}
+        elif line.strip():
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as error:
+                print(f"skipping line {line_number}: {error}", file=sys.stderr)
+                continue
+            # a bare JSON string is a record with only the text
+            yield record if isinstance(record, dict) else {text_field: record}
+
+
+def score_records(records, text_field="text", workers=1, chunk_size=256):
+    """
+    Lazily pair each record with its scores, color and interpretation.
+
+    Records are read ahead only as far as the scorer needs, so memory stays
+    bounded by `workers` and `chunk_size` rather than by the input size.
+    """
+    records, for_texts = tee(records)
+    texts = (str(record.get(text_field) or "") for record in for_texts)
+    if workers > 1:
+        all_scores = score_corpus(texts, workers=workers, chunk_size=chunk_size)
+    else:
+        all_scores = SentimentIntensityAnalyzer().iter_polarity_scores(texts)
+    for record, scores in zip(records, all_scores):
+        compound_score = scores["compound"]
+        color = score_to_color(compound_score)
+        interpretation = sentiment_to_interpretation(compound_score)
+        yield record, scores, color, interpretation
+
+
+def write_results(results, stream, output_format):
+    """
+    Write scored records incrementally and yield once per written record.
+
+    NDJSON output keeps every input field and adds scores, color and
+    interpretation; CSV output flattens the scores into columns.
+    """
+    writer = None
+    for record, scores, color, interpretation in results:
+        if output_format == "csv":
+            row = dict(record)
+            row.update(scores)
+            row["color"] = color
+            row["interpretation"] = interpretation
+            if writer is None:
+                writer = csv.DictWriter(
+                    stream, fieldnames=list(row), extrasaction="ignore"
+                )
+                writer.writeheader()
+            writer.writerow(row)
+        else:
+            document = dict(record)
+            document.update(
+                {"scores": scores, "color": color, "interpretation": interpretation}
+            )
+            stream.write(json.dumps(document, ensure_ascii=False) + "\n")
+        yield record
+
+
+class ProgressReporter:
+    """Report progress and throughput to stderr at most every `interval` seconds."""
+
+    def __init__(self, stream=None, interval=2.0):
+        self.stream = stream if stream is not None else sys.stderr
+        self.interval = interval
+        self.count = 0
+        self.started = time.perf_counter()
+        self.last_report = self.started
+
+    def tick(self):
+        """Count one record and report if the interval has passed."""
+        self.count += 1
+        now = time.perf_counter()
+        if now - self.last_report >= self.interval:
+            self.last_report = now
+            self._report(now, "scored")
+
+    def finish(self):
+        """Print the final summary line."""
+        self._report(time.perf_counter(), "done:")
+
+    def _report(self, now, label):
+        elapsed = max(now - self.started, 1e-9)
+        print(
+            f"{label} {self.count} texts in {elapsed:.1f}s "
+            f"({self.count / elapsed:.0f} texts/s)",
+            file=self.stream,
+            flush=True,
+        )
+
+
+def run(in_stream, out_stream, options):
+    """
+    Stream records from `in_stream` to `out_stream`.
+
+    Args:
+        in_stream: Open text stream with the input records.
+        out_stream: Open text stream for the scored records.
+        options: Parsed arguments (formats, text field, workers, chunk size).
+
+    Returns:
+        int: Number of records written.
+    """
+    progress = ProgressReporter()
+    records = read_records(in_stream, options.input_format, options.text_field)
+    results = score_records(
+        records, options.text_field, options.workers, options.chunk_size
+    )
+    for _ in write_results(results, out_stream, options.output_format):
+        progress.tick()
+    progress.finish()
+    return progress.count
+
+
+def _open_stream(path, mode):
+    """Open `path` for the pipeline; "-" maps to stdin/stdout."""
+    if path == "-":
+        return sys.stdin if mode == "r" else sys.stdout
+    # newline="" lets the csv module handle line endings itself
+    return open(  # pylint: disable=consider-using-with
+        path, mode, encoding="utf-8", newline=""
+    )
+
+
+def main(argv=None):
+    """Parse command line arguments and run the pipeline."""
+    parser = argparse.ArgumentParser(description="Stream texts through VADER.")
+    parser.add_argument("input", nargs="?", default="-", help="input file or -")
+    parser.add_argument("-o", "--output", default="-", help="output file or -")
+    parser.add_argument(
+        "--input-format", choices=["auto", "ndjson", "csv", "text"], default="auto"
+    )
+    parser.add_argument("--output-format", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument("--text-field", default="text")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--chunk-size", type=int, default=256)
+    args = parser.parse_args(argv)
+
+    if args.input_format == "auto":
+        args.input_format = detect_format(args.input)
+
+    in_stream = _open_stream(args.input, "r")
+    out_stream = _open_stream(args.output, "w")
+    try:
+        run(in_stream, out_stream, args)
+    finally:
+        if in_stream is not sys.stdin:
+            in_stream.close()
+        if out_stream is not sys.stdout:
+            out_stream.close()
+
+
+if __name__ == "__main__":
+    main()
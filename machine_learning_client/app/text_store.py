@@ -0,0 +1,153 @@
+"""
+Content-addressed score store for analyzed texts.
+
+Each distinct text is stored once per lexicon in the `texts` collection,
+keyed by the SHA-256 of its UTF-8 bytes and the analyzer's lexicon
+fingerprint, with its scores and labels. Analysis events then only hold a
+reference:
+
+    texts:    {text_id: <sha256>, lexicon_fingerprint, text, scores, color,
+               interpretation, first_seen}   (unique on text_id + fingerprint)
+    analyses: {text_id: <sha256>, lexicon_fingerprint, lexicon_version,
+               timestamp}
+
+The fingerprint covers the lexicon contents, unlike the free-form
+lexicon_version label, which an overlay swap may reuse for other overrides.
+Its first FINGERPRINT_CHARS hex digits are stored, as every analysis holds it.
+Entries are never updated: a lexicon overlay swap scores a text into a new
+entry on its next use, and older analyses keep pointing at the scores they
+were served. The collection doubles as a score cache that survives restarts.
+
+Usage:
+    store = TextStore(db.texts, describe=lambda scores: {...})
+    store.create_index()
+    scores, stored = store.scores(analyzer, texts)
+    document = store.reference(text, analyzer, timestamp)
+"""
+
+import hashlib
+from datetime import datetime, timezone
+
+from pymongo import ASCENDING, UpdateOne
+from pymongo.errors import BulkWriteError
+
+# hex digits of the lexicon fingerprint kept: 64 bits tell lexicons apart
+FINGERPRINT_CHARS = 16
+
+
+def text_hash(text):
+    """The `texts` key of `text`: hex SHA-256 of its UTF-8 bytes."""
+    # lone surrogates (valid in JSON strings) hash like ScoreCache keys them
+    return hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def lexicon_key(scorer):
+    """The `texts` lexicon_fingerprint of `scorer`'s lexicon."""
+    return scorer.lexicon_fingerprint[:FINGERPRINT_CHARS]
+
+
+class TextStore:
+    """
+    Scores of distinct texts in a MongoDB collection keyed by text_hash()
+    and lexicon fingerprint.
+
+    Args:
+        collection: pymongo collection for the texts.
+        describe (callable): Maps scores to extra fields stored with them
+            (the API stores color and interpretation).
+    """
+
+    def __init__(self, collection, describe=None):
+        self.collection = collection
+        self.describe = describe
+
+    def create_index(self):
+        """Make (text_id, lexicon_fingerprint) unique; concurrent upserts rely on it."""
+        self.collection.create_index(
+            [("text_id", ASCENDING), ("lexicon_fingerprint", ASCENDING)], unique=True
+        )
+
+    def lookup(self, digests, lexicon_fingerprint):
+        """Stored scores by digest, for the given digests and lexicon fingerprint."""
+        cursor = self.collection.find(
+            {
+                "text_id": {"$in": list(set(digests))},
+                "lexicon_fingerprint": lexicon_fingerprint,
+            },
+            {"text_id": 1, "scores": 1},
+        )
+        return {entry["text_id"]: entry["scores"] for entry in cursor}
+
+    def save(self, entries, lexicon_fingerprint):
+        """
+        Insert missing (digest, text, scores) entries with one unordered bulk
+        write; returns the digests of the entries that were written.
+        """
+        now = datetime.now(timezone.utc)
+        requests = []
+        for digest, text, scores in entries:
+            fields = {"text": text, "scores": scores, "first_seen": now}
+            if self.describe is not None:
+                fields.update(self.describe(scores))
+            # existing entries are left alone, they belong to past analyses
+            requests.append(
+                UpdateOne(
+                    {"text_id": digest, "lexicon_fingerprint": lexicon_fingerprint},
+                    {"$setOnInsert": fields},
+                    upsert=True,
+                )
+            )
+        if not requests:
+            return set()
+        failed = set()
+        try:
+            self.collection.bulk_write(requests, ordered=False)
+        except BulkWriteError as bulk_error:
+            failed = {error["index"] for error in bulk_error.details["writeErrors"]}
+            print(f"Error storing {len(failed)} of {len(requests)} texts")
+        return {entry[0] for i, entry in enumerate(entries) if i not in failed}
+
+    def scores(self, scorer, texts):
+        """
+        Scores for `texts` in input order: stored ones are read back, the rest
+        are scored with `scorer` in one batch and stored. Database errors fall
+        back to scoring and are logged, never raised.
+
+        Returns:
+            tuple: (scores, digests of the texts that are in the collection);
+            only those may be stored as references, the others need a full copy.
+        """
+        digests = [text_hash(text) for text in texts]
+        fingerprint = lexicon_key(scorer)
+        try:
+            known = self.lookup(digests, fingerprint)
+        except Exception as storage_error:  # pylint: disable=broad-except
+            print(f"Error reading stored scores: {storage_error}")
+            known = {}
+        stored = set(known)
+
+        missing = {}
+        for digest, text in zip(digests, texts):
+            if digest not in known:
+                missing.setdefault(digest, text)
+        if missing:
+            new_scores = scorer.polarity_scores_batch(list(missing.values()))
+            known.update(zip(missing, new_scores))
+            try:
+                stored |= self.save(
+                    [(digest, text, known[digest]) for digest, text in missing.items()],
+                    fingerprint,
+                )
+            except Exception as storage_error:  # pylint: disable=broad-except
+                print(f"Error storing scores: {storage_error}")
+        return [dict(known[digest]) for digest in digests], stored
+
+    @staticmethod
+    def reference(text, scorer, timestamp):
+        """The analysis event stored in place of a full copy of `text`."""
+        return {
+            "text_id": text_hash(text),
+            "lexicon_fingerprint": lexicon_key(scorer),
+            "lexicon_version": scorer.lexicon_version,
+            "timestamp": timestamp,
+        }
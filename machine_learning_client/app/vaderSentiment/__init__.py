@@ -0,0 +1 @@
+# Bundled copy of vaderSentiment; shadows the PyPI package inside the container
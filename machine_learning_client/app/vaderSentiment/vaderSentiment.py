@@ -10,16 +10,36 @@ Hutto, C.J. & Gilbert, E.E. (2014). VADER: A Parsimonious Rule-based Model for
 Sentiment Analysis of Social Media Text. Eighth International Conference on
 Weblogs and Social Media (ICWSM-14). Ann Arbor, MI, June 2014.
 """
+import copy
 import os
 import re
 import math
 import string
-import codecs
 import json
-from itertools import product
+import hashlib
+import mmap
+import multiprocessing
+import pickle
+import struct
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from collections.abc import Mapping
+from itertools import islice, product
 from inspect import getsourcefile
 from io import open
 
+try:
+    import numpy as np
+except ImportError:  # optional: only the vectorized batch aggregation needs it
+    np = None
+
 # ##Constants##
 
 # (empirically derived mean sentiment intensity rating increase for booster words)
@@ -30,6 +50,14 @@ B_DECR = -0.293
 C_INCR = 0.733
 N_SCALAR = -0.74
 
+# compiled lexicon artifacts are stored here, keyed by a hash of the source files
+# (set VADER_LEXICON_CACHE to an empty string to disable the cache)
+LEXICON_CACHE_DIR = os.environ.get(
+    "VADER_LEXICON_CACHE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "__pycache__"),
+)
+LEXICON_CACHE_FORMAT = 1
+
 NEGATE = [
     "aint",
     "arent",
@@ -92,6 +120,9 @@ NEGATE = [
     "despite",
 ]
 
+# O(1) membership for the negation rules; derived from NEGATE at import time
+NEGATE_SET = frozenset(NEGATE)
+
 # booster/dampener 'intensifiers' or 'degree adverbs'
 # http://en.wiktionary.org/wiki/Category:English_degree_adverbs
 
@@ -182,7 +213,8 @@ BOOSTER_DICT = {
     "sort-of": B_DECR,
 }
 
-# check for sentiment laden idioms that do not contain lexicon words (future work, not yet implemented)
+# check for sentiment laden idioms that do not contain lexicon words
+# (opt-in via SentimentIntensityAnalyzer(sentiment_laden_idioms=True))
 SENTIMENT_LADEN_IDIOMS = {
     "cut the mustard": 2,
     "hand to mouth": -2,
@@ -198,6 +230,9 @@ SENTIMENT_LADEN_IDIOMS = {
     "under the weather": -2,
 }
 
+# a sentiment-laden idiom can only start with one of these tokens
+IDIOM_FIRST_WORDS = frozenset(phrase.split(" ")[0] for phrase in SENTIMENT_LADEN_IDIOMS)
+
 # check for special case idioms and phrases containing lexicon words
 SPECIAL_CASES = {
     "the shit": 3,
@@ -213,6 +248,52 @@ SPECIAL_CASES = {
 }
 
 
+# code points that glue multi-codepoint emoji together; dropped when they
+# trail a matched emoji that the lexicon only lists in its bare form
+EMOJI_JOINERS = frozenset(["\u200d", "\ufe0f"])
+
+
+# abbreviations whose period does not end a sentence
+SENTENCE_ABBREVIATIONS = frozenset(
+    [
+        "approx",
+        "co",
+        "corp",
+        "dept",
+        "dr",
+        "e.g",
+        "etc",
+        "fig",
+        "i.e",
+        "inc",
+        "jr",
+        "ltd",
+        "mr",
+        "mrs",
+        "ms",
+        "prof",
+        "sr",
+        "st",
+        "vs",
+    ]
+)
+
+# a run of terminators (plus closing quotes/brackets) followed by whitespace;
+# matching only from the start of a run keeps the scan linear, even on long
+# runs of punctuation or of text without whitespace
+SENTENCE_END = re.compile(
+    r"""(?<![.!?\u2026])[.!?\u2026]+["'\u201d\u2019)\]]*(?=\s|\Z)"""
+)
+# words longer than this can't be abbreviations
+ABBREVIATION_WINDOW = max(len(word) for word in SENTENCE_ABBREVIATIONS)
+# the longest prefix ending in sentence punctuation, or else in a
+# non-space character, that is followed by whitespace (see split_chunks)
+CHUNK_SENTENCE_END = re.compile(r"""(?s).*[.!?\u2026]["'\u201d\u2019)\]]*(?=\s)""")
+CHUNK_TOKEN_END = re.compile(r"(?s).*\S(?=\s)")
+LEADING_SPACE = re.compile(r"\s*")
+PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+NEXT_CHARACTER = re.compile(r"\s*(\S)")
+
 # #Static methods# #
 
 
@@ -221,11 +302,8 @@ def negated(input_words, include_nt=True):
     Determine if input contains negation words
     """
     input_words = [str(w).lower() for w in input_words]
-    neg_words = []
-    neg_words.extend(NEGATE)
-    for word in neg_words:
-        if word in input_words:
-            return True
+    if not NEGATE_SET.isdisjoint(input_words):
+        return True
     if include_nt:
         for word in input_words:
             if "n't" in word:
@@ -251,6 +329,88 @@ def normalize(score, alpha=15):
         return norm_score
 
 
+def _word_before(paragraph, end, floor):
+    # the non-whitespace run ending at `end` (not reaching back before
+    # `floor`), or None when it is too long to be an abbreviation
+    begin = max(floor, end - ABBREVIATION_WINDOW - 1)
+    window = paragraph[begin:end]
+    if not window or window[-1].isspace():
+        return ""
+    words = window.split()
+    if len(words) > 1 or window[0].isspace() or begin == floor:
+        return words[-1]
+    return None
+
+
+def split_sentences(text):
+    """
+    Split `text` into sentences at blank lines and at ., !, ? or ... runs
+    followed by whitespace. Common abbreviations, single-letter initials and
+    quotes continued in lowercase ('"wow!" she said') don't end a sentence.
+    Terminal punctuation stays with its sentence
+    :param str text: The text to split
+    :returns: list of non-empty, stripped sentences
+    """
+    sentences = []
+    for paragraph in PARAGRAPH_BREAK.split(text):
+        start = 0
+        previous_end = 0
+        for match in SENTENCE_END.finditer(paragraph):
+            terminator = match.group()
+            word = _word_before(paragraph, match.start(), previous_end)
+            previous_end = match.end()
+            if (
+                terminator == "."
+                and word is not None
+                and (
+                    word.lower() in SENTENCE_ABBREVIATIONS
+                    or (len(word) == 1 and word.isalpha())
+                )
+            ):
+                continue
+            if terminator[-1] not in ".!?\u2026":
+                following = NEXT_CHARACTER.match(paragraph, match.end())
+                if following and following.group(1).islower():
+                    continue
+            sentence = paragraph[start : match.end()].strip()
+            if sentence:
+                sentences.append(sentence)
+            start = match.end()
+        sentence = paragraph[start:].strip()
+        if sentence:
+            sentences.append(sentence)
+    return sentences
+
+
+def split_chunks(text, max_chars):
+    """
+    Split `text` into chunks of at most `max_chars` characters for chunked
+    scoring. Each chunk ends at the last sentence punctuation that fits,
+    else at the last whitespace; only a token longer than `max_chars` is cut.
+    Runs in linear time without splitting the whole text into sentences
+    :param str text: The text to split
+    :param int max_chars: Maximum chunk length
+    :returns: list of non-empty chunks
+    """
+    chunks = []
+    start = 0
+    length = len(text)
+    while True:
+        start = LEADING_SPACE.match(text, start).end()
+        if length - start <= max_chars:
+            if start < length:
+                chunks.append(text[start:].rstrip())
+            return chunks
+        # endpos lets the lookaheads see the character after a full chunk
+        limit = start + max_chars + 1
+        match = CHUNK_SENTENCE_END.match(text, start, limit) or CHUNK_TOKEN_END.match(
+            text, start, limit
+        )
+        end = match.end() if match else start + max_chars
+        chunks.append(text[start:end])
+        start = end
+
+
 def allcap_differential(words):
     """
     Check whether just some words in the input are ALL CAPS
@@ -288,19 +448,553 @@ def scalar_inc_dec(word, valence, is_cap_diff):
     return scalar
 
 
+def lexicon_fingerprint(lexicon_bytes, emoji_bytes):
+    """
+    Hash the raw lexicon sources; identifies a compiled lexicon artifact
+    """
+    digest = hashlib.sha1(str(LEXICON_CACHE_FORMAT).encode("ascii"))
+    digest.update(lexicon_bytes)
+    digest.update(b"\0")
+    digest.update(emoji_bytes)
+    return digest.hexdigest()
+
+
+def _compiled_lexicon_path(fingerprint):
+    return os.path.join(
+        LEXICON_CACHE_DIR, "vader_lexicon.{0}.pickle".format(fingerprint)
+    )
+
+
+def load_compiled_lexicon(fingerprint):
+    """
+    Load the (lexicon, emojis) dictionaries compiled for `fingerprint`,
+    or return None when there is no usable artifact
+    """
+    if not LEXICON_CACHE_DIR:
+        return None
+    try:
+        with open(_compiled_lexicon_path(fingerprint), "rb") as f:
+            stored_fingerprint, lexicon, emojis = pickle.load(f)
+    except (OSError, EOFError, ValueError, TypeError, pickle.UnpicklingError):
+        return None
+    if stored_fingerprint != fingerprint:
+        return None
+    return lexicon, emojis
+
+
+def save_compiled_lexicon(fingerprint, lexicon, emojis):
+    """
+    Store the compiled dictionaries for `fingerprint`; failures are ignored
+    since the cache is only an optimization (e.g. read-only installs)
+    """
+    if not LEXICON_CACHE_DIR:
+        return
+    try:
+        os.makedirs(LEXICON_CACHE_DIR, exist_ok=True)
+        # write to a temp file first so concurrent workers never read a partial artifact
+        fd, tmp_path = tempfile.mkstemp(dir=LEXICON_CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(
+                (fingerprint, lexicon, emojis), f, protocol=pickle.HIGHEST_PROTOCOL
+            )
+        os.replace(tmp_path, _compiled_lexicon_path(fingerprint))
+    except OSError:
+        pass
+
+
+_MISSING = object()
+
+
+class PackedLexicon(Mapping):
+    """
+    Base for lexicons that keep valences out of Python float objects.
+    Subclasses provide `_index(key)` (entry number or -1), `_valences` and
+    iteration; recently seen words (hits and misses) are memoized per process
+    in a small bounded dict so hot lookups run at dict speed.
+    """
+
+    def __init__(self, memo_size=4096):
+        self._memo = {}
+        self.memo_size = memo_size
+
+    def _lookup(self, key):
+        memo = self._memo
+        if len(memo) >= self.memo_size:
+            memo.clear()
+        index = self._index(key)
+        valence = None if index < 0 else self._valences[index]
+        memo[key] = valence
+        return valence
+
+    def lookup_many(self, words):
+        """
+        Return the valence of every word in `words` (None for misses)
+        """
+        memo = self._memo
+        try:
+            return list(map(memo.__getitem__, words))
+        except KeyError:
+            pass
+        # answer from a local dict: other threads may clear the shared memo
+        found = {}
+        for word in words:
+            if word not in found:
+                valence = memo.get(word, _MISSING)
+                if valence is _MISSING:
+                    index = self._index(word)
+                    valence = None if index < 0 else self._valences[index]
+                found[word] = valence
+        if len(memo) + len(found) > self.memo_size:
+            memo.clear()
+        memo.update(found)
+        return list(map(found.__getitem__, words))
+
+    def get(self, key, default=None):
+        valence = self._memo.get(key, _MISSING)
+        if valence is _MISSING:
+            valence = self._lookup(key)
+        return default if valence is None else valence
+
+    def __getitem__(self, key):
+        valence = self.get(key)
+        if valence is None:
+            raise KeyError(key)
+        return valence
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __len__(self):
+        return self._count
+
+    def _index(self, key):
+        raise NotImplementedError
+
+    def __iter__(self):
+        raise NotImplementedError
+
+    def memory_bytes(self):
+        """
+        Approximate bytes held by this lexicon, including the memo
+        """
+        raise NotImplementedError
+
+
+class CompactLexicon(PackedLexicon):
+    """
+    Word -> valence mapping with the keys in one sorted tuple, valences packed
+    in an array("d") and binary search for lookup. It drops the dict table and
+    the per-entry float objects of the plain dict lexicon.
+    """
+
+    def __init__(self, lexicon, memo_size=4096):
+        self._keys = tuple(sorted(lexicon))
+        self._valences = array("d", [lexicon[key] for key in self._keys])
+        self._count = len(self._keys)
+        PackedLexicon.__init__(self, memo_size)
+
+    def _index(self, key):
+        index = bisect_left(self._keys, key) if isinstance(key, str) else -1
+        if 0 <= index < self._count and self._keys[index] == key:
+            return index
+        return -1
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def memory_bytes(self):
+        return (
+            sys.getsizeof(self._keys)
+            + sum(sys.getsizeof(key) for key in self._keys)
+            + sys.getsizeof(self._valences)
+            + sys.getsizeof(self._memo)
+        )
+
+
+class MappedLexicon(PackedLexicon):
+    """
+    Read-only word -> valence mapping backed by a memory-mapped file, so every
+    worker process maps the same physical pages instead of building a dict.
+    File layout: header, valences (float64), open-addressing hash slots
+    (uint32 entry index + 1), key offsets (uint32) and a blob of sorted UTF-8
+    keys.
+    """
+
+    MAGIC = b"VADERLX1"
+    HEADER = struct.Struct("=8sII")
+
+    def __init__(self, path, memo_size=4096):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < self.HEADER.size:
+            raise ValueError("{0} is not a mapped VADER lexicon".format(path))
+        magic, count, table_size = self.HEADER.unpack_from(self._mmap)
+        if magic != self.MAGIC:
+            raise ValueError("{0} is not a mapped VADER lexicon".format(path))
+        view = memoryview(self._mmap)
+        pos = self.HEADER.size
+        self._valences = view[pos : pos + 8 * count].cast("d")
+        pos += 8 * count
+        self._slots = view[pos : pos + 4 * table_size].cast("I")
+        pos += 4 * table_size
+        self._offsets = view[pos : pos + 4 * (count + 1)].cast("I")
+        pos += 4 * (count + 1)
+        self._blob = view[pos:]
+        self._count = count
+        self._mask = table_size - 1
+        PackedLexicon.__init__(self, memo_size)
+
+    @classmethod
+    def build(cls, lexicon, path):
+        """
+        Write `lexicon` to `path` in the mapped format; the file is replaced
+        atomically so concurrent workers never map a partial file
+        """
+        keys = sorted(lexicon)
+        encoded = [key.encode("utf-8") for key in keys]
+        table_size = 1
+        while table_size < 2 * len(keys):
+            table_size *= 2
+        mask = table_size - 1
+        slots = array("I", [0]) * table_size
+        for index, data in enumerate(encoded):
+            slot = zlib.crc32(data) & mask
+            while slots[slot]:
+                slot = (slot + 1) & mask
+            slots[slot] = index + 1
+        offsets = array("I", [0])
+        for data in encoded:
+            offsets.append(offsets[-1] + len(data))
+        valences = array("d", [lexicon[key] for key in keys])
+
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(cls.HEADER.pack(cls.MAGIC, len(keys), table_size))
+                f.write(valences.tobytes())
+                f.write(slots.tobytes())
+                f.write(offsets.tobytes())
+                f.write(b"".join(encoded))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _index(self, key):
+        if not isinstance(key, str):
+            return -1
+        data = key.encode("utf-8", "surrogatepass")
+        slots, offsets, blob, mask = self._slots, self._offsets, self._blob, self._mask
+        slot = zlib.crc32(data) & mask
+        while True:
+            entry = slots[slot]
+            if not entry:
+                return -1
+            entry -= 1
+            if blob[offsets[entry] : offsets[entry + 1]] == data:
+                return entry
+            slot = (slot + 1) & mask
+
+    def __iter__(self):
+        offsets, blob = self._offsets, self._blob
+        for entry in range(self._count):
+            yield bytes(blob[offsets[entry] : offsets[entry + 1]]).decode("utf-8")
+
+    def memory_bytes(self):
+        """
+        Approximate bytes held by this lexicon; the mapping itself is shared
+        between every process that maps the same file
+        """
+        return len(self._mmap) + sys.getsizeof(self._memo)
+
+
+def mapped_lexicon_path(fingerprint):
+    """
+    Location of the mapped lexicon file for `fingerprint`
+    """
+    return os.path.join(
+        LEXICON_CACHE_DIR or tempfile.gettempdir(),
+        "vader_lexicon.{0}.vlex".format(fingerprint),
+    )
+
+
+def open_mapped_lexicon(fingerprint):
+    """
+    Map the lexicon file for `fingerprint`, or return None when there is none
+    """
+    try:
+        return MappedLexicon(mapped_lexicon_path(fingerprint))
+    except (OSError, ValueError):
+        return None
+
+
+def build_mapped_lexicon(fingerprint, lexicon):
+    """
+    Write the mapped lexicon file for `fingerprint` from `lexicon` and map it
+    """
+    path = mapped_lexicon_path(fingerprint)
+    MappedLexicon.build(lexicon, path)
+    return MappedLexicon(path)
+
+
+def lexicon_memory_bytes(lexicon):
+    """
+    Approximate bytes held by a lexicon: keys, values and table for a dict,
+    or the backend's own report for packed lexicons
+    """
+    memory_bytes = getattr(lexicon, "memory_bytes", None)
+    if memory_bytes is not None:
+        return memory_bytes()
+    return sys.getsizeof(lexicon) + sum(
+        sys.getsizeof(key) + sys.getsizeof(value) for key, value in lexicon.items()
+    )
+
+
+def overlay_fingerprint(fingerprint, overrides):
+    """
+    Identify `overrides` layered over the lexicon identified by `fingerprint`
+    """
+    digest = hashlib.sha1(fingerprint.encode("ascii"))
+    for word, valence in sorted(overrides.items()):
+        digest.update("\0{0}\t{1!r}".format(word, valence).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class LexiconOverlay(Mapping):
+    """
+    Copy-on-write view of a base lexicon. `overrides` maps words to their new
+    valence, or to None to remove them; every other lookup falls through to
+    the base, which is shared and never copied.
+    """
+
+    def __init__(self, base, overrides):
+        self.base = base
+        self.overrides = {
+            word: None if valence is None else float(valence)
+            for word, valence in overrides.items()
+        }
+        self._count = len(base)
+        for word, valence in self.overrides.items():
+            if word in base:
+                self._count -= valence is None
+            else:
+                self._count += valence is not None
+
+    def lookup_many(self, words):
+        """
+        Return the valence of every word in `words` (None for misses)
+        """
+        base = self.base
+        if hasattr(base, "lookup_many"):
+            valences = base.lookup_many(words)
+        else:
+            valences = [base.get(word) for word in words]
+        overrides = self.overrides
+        if not overrides.keys().isdisjoint(words):
+            for i, word in enumerate(words):
+                if word in overrides:
+                    valences[i] = overrides[word]
+        return valences
+
+    def get(self, key, default=None):
+        valence = self.overrides.get(key, _MISSING)
+        if valence is _MISSING:
+            return self.base.get(key, default)
+        return default if valence is None else valence
+
+    def __getitem__(self, key):
+        valence = self.get(key)
+        if valence is None:
+            raise KeyError(key)
+        return valence
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        overrides = self.overrides
+        for word in self.base:
+            if overrides.get(word, 0) is not None:
+                yield word
+        for word, valence in overrides.items():
+            if valence is not None and word not in self.base:
+                yield word
+
+    def memory_bytes(self):
+        """
+        Approximate bytes held by the overrides alone; the base is shared
+        """
+        return sys.getsizeof(self.overrides) + sum(
+            sys.getsizeof(word) + sys.getsizeof(valence)
+            for word, valence in self.overrides.items()
+        )
+
+
+class EmojiReplacer(object):
+    """
+    Replace emoji in a text with their textual descriptions in linear time.
+    Multi-codepoint emoji (ZWJ sequences, skin-tone modifiers, keycaps, flags)
+    are matched longest-first against the emoji lexicon.
+    """
+
+    def __init__(self, emojis):
+        self.emojis = emojis
+        # code point trie; the None key of a node holds the description of
+        # the emoji that ends there
+        self.trie = {}
+        for emoji, description in emojis.items():
+            node = self.trie
+            for character in emoji:
+                node = node.setdefault(character, {})
+            node[None] = description
+        # sre tests a character class range by range, so merge the emoji code
+        # points into a few coarse ranges; runs are verified against the
+        # lexicon anyway. ASCII ranges are kept exact to keep plain text fast.
+        code_points = sorted(set(map(ord, "".join(emojis) + "".join(EMOJI_JOINERS))))
+        ranges = []
+        for code_point in code_points:
+            max_gap = 1 if code_point < 0x80 else 16
+            if ranges and code_point - ranges[-1][1] <= max_gap:
+                ranges[-1][1] = code_point
+            else:
+                ranges.append([code_point, code_point])
+        self.runs = re.compile(
+            "[{0}]+".format(
+                "".join(
+                    "{0}-{1}".format(re.escape(chr(lo)), re.escape(chr(hi)))
+                    for lo, hi in ranges
+                )
+            )
+        )
+
+    def replace(self, text):
+        """
+        Return `text` with each emoji replaced by a space and its description;
+        tokenization treats that like the original "space unless the previous
+        character was one" rule.
+        """
+        return self.runs.sub(self._replace_run, text)
+
+    def _replace_run(self, match):
+        """
+        Longest-match a run of candidate code points against the trie
+        """
+        run = match.group()
+        # most runs are exactly one emoji
+        description = self.emojis.get(run)
+        if description is not None:
+            return " " + description
+        trie = self.trie
+        pieces = []
+        i = 0
+        run_end = len(run)
+        while i < run_end:
+            node = trie.get(run[i])
+            description = None if node is None else node.get(None)
+            end = i + 1
+            j = end
+            while node is not None and j < run_end:
+                node = node.get(run[j])
+                j += 1
+                if node is not None and None in node:
+                    description = node[None]
+                    end = j
+            if description is None:
+                pieces.append(run[i])
+                i += 1
+                continue
+            pieces.append(" ")
+            pieces.append(description)
+            # drop joiners left dangling after an emoji listed in bare form
+            while end < run_end and run[end] in EMOJI_JOINERS:
+                end += 1
+            i = end
+        return "".join(pieces)
+
+
+class PhraseMatcher(object):
+    """
+    Token-level trie over multi-word phrase tables (SPECIAL_CASES, the booster
+    n-grams, SENTIMENT_LADEN_IDIOMS). One pass over a sentence finds every
+    occurrence as a (start, length) span, so rule checks are dict lookups
+    instead of formatted n-gram strings.
+    """
+
+    def __init__(self, **tables):
+        self.names = tuple(tables)
+        # the None key of a node maps table name -> value of the phrase ending there
+        self.trie = {}
+        for name, table in tables.items():
+            for phrase, value in table.items():
+                words = phrase.split(" ")
+                if len(words) < 2:
+                    # single tokens never match the n-gram rules
+                    continue
+                node = self.trie
+                for word in words:
+                    node = node.setdefault(word, {})
+                node.setdefault(None, {})[name] = value
+
+    def match(self, words_lower):
+        """
+        Return {table name: {(start, length): value}} for all phrase occurrences
+        """
+        found = {name: {} for name in self.names}
+        trie = self.trie
+        n = len(words_lower)
+        for start, word in enumerate(words_lower):
+            node = trie.get(word)
+            j = start + 1
+            while node is not None and j < n:
+                node = node.get(words_lower[j])
+                j += 1
+                if node is not None and None in node:
+                    for name, value in node[None].items():
+                        found[name][(start, j - start)] = value
+        return found
+
+
 class SentiText(object):
     """
     Identify sentiment-relevant string-level properties of input text.
     """
 
-    def __init__(self, text):
+    def __init__(self, text, lexicon=None, tokens=None):
         if not isinstance(text, str):
             text = str(text).encode("utf-8")
         self.text = text
-        self.words_and_emoticons = self._words_and_emoticons()
+        # `tokens` skips tokenization when the caller already split the text
+        if tokens is None:
+            tokens = self._words_and_emoticons()
+        self.words_and_emoticons = tokens
         # doesn't separate words from\
         # adjacent punctuation (keeps emoticons & contractions)
-        self.is_cap_diff = allcap_differential(self.words_and_emoticons)
+
+        # per-token features, computed once so the rule checks never have to
+        # re-lowercase the sentence; valences/boosters hold None for misses
+        words_lower = [w.lower() for w in self.words_and_emoticons]
+        lexicon = {} if lexicon is None else lexicon
+        self.words_lower = words_lower
+        self.is_upper = [w.isupper() for w in self.words_and_emoticons]
+        lookup_many = getattr(lexicon, "lookup_many", None)
+        if lookup_many is None:
+            self.valences = [lexicon.get(w) for w in words_lower]
+        else:
+            self.valences = lookup_many(words_lower)
+        self.boosters = [BOOSTER_DICT.get(w) for w in words_lower]
+        # same test as negated([w]) without the per-token call
+        self.is_negation = [w in NEGATE_SET or "n't" in w for w in words_lower]
+
+        # phrase spans are filled in lazily by the analyzer's PhraseMatcher
+        self.phrase_spans = None
+
+        allcap_words = sum(self.is_upper)
+        self.is_cap_diff = 0 < len(words_lower) - allcap_words < len(words_lower)
 
     @staticmethod
     def _strip_punc_if_word(token):
@@ -326,47 +1020,440 @@ class SentiText(object):
         return stripped
 
 
+class ScoreCache(object):
+    """
+    Bounded LRU cache of polarity_scores results keyed by a digest of the text.
+    Entries belong to one fingerprint of the lexicon and scoring options; a
+    lookup with a different fingerprint (lexicon edited or swapped, or an
+    analyzer with other options) drops everything first.
+    """
+
+    def __init__(self, max_entries=10000, max_bytes=8 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.fingerprint = None
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(text):
+        return hashlib.blake2b(
+            text.encode("utf-8", "surrogatepass"), digest_size=16
+        ).digest()
+
+    @staticmethod
+    def _entry_size(key, scores):
+        # digest + result dict and its floats + the LRU bookkeeping
+        return (
+            sys.getsizeof(key)
+            + sys.getsizeof(scores)
+            + sum(sys.getsizeof(v) for v in scores.values())
+            + 100
+        )
+
+    def _check_fingerprint(self, fingerprint):
+        if fingerprint != self.fingerprint:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self.bytes = 0
+            self.fingerprint = fingerprint
+
+    def get(self, text, fingerprint):
+        """
+        Return a copy of the cached scores for `text`, or None
+        """
+        key = self._key(text)
+        with self._lock:
+            self._check_fingerprint(fingerprint)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(entry[0])
+
+    def put(self, text, fingerprint, scores):
+        """
+        Remember `scores` for `text`, evicting least recently used entries
+        until both the entry and byte budgets hold
+        """
+        key = self._key(text)
+        scores = dict(scores)
+        size = self._entry_size(key, scores)
+        if size > self.max_bytes or self.max_entries < 1:
+            return
+        with self._lock:
+            self._check_fingerprint(fingerprint)
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.bytes -= previous[1]
+            self._entries[key] = (scores, size)
+            self.bytes += size
+            while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        """
+        Drop every entry (counters are kept)
+        """
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        """
+        Snapshot of the cache counters for monitoring
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+class RuleTimer(object):
+    """
+    Call counts and cumulative nanoseconds per rule stage of an instrumented
+    analyzer. Time spent in a nested timed stage is charged to that stage
+    only, so the stage totals add up to the scoring time.
+    """
+
+    STAGES = (
+        "emoji",
+        "tokenize",
+        "lexicon",
+        "rules",
+        "idioms",
+        "but",
+        "aggregate",
+        "other",
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self):
+        """
+        Zero every counter
+        """
+        with self._lock:
+            self.calls = dict.fromkeys(self.STAGES, 0)
+            self.ns = dict.fromkeys(self.STAGES, 0)
+
+    def wrap(self, stage, func):
+        """
+        Return `func` timed as `stage`
+        """
+        local = self._local
+        clock = time.perf_counter_ns
+
+        def timed(*args, **kwargs):
+            outer_nested = getattr(local, "nested", 0)
+            local.nested = 0
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                nested = local.nested
+                local.nested = outer_nested + elapsed
+                with self._lock:
+                    self.calls[stage] += 1
+                    self.ns[stage] += elapsed - nested
+
+        return timed
+
+    def snapshot(self):
+        """
+        {"stages": {stage: {"calls", "ns"}}, "total_ns"} at this moment
+        """
+        with self._lock:
+            stages = {
+                stage: {"calls": self.calls[stage], "ns": self.ns[stage]}
+                for stage in self.STAGES
+            }
+        return {
+            "stages": stages,
+            "total_ns": sum(stage["ns"] for stage in stages.values()),
+        }
+
+
+class _TimedLexicon(Mapping):
+    """
+    Lexicon wrapper whose bulk valence lookups are timed as "lexicon"
+    """
+
+    def __init__(self, lexicon, timer):
+        self.lexicon = lexicon
+        lookup_many = getattr(lexicon, "lookup_many", None)
+        if lookup_many is None:
+            get = lexicon.get
+
+            def lookup_many(words):
+                return [get(w) for w in words]
+
+        self.lookup_many = timer.wrap("lexicon", lookup_many)
+
+    def __getitem__(self, key):
+        return self.lexicon[key]
+
+    def __iter__(self):
+        return iter(self.lexicon)
+
+    def __len__(self):
+        return len(self.lexicon)
+
+
 class SentimentIntensityAnalyzer(object):
     """
     Give a sentiment intensity score to sentences.
     """
 
+    # answer texts without sentiment-bearing tokens before the rule pass
+    prefilter_neutral = True
+
+    # instrumentation replaces these per instance with timed wrappers
+    _sentitext = SentiText
+    _TIMED_METHODS = (
+        ("_polarity_scores", "other"),
+        ("_split_tokens", "tokenize"),
+        ("_has_sentiment_tokens", "lexicon"),
+        ("sentiment_valence", "rules"),
+        ("_special_idioms_check", "idioms"),
+        ("_phrase_spans", "idioms"),
+        ("_but_check", "but"),
+        ("score_valence", "aggregate"),
+    )
+
     def __init__(
-        self, lexicon_file="vader_lexicon.txt", emoji_lexicon="emoji_utf8_lexicon.txt"
+        self,
+        lexicon_file="vader_lexicon.txt",
+        emoji_lexicon="emoji_utf8_lexicon.txt",
+        multi_but=False,
+        cache=None,
+        sentiment_laden_idioms=False,
+        lexicon_backend="dict",
+        instrument=False,
+        lexicon_overlay=None,
+        lexicon_version=None,
     ):
+        if lexicon_backend not in ("dict", "compact", "mmap"):
+            raise ValueError("unknown lexicon backend: {0}".format(lexicon_backend))
+        # constructor arguments, to build equivalent analyzers in worker processes
+        self._options = {
+            "lexicon_file": lexicon_file,
+            "emoji_lexicon": emoji_lexicon,
+            "multi_but": multi_but,
+            "sentiment_laden_idioms": sentiment_laden_idioms,
+            "lexicon_backend": lexicon_backend,
+            "lexicon_overlay": lexicon_overlay,
+            "lexicon_version": lexicon_version,
+        }
+        self.multi_but = multi_but
+        self.sentiment_laden_idioms = sentiment_laden_idioms
+        self.phrase_matcher = PhraseMatcher(
+            special_cases=SPECIAL_CASES,
+            boosters=BOOSTER_DICT,
+            idioms=SENTIMENT_LADEN_IDIOMS,
+        )
+        # optional ScoreCache in front of polarity_scores
+        self.cache = cache
         _this_module_file_path_ = os.path.abspath(getsourcefile(lambda: 0))
         lexicon_full_filepath = os.path.join(
             os.path.dirname(_this_module_file_path_), lexicon_file
         )
-        with codecs.open(lexicon_full_filepath, encoding="utf-8") as f:
-            self.lexicon_full_filepath = f.read()
-        self.lexicon = self.make_lex_dict()
-
         emoji_full_filepath = os.path.join(
             os.path.dirname(_this_module_file_path_), emoji_lexicon
         )
-        with codecs.open(emoji_full_filepath, encoding="utf-8") as f:
-            self.emoji_full_filepath = f.read()
-        self.emojis = self.make_emoji_dict()
+        with open(lexicon_full_filepath, "rb") as f:
+            lexicon_bytes = f.read()
+        with open(emoji_full_filepath, "rb") as f:
+            emoji_bytes = f.read()
+        self.lexicon_fingerprint = lexicon_fingerprint(lexicon_bytes, emoji_bytes)
+
+        mapped = None
+        if lexicon_backend == "mmap":
+            mapped = open_mapped_lexicon(self.lexicon_fingerprint)
+        if mapped is not None:
+            # shared read-only pages; the emoji table alone is cheap to parse and
+            # skipping the pickle avoids a throwaway per-process lexicon dict
+            self.lexicon = mapped
+            self.emojis = self.make_emoji_dict(emoji_bytes.decode("utf-8"))
+        else:
+            compiled = load_compiled_lexicon(self.lexicon_fingerprint)
+            if compiled is None:
+                # the raw file text only lives for the duration of the parse
+                self.lexicon = self.make_lex_dict(lexicon_bytes.decode("utf-8"))
+                self.emojis = self.make_emoji_dict(emoji_bytes.decode("utf-8"))
+                save_compiled_lexicon(
+                    self.lexicon_fingerprint, self.lexicon, self.emojis
+                )
+            else:
+                self.lexicon, self.emojis = compiled
+            if lexicon_backend == "compact":
+                self.lexicon = CompactLexicon(self.lexicon)
+            elif lexicon_backend == "mmap":
+                self.lexicon = build_mapped_lexicon(
+                    self.lexicon_fingerprint, self.lexicon
+                )
+        self.emoji_replacer = EmojiReplacer(self.emojis)
+
+        # the backend lexicon, shared by every overlay derived from it
+        self.base_lexicon = self.lexicon
+        self.base_fingerprint = self.lexicon_fingerprint
+        self._apply_overlay(lexicon_overlay, lexicon_version)
+
+        # texts answered by the neutral prefilter vs. by the full rule pass
+        self.neutral_fast_path = 0
+        self.rule_passes = 0
+        self._counter_lock = threading.Lock()
+
+        # RuleTimer while instrumented, see enable_instrumentation
+        self.instrumentation = None
+        if instrument:
+            self.enable_instrumentation()
+
+    def _apply_overlay(self, overrides, version):
+        if overrides:
+            self.lexicon = LexiconOverlay(self.base_lexicon, overrides)
+            # a new fingerprint keeps a shared ScoreCache from mixing results
+            self.lexicon_fingerprint = overlay_fingerprint(
+                self.base_fingerprint, self.lexicon.overrides
+            )
+        else:
+            self.lexicon = self.base_lexicon
+            self.lexicon_fingerprint = self.base_fingerprint
+        # short label stored with results; defaults to the fingerprint
+        self.lexicon_version = version or self.lexicon_fingerprint[:12]
+        # ScoreCache fingerprint: these options change scores as the lexicon does
+        self.cache_fingerprint = "{0}:{1:d}{2:d}".format(
+            self.lexicon_fingerprint,
+            bool(self.multi_but),
+            bool(self.sentiment_laden_idioms),
+        )
+
+    def with_lexicon_overlay(self, overrides, version=None):
+        """
+        Return a new analyzer scoring with `overrides` ({word: valence, or None
+        to remove the word}) layered over this analyzer's base lexicon. The
+        base lexicon, emoji table and cache are shared, not reloaded; any
+        overlay of this analyzer is replaced rather than stacked. `version`
+        labels the new lexicon (default: a prefix of its fingerprint)
+        """
+        derived = copy.copy(self)
+        derived._counter_lock = threading.Lock()
+        # drop the per-instance timed wrappers the shallow copy carried over
+        for name in ("_sentitext",) + tuple(name for name, _ in self._TIMED_METHODS):
+            derived.__dict__.pop(name, None)
+        if self.instrumentation is not None:
+            derived.emoji_replacer = copy.copy(self.emoji_replacer)
+            del derived.emoji_replacer.replace
+            derived.instrumentation = None
+        derived._options = dict(
+            self._options, lexicon_overlay=overrides, lexicon_version=version
+        )
+        derived._apply_overlay(overrides, version)
+        if self.instrumentation is not None:
+            derived.enable_instrumentation()
+        return derived
+
+    def enable_instrumentation(self):
+        """
+        Start recording per-stage call counts and nanoseconds (emoji
+        substitution, tokenization, lexicon lookup and the neutral prefilter,
+        booster/negation rules, idiom checks, 'but' check, aggregation). The
+        timed wrappers are set on this instance only, so analyzers without
+        them run the plain methods
+        """
+        if self.instrumentation is not None:
+            return
+        timer = self.instrumentation = RuleTimer()
+        self.emoji_replacer.replace = timer.wrap("emoji", self.emoji_replacer.replace)
+        self.lexicon = _TimedLexicon(self.lexicon, timer)
+        self._sentitext = timer.wrap("tokenize", SentiText)
+        for name, stage in self._TIMED_METHODS:
+            setattr(self, name, timer.wrap(stage, getattr(self, name)))
+
+    def disable_instrumentation(self):
+        """
+        Remove the timed wrappers; returns the final snapshot (or None)
+        """
+        timer = self.instrumentation
+        if timer is None:
+            return None
+        del self.emoji_replacer.replace
+        self.lexicon = self.lexicon.lexicon
+        del self._sentitext
+        for name, _ in self._TIMED_METHODS:
+            delattr(self, name)
+        self.instrumentation = None
+        return timer.snapshot()
+
+    def instrumentation_snapshot(self, reset=False):
+        """
+        Per-stage {"calls", "ns"} recorded so far, or None when not instrumented
+        """
+        timer = self.instrumentation
+        if timer is None:
+            return None
+        snapshot = timer.snapshot()
+        if reset:
+            timer.reset()
+        return snapshot
+
+    @staticmethod
+    def _read_data_file(filename):
+        """
+        Text of a lexicon file next to this module
+        """
+        _this_module_file_path_ = os.path.abspath(getsourcefile(lambda: 0))
+        path = os.path.join(os.path.dirname(_this_module_file_path_), filename)
+        with open(path, encoding="utf-8") as f:
+            return f.read()
 
-    def make_lex_dict(self):
+    def make_lex_dict(self, lexicon_text=None):
         """
-        Convert lexicon file to a dictionary
+        Convert lexicon file to a dictionary (default: this analyzer's
+        lexicon_file)
         """
+        if lexicon_text is None:
+            lexicon_text = self._read_data_file(self._options["lexicon_file"])
         lex_dict = {}
-        for line in self.lexicon_full_filepath.rstrip("\n").split("\n"):
+        for line in lexicon_text.rstrip("\n").split("\n"):
             if not line:
                 continue
             (word, measure) = line.strip().split("\t")[0:2]
             lex_dict[word] = float(measure)
         return lex_dict
 
-    def make_emoji_dict(self):
+    def make_emoji_dict(self, emoji_text=None):
         """
-        Convert emoji lexicon file to a dictionary
+        Convert emoji lexicon file to a dictionary (default: this analyzer's
+        emoji_lexicon)
         """
+        if emoji_text is None:
+            emoji_text = self._read_data_file(self._options["emoji_lexicon"])
         emoji_dict = {}
-        for line in self.emoji_full_filepath.rstrip("\n").split("\n"):
+        for line in emoji_text.rstrip("\n").split("\n"):
             (emoji, description) = line.strip().split("\t")[0:2]
             emoji_dict[emoji] = description
         return emoji_dict
@@ -377,77 +1464,328 @@ class SentimentIntensityAnalyzer(object):
         Positive values are positive valence, negative value are negative
         valence.
         """
+        cache = self.cache
+        if cache is None:
+            return self._polarity_scores(text)
+        scores = cache.get(text, self.cache_fingerprint)
+        if scores is None:
+            scores = self._polarity_scores(text)
+            cache.put(text, self.cache_fingerprint, scores)
+        return scores
+
+    def _polarity_scores(self, text):
         # convert emojis to their textual descriptions
-        text_no_emoji = ""
-        prev_space = True
-        for chr in text:
-            if chr in self.emojis:
-                # get the textual description
-                description = self.emojis[chr]
-                if not prev_space:
-                    text_no_emoji += " "
-                text_no_emoji += description
-                prev_space = False
-            else:
-                text_no_emoji += chr
-                prev_space = chr == " "
-        text = text_no_emoji.strip()
+        text = self.emoji_replacer.replace(text).strip()
+        tokens = self._split_tokens(text)
+        if self.prefilter_neutral and not self._has_sentiment_tokens(tokens):
+            # every sentiment would be 0: what score_valence returns for that
+            with self._counter_lock:
+                self.neutral_fast_path += 1
+            return self._valence_dict(
+                0.0 if tokens else None, 0.0, 0.0, len(tokens), 0.0
+            )
+        with self._counter_lock:
+            self.rule_passes += 1
+
+        sentitext = self._sentitext(text, self.lexicon, tokens)
+        sentiments = self._token_sentiments(sentitext)
+        sentiments = self._but_check(sentitext.words_lower, sentiments, self.multi_but)
+        return self.score_valence(sentiments, text)
+
+    @staticmethod
+    def _split_tokens(text):
+        # a method, so instrumentation can time it as "tokenize"
+        return _split_tokens(text)
+
+    def _has_sentiment_tokens(self, tokens):
+        """
+        Whether any token is in the lexicon (emoji count through their
+        descriptions) or, when enabled, may start a sentiment-laden idiom.
+        Boosters, negations and 'but' only scale lexicon valences, so a text
+        without such tokens scores neutral
+        """
+        words_lower = [word.lower() for word in tokens]
+        lookup_many = getattr(self.lexicon, "lookup_many", None)
+        if lookup_many is None:
+            if not self.lexicon.keys().isdisjoint(words_lower):
+                return True
+        elif lookup_many(words_lower).count(None) < len(words_lower):
+            return True
+        return self.sentiment_laden_idioms and not IDIOM_FIRST_WORDS.isdisjoint(
+            words_lower
+        )
+
+    def scoring_stats(self):
+        """
+        Counters of texts answered by the neutral prefilter and by the full
+        rule pass (results served by the ScoreCache are not counted)
+        """
+        with self._counter_lock:
+            scored = self.neutral_fast_path + self.rule_passes
+            return {
+                "neutral_fast_path": self.neutral_fast_path,
+                "rule_passes": self.rule_passes,
+                "fast_path_rate": self.neutral_fast_path / scored if scored else 0.0,
+            }
+
+    def _sentiments(self, text):
+        """
+        Run the rule pass over `text`; return the per-token sentiments and the
+        emoji-replaced text that punctuation emphasis is counted on
+        """
+        # convert emojis to their textual descriptions
+        text = self.emoji_replacer.replace(text).strip()
+
+        sentitext = self._sentitext(text, self.lexicon)
+        sentiments = self._token_sentiments(sentitext)
+        sentiments = self._but_check(sentitext.words_lower, sentiments, self.multi_but)
 
-        sentitext = SentiText(text)
+        return sentiments, text
 
+    def _token_sentiments(self, sentitext):
+        """
+        Per-token sentiments of `sentitext` before the 'but' weighting. Token i
+        depends only on tokens i-3 .. i+2 (wider for sentiment-laden idioms)
+        """
         sentiments = []
-        words_and_emoticons = sentitext.words_and_emoticons
-        for i, item in enumerate(words_and_emoticons):
+        words_lower = sentitext.words_lower
+        boosters = sentitext.boosters
+        last = len(words_lower) - 1
+        for i, item in enumerate(sentitext.words_and_emoticons):
             valence = 0
             # check for vader_lexicon words that may be used as modifiers or negations
-            if item.lower() in BOOSTER_DICT:
+            if boosters[i] is not None:
                 sentiments.append(valence)
                 continue
-            if (
-                i < len(words_and_emoticons) - 1
-                and item.lower() == "kind"
-                and words_and_emoticons[i + 1].lower() == "of"
-            ):
+            if i < last and words_lower[i] == "kind" and words_lower[i + 1] == "of":
                 sentiments.append(valence)
                 continue
 
             sentiments = self.sentiment_valence(valence, sentitext, item, i, sentiments)
 
-        sentiments = self._but_check(words_and_emoticons, sentiments)
+        if self.sentiment_laden_idioms:
+            # an idiom counts as one sentiment unit carried by its first token
+            idioms = self._phrase_spans(sentitext)["idioms"]
+            for (start, length), idiom_valence in sorted(idioms.items()):
+                sentiments[start : start + length] = [idiom_valence] + [0.0] * (
+                    length - 1
+                )
+        return sentiments
 
-        valence_dict = self.score_valence(sentiments, text)
+    def document_scores(self, text, aggregate="mean", workers=1, pool="thread"):
+        """
+        Split `text` into sentences, score each one and combine them into
+        document scores with `aggregate` ("mean", "length_weighted" or
+        "max_magnitude", see aggregate_scores). With workers > 1 the sentences
+        are scored on a thread pool, or with pool="process" on score_corpus
+        worker processes; each call starts its own pool, so that only pays
+        off for long documents.
+        Returns {"document": scores, "sentences": [{"text", "scores"}, ...]}
+        """
+        if aggregate not in DOCUMENT_AGGREGATES:
+            raise ValueError("unknown aggregate: {0}".format(aggregate))
+        if pool not in ("thread", "process"):
+            raise ValueError("unknown pool: {0}".format(pool))
+        if workers < 1:
+            raise ValueError("workers must be at least 1: {0}".format(workers))
+        sentences = split_sentences(text)
+        chunk_size = max(1, len(sentences) // (4 * workers))
+        if workers > 1 and pool == "process":
+            all_scores = list(
+                score_corpus(
+                    sentences, workers=workers, chunk_size=chunk_size, **self._options
+                )
+            )
+        elif workers > 1:
+            chunks = [
+                sentences[i : i + chunk_size]
+                for i in range(0, len(sentences), chunk_size)
+            ]
+            with ThreadPoolExecutor(workers) as executor:
+                all_scores = [
+                    scores
+                    for chunk_scores in executor.map(self.polarity_scores_batch, chunks)
+                    for scores in chunk_scores
+                ]
+        else:
+            all_scores = self.polarity_scores_batch(sentences)
+        lengths = [len(sentence.split()) for sentence in sentences]
+        return {
+            "document": aggregate_scores(all_scores, lengths, aggregate),
+            "sentences": [
+                {"text": sentence, "scores": scores}
+                for sentence, scores in zip(sentences, all_scores)
+            ],
+        }
+
+    def chunked_scores(self, text, max_chunk_chars=2000, deadline=None, executor=None):
+        """
+        Score `text` in chunks of at most `max_chunk_chars` characters (see
+        split_chunks) combined with the "length_weighted" aggregate, so the
+        cost of a call grows linearly with the text. Scoring stops at
+        `deadline` (a time.monotonic() value) and only the leading chunks
+        scored by then are combined. With a concurrent.futures `executor`
+        the chunks are scored on it; a ProcessPoolExecutor is sent this
+        analyzer's options, and each worker builds its analyzer once.
+        Returns {"document": scores, "chunks": total chunk count,
+        "scored_chunks": leading chunks combined, "complete": bool}
+        """
+        chunks = split_chunks(text, max_chunk_chars)
+        if executor is not None:
+            all_scores = self._scores_on_executor(chunks, deadline, executor)
+        else:
+            all_scores = []
+            for chunk in chunks:
+                if deadline is not None and time.monotonic() >= deadline:
+                    break
+                all_scores.append(self.polarity_scores(chunk))
+        lengths = [len(chunk.split()) for chunk in chunks[: len(all_scores)]]
+        return {
+            "document": aggregate_scores(all_scores, lengths, "length_weighted"),
+            "chunks": len(chunks),
+            "scored_chunks": len(all_scores),
+            "complete": len(all_scores) == len(chunks),
+        }
+
+    def _scores_on_executor(self, chunks, deadline, executor, batch_size=8):
+        """
+        Scores of the leading `chunks` finished by `deadline`, computed on
+        `executor` in batches of `batch_size`. Only one batch per executor
+        worker is in flight, and none is submitted past the deadline: a batch
+        already running then can't be stopped and finishes in the background,
+        so the work left over after a timeout is at most one batch per worker
+        """
+        if isinstance(executor, ProcessPoolExecutor):
+
+            def submit(batch):
+                return executor.submit(_score_with_options, self._options, batch)
+
+        else:
+
+            def submit(batch):
+                return executor.submit(self.polarity_scores_batch, batch)
+
+        # _max_workers: the pool size of both stdlib executors
+        in_flight = max(1, getattr(executor, "_max_workers", 1))
+        batches = deque(
+            chunks[i : i + batch_size] for i in range(0, len(chunks), batch_size)
+        )
+        futures = deque()
+        all_scores = []
+        while batches or futures:
+            expired = deadline is not None and time.monotonic() >= deadline
+            while batches and len(futures) < in_flight and not expired:
+                futures.append(submit(batches.popleft()))
+            if not futures:
+                break
+            timeout = None
+            if deadline is not None:
+                timeout = max(0.0, deadline - time.monotonic())
+            # keep a contiguous prefix, so the result covers the start of the text
+            if not wait([futures[0]], timeout=timeout).done:
+                break
+            all_scores.extend(futures.popleft().result())
+        for future in futures:
+            future.cancel()
+        return all_scores
 
-        return valence_dict
+    def session(self):
+        """
+        Start a SentimentSession for scoring a text as it grows
+        """
+        return SentimentSession(self)
+
+    def polarity_scores_batch(self, texts):
+        """
+        Return polarity scores for every text in `texts`, in input order.
+        Each result is identical to calling `polarity_scores` on that text.
+        Only repeated texts are cheaper than in a polarity_scores loop; the
+        speedup of distinct texts comes from the per-text engine itself.
+        """
+        return list(self.iter_polarity_scores(texts))
+
+    def iter_polarity_scores(self, texts, memo_size=4096):
+        """
+        Lazily yield polarity scores for each text in `texts`, in input order.
+        Repeated texts are scored once; up to `memo_size` distinct results
+        are remembered while iterating, so memory stays bounded on streams.
+        """
+        polarity_scores = self.polarity_scores
+        memo = {}
+        for text in texts:
+            scores = memo.get(text)
+            if scores is None:
+                scores = polarity_scores(text)
+                if len(memo) >= memo_size:
+                    memo.clear()
+                memo[text] = scores
+            yield dict(scores)
+
+    def polarity_scores_vectorized(self, texts):
+        """
+        Like polarity_scores_batch, but the per-text aggregation stage
+        (score_valence) runs once for the whole batch with NumPy. The result
+        cache is not consulted. Requires numpy.
+        """
+        if np is None:
+            raise ImportError("polarity_scores_vectorized requires numpy")
+        slots = {}
+        order = [slots.setdefault(text, len(slots)) for text in texts]
+        valences = []
+        lengths = []
+        ep_counts = []
+        qm_counts = []
+        for text in slots:
+            sentiments, text = self._sentiments(text)
+            valences.extend(sentiments)
+            lengths.append(len(sentiments))
+            ep_counts.append(text.count("!"))
+            qm_counts.append(text.count("?"))
+        neg, neu, pos, compound = score_valence_batch(
+            valences, lengths, ep_counts, qm_counts
+        )
+        results = [
+            {
+                "neg": round(n, 3),
+                "neu": round(u, 3),
+                "pos": round(p, 3),
+                "compound": round(c, 4),
+            }
+            for n, u, p, c in zip(
+                neg.tolist(), neu.tolist(), pos.tolist(), compound.tolist()
+            )
+        ]
+        return [dict(results[slot]) for slot in order]
 
     def sentiment_valence(self, valence, sentitext, item, i, sentiments):
         is_cap_diff = sentitext.is_cap_diff
-        words_and_emoticons = sentitext.words_and_emoticons
-        item_lowercase = item.lower()
-        if item_lowercase in self.lexicon:
+        words_lower = sentitext.words_lower
+        valences = sentitext.valences
+        if valences[i] is not None:
             # get the sentiment valence
-            valence = self.lexicon[item_lowercase]
+            valence = valences[i]
 
             # check for "no" as negation for an adjacent lexicon item vs "no" as its own stand-alone lexicon item
             if (
-                item_lowercase == "no"
-                and i != len(words_and_emoticons) - 1
-                and words_and_emoticons[i + 1].lower() in self.lexicon
+                words_lower[i] == "no"
+                and i != len(words_lower) - 1
+                and valences[i + 1] is not None
             ):
                 # don't use valence of "no" as a lexicon item. Instead set it's valence to 0.0 and negate the next item
                 valence = 0.0
             if (
-                (i > 0 and words_and_emoticons[i - 1].lower() == "no")
-                or (i > 1 and words_and_emoticons[i - 2].lower() == "no")
+                (i > 0 and words_lower[i - 1] == "no")
+                or (i > 1 and words_lower[i - 2] == "no")
                 or (
                     i > 2
-                    and words_and_emoticons[i - 3].lower() == "no"
-                    and words_and_emoticons[i - 1].lower() in ["or", "nor"]
+                    and words_lower[i - 3] == "no"
+                    and words_lower[i - 1] in ["or", "nor"]
                 )
             ):
-                valence = self.lexicon[item_lowercase] * N_SCALAR
+                valence = valences[i] * N_SCALAR
 
             # check if sentiment laden word is in ALL CAPS (while others aren't)
-            if item.isupper() and is_cap_diff:
+            if sentitext.is_upper[i] and is_cap_diff:
                 if valence > 0:
                     valence += C_INCR
                 else:
@@ -457,144 +1795,129 @@ class SentimentIntensityAnalyzer(object):
                 # dampen the scalar modifier of preceding words and emoticons
                 # (excluding the ones that immediately preceed the item) based
                 # on their distance from the current item.
-                if (
-                    i > start_i
-                    and words_and_emoticons[i - (start_i + 1)].lower()
-                    not in self.lexicon
-                ):
-                    s = scalar_inc_dec(
-                        words_and_emoticons[i - (start_i + 1)], valence, is_cap_diff
+                if i > start_i and valences[i - (start_i + 1)] is None:
+                    s = self._scalar_inc_dec(
+                        sentitext, i - (start_i + 1), valence, is_cap_diff
                     )
                     if start_i == 1 and s != 0:
                         s = s * 0.95
                     if start_i == 2 and s != 0:
                         s = s * 0.9
                     valence = valence + s
-                    valence = self._negation_check(
-                        valence, words_and_emoticons, start_i, i
-                    )
+                    valence = self._negation_check(valence, sentitext, start_i, i)
                     if start_i == 2:
-                        valence = self._special_idioms_check(
-                            valence, words_and_emoticons, i
-                        )
+                        valence = self._special_idioms_check(valence, sentitext, i)
 
-            valence = self._least_check(valence, words_and_emoticons, i)
+            valence = self._least_check(valence, sentitext, i)
         sentiments.append(valence)
         return sentiments
 
-    def _least_check(self, valence, words_and_emoticons, i):
+    @staticmethod
+    def _scalar_inc_dec(sentitext, j, valence, is_cap_diff):
+        # scalar_inc_dec() over the precomputed features of token j
+        scalar = 0.0
+        booster = sentitext.boosters[j]
+        if booster is not None:
+            scalar = booster
+            if valence < 0:
+                scalar *= -1
+            # check if booster/dampener word is in ALLCAPS (while others aren't)
+            if sentitext.is_upper[j] and is_cap_diff:
+                if valence > 0:
+                    scalar += C_INCR
+                else:
+                    scalar -= C_INCR
+        return scalar
+
+    @staticmethod
+    def _least_check(valence, sentitext, i):
         # check for negation case using "least"
+        words_lower = sentitext.words_lower
         if (
             i > 1
-            and words_and_emoticons[i - 1].lower() not in self.lexicon
-            and words_and_emoticons[i - 1].lower() == "least"
+            and sentitext.valences[i - 1] is None
+            and words_lower[i - 1] == "least"
         ):
-            if (
-                words_and_emoticons[i - 2].lower() != "at"
-                and words_and_emoticons[i - 2].lower() != "very"
-            ):
+            if words_lower[i - 2] != "at" and words_lower[i - 2] != "very":
                 valence = valence * N_SCALAR
         elif (
             i > 0
-            and words_and_emoticons[i - 1].lower() not in self.lexicon
-            and words_and_emoticons[i - 1].lower() == "least"
+            and sentitext.valences[i - 1] is None
+            and words_lower[i - 1] == "least"
         ):
             valence = valence * N_SCALAR
         return valence
 
     @staticmethod
-    def _but_check(words_and_emoticons, sentiments):
-        # check for modification in sentiment due to contrastive conjunction 'but'
-        words_and_emoticons_lower = [str(w).lower() for w in words_and_emoticons]
-        if "but" in words_and_emoticons_lower:
-            bi = words_and_emoticons_lower.index("but")
-            for sentiment in sentiments:
-                si = sentiments.index(sentiment)
-                if si < bi:
-                    sentiments.pop(si)
-                    sentiments.insert(si, sentiment * 0.5)
-                elif si > bi:
-                    sentiments.pop(si)
-                    sentiments.insert(si, sentiment * 1.5)
+    def _but_check(words_lower, sentiments, multi_but=False):
+        # check for modification in sentiment due to contrastive conjunction 'but':
+        # tokens before it are halved, tokens after it weigh 1.5x. With
+        # multi_but the last 'but' is the pivot, so the final clause dominates.
+        if "but" in words_lower:
+            if multi_but:
+                bi = len(words_lower) - 1 - words_lower[::-1].index("but")
+            else:
+                bi = words_lower.index("but")
+            sentiments = (
+                [sentiment * 0.5 for sentiment in sentiments[:bi]]
+                + sentiments[bi : bi + 1]
+                + [sentiment * 1.5 for sentiment in sentiments[bi + 1 :]]
+            )
         return sentiments
 
-    @staticmethod
-    def _special_idioms_check(valence, words_and_emoticons, i):
-        words_and_emoticons_lower = [str(w).lower() for w in words_and_emoticons]
-        onezero = "{0} {1}".format(
-            words_and_emoticons_lower[i - 1], words_and_emoticons_lower[i]
-        )
-
-        twoonezero = "{0} {1} {2}".format(
-            words_and_emoticons_lower[i - 2],
-            words_and_emoticons_lower[i - 1],
-            words_and_emoticons_lower[i],
-        )
-
-        twoone = "{0} {1}".format(
-            words_and_emoticons_lower[i - 2], words_and_emoticons_lower[i - 1]
-        )
-
-        threetwoone = "{0} {1} {2}".format(
-            words_and_emoticons_lower[i - 3],
-            words_and_emoticons_lower[i - 2],
-            words_and_emoticons_lower[i - 1],
-        )
-
-        threetwo = "{0} {1}".format(
-            words_and_emoticons_lower[i - 3], words_and_emoticons_lower[i - 2]
-        )
-
-        sequences = [onezero, twoonezero, twoone, threetwoone, threetwo]
+    def _phrase_spans(self, sentitext):
+        spans = sentitext.phrase_spans
+        if spans is None:
+            spans = self.phrase_matcher.match(sentitext.words_lower)
+            sentitext.phrase_spans = spans
+        return spans
+
+    def _special_idioms_check(self, valence, sentitext, i):
+        # spans are (start, length); names follow the token offsets from i
+        spans = self._phrase_spans(sentitext)
+        special_cases = spans["special_cases"]
+        sequences = [
+            (i - 1, 2),  # onezero
+            (i - 2, 3),  # twoonezero
+            (i - 2, 2),  # twoone
+            (i - 3, 3),  # threetwoone
+            (i - 3, 2),  # threetwo
+        ]
 
         for seq in sequences:
-            if seq in SPECIAL_CASES:
-                valence = SPECIAL_CASES[seq]
+            if seq in special_cases:
+                valence = special_cases[seq]
                 break
 
-        if len(words_and_emoticons_lower) - 1 > i:
-            zeroone = "{0} {1}".format(
-                words_and_emoticons_lower[i], words_and_emoticons_lower[i + 1]
-            )
-            if zeroone in SPECIAL_CASES:
-                valence = SPECIAL_CASES[zeroone]
-        if len(words_and_emoticons_lower) - 1 > i + 1:
-            zeroonetwo = "{0} {1} {2}".format(
-                words_and_emoticons_lower[i],
-                words_and_emoticons_lower[i + 1],
-                words_and_emoticons_lower[i + 2],
-            )
-            if zeroonetwo in SPECIAL_CASES:
-                valence = SPECIAL_CASES[zeroonetwo]
+        if (i, 2) in special_cases:  # zeroone
+            valence = special_cases[(i, 2)]
+        if (i, 3) in special_cases:  # zeroonetwo
+            valence = special_cases[(i, 3)]
 
         # check for booster/dampener bi-grams such as 'sort of' or 'kind of'
-        n_grams = [threetwoone, threetwo, twoone]
+        boosters = spans["boosters"]
+        n_grams = [(i - 3, 3), (i - 3, 2), (i - 2, 2)]  # threetwoone, threetwo, twoone
         for n_gram in n_grams:
-            if n_gram in BOOSTER_DICT:
-                valence = valence + BOOSTER_DICT[n_gram]
+            if n_gram in boosters:
+                valence = valence + boosters[n_gram]
         return valence
 
-    @staticmethod
-    def _sentiment_laden_idioms_check(valence, senti_text_lower):
-        # Future Work
-        # check for sentiment laden idioms that don't contain a lexicon word
-        idioms_valences = []
-        for idiom in SENTIMENT_LADEN_IDIOMS:
-            if idiom in senti_text_lower:
-                print(idiom, senti_text_lower)
-                valence = SENTIMENT_LADEN_IDIOMS[idiom]
-                idioms_valences.append(valence)
-        if len(idioms_valences) > 0:
-            valence = sum(idioms_valences) / float(len(idioms_valences))
+    def _sentiment_laden_idioms_check(self, valence, senti_text_lower):
+        # check for sentiment laden idioms that don't contain a lexicon word;
+        # returns the mean valence of the idioms found, else `valence`
+        idioms = self.phrase_matcher.match(senti_text_lower.split())["idioms"]
+        if idioms:
+            valence = sum(idioms.values()) / float(len(idioms))
         return valence
 
     @staticmethod
-    def _negation_check(valence, words_and_emoticons, start_i, i):
-        words_and_emoticons_lower = [str(w).lower() for w in words_and_emoticons]
+    def _negation_check(valence, sentitext, start_i, i):
+        words_and_emoticons_lower = sentitext.words_lower
+        is_negation = sentitext.is_negation
         if start_i == 0:
-            if negated(
-                [words_and_emoticons_lower[i - (start_i + 1)]]
-            ):  # 1 word preceding lexicon word (w/o stopwords)
+            if is_negation[
+                i - (start_i + 1)
+            ]:  # 1 word preceding lexicon word (w/o stopwords)
                 valence = valence * N_SCALAR
         if start_i == 1:
             if words_and_emoticons_lower[i - 2] == "never" and (
@@ -607,9 +1930,9 @@ class SentimentIntensityAnalyzer(object):
                 and words_and_emoticons_lower[i - 1] == "doubt"
             ):
                 valence = valence
-            elif negated(
-                [words_and_emoticons_lower[i - (start_i + 1)]]
-            ):  # 2 words preceding the lexicon word position
+            elif is_negation[
+                i - (start_i + 1)
+            ]:  # 2 words preceding the lexicon word position
                 valence = valence * N_SCALAR
         if start_i == 2:
             if (
@@ -629,9 +1952,9 @@ class SentimentIntensityAnalyzer(object):
                 or words_and_emoticons_lower[i - 1] == "doubt"
             ):
                 valence = valence
-            elif negated(
-                [words_and_emoticons_lower[i - (start_i + 1)]]
-            ):  # 3 words preceding the lexicon word position
+            elif is_negation[
+                i - (start_i + 1)
+            ]:  # 3 words preceding the lexicon word position
                 valence = valence * N_SCALAR
         return valence
 
@@ -691,14 +2014,23 @@ class SentimentIntensityAnalyzer(object):
             sum_s = float(sum(sentiments))
             # compute and add emphasis from punctuation in text
             punct_emph_amplifier = self._punctuation_emphasis(text)
+            # discriminate between positive, negative and neutral sentiment scores
+            pos_sum, neg_sum, neu_count = self._sift_sentiment_scores(sentiments)
+            return self._valence_dict(
+                sum_s, pos_sum, neg_sum, neu_count, punct_emph_amplifier
+            )
+        return self._valence_dict(None, 0.0, 0.0, 0, 0.0)
+
+    @staticmethod
+    def _valence_dict(sum_s, pos_sum, neg_sum, neu_count, punct_emph_amplifier):
+        # final scores from the sums of score_valence; sum_s is None without tokens
+        if sum_s is not None:
             if sum_s > 0:
                 sum_s += punct_emph_amplifier
             elif sum_s < 0:
                 sum_s -= punct_emph_amplifier
 
             compound = normalize(sum_s)
-            # discriminate between positive, negative and neutral sentiment scores
-            pos_sum, neg_sum, neu_count = self._sift_sentiment_scores(sentiments)
 
             if pos_sum > math.fabs(neg_sum):
                 pos_sum += punct_emph_amplifier
@@ -726,6 +2058,400 @@ class SentimentIntensityAnalyzer(object):
         return sentiment_dict
 
 
+# #Document scoring# #
+
+DOCUMENT_AGGREGATES = ("mean", "length_weighted", "max_magnitude")
+
+
+def aggregate_scores(all_scores, weights=None, mode="mean"):
+    """
+    Combine sentence-level polarity scores into document-level scores.
+    "mean" averages each score, "length_weighted" weights each sentence by
+    `weights` (e.g. token counts) and "max_magnitude" takes the scores of the
+    sentence with the strongest compound. Rounded like polarity_scores
+    """
+    if not all_scores:
+        return {"neg": 0.0, "neu": 0.0, "pos": 0.0, "compound": 0.0}
+    if mode == "max_magnitude":
+        return dict(max(all_scores, key=lambda scores: math.fabs(scores["compound"])))
+    if mode == "mean" or weights is None:
+        weights = [1] * len(all_scores)
+    total = float(sum(weights))
+    document = {}
+    for key, digits in (("neg", 3), ("neu", 3), ("pos", 3), ("compound", 4)):
+        weighted = sum(w * scores[key] for w, scores in zip(weights, all_scores))
+        document[key] = round(weighted / total, digits)
+    return document
+
+
+# #Incremental scoring# #
+
+# builtin sum() compensates float rounding (Neumaier) from Python 3.12 on
+_COMPENSATED_SUM = sys.version_info >= (3, 12)
+
+
+def _split_tokens(text):
+    # SentiText tokenization without the per-token features
+    return [SentiText._strip_punc_if_word(token) for token in text.split()]
+
+
+class _ValenceSums(object):
+    """
+    Running sum() and _sift_sentiment_scores() over a growing list of
+    sentiments, bit for bit equal to calling them on the whole list
+    """
+
+    __slots__ = ("int_sum", "float_sum", "compensation", "pos_sum", "neg_sum", "neu")
+
+    def __init__(self):
+        self.int_sum = 0
+        self.float_sum = None
+        self.compensation = 0.0
+        self.pos_sum = 0.0
+        self.neg_sum = 0.0
+        self.neu = 0
+
+    def copy(self):
+        other = _ValenceSums.__new__(_ValenceSums)
+        for name in self.__slots__:
+            setattr(other, name, getattr(self, name))
+        return other
+
+    def add(self, sentiment):
+        # sum() adds ints exactly until the first float, then switches to floats
+        if self.float_sum is None:
+            if type(sentiment) is int:
+                self.int_sum += sentiment
+            else:
+                self.float_sum = self.int_sum + sentiment
+        elif _COMPENSATED_SUM and type(sentiment) is float:
+            total = self.float_sum + sentiment
+            if math.fabs(self.float_sum) >= math.fabs(sentiment):
+                self.compensation += (self.float_sum - total) + sentiment
+            else:
+                self.compensation += (sentiment - total) + self.float_sum
+            self.float_sum = total
+        else:
+            self.float_sum += sentiment
+        if sentiment > 0:
+            self.pos_sum += float(sentiment) + 1
+        if sentiment < 0:
+            self.neg_sum += float(sentiment) - 1
+        if sentiment == 0:
+            self.neu += 1
+
+    def total(self):
+        if self.float_sum is None:
+            return self.int_sum
+        if _COMPENSATED_SUM and self.compensation and math.isfinite(self.compensation):
+            return self.float_sum + self.compensation
+        return self.float_sum
+
+
+class SentimentSession(object):
+    """
+    Score a text that grows by appended chunks (e.g. a message being typed).
+    scores() always equals analyzer.polarity_scores() of everything appended
+    so far. Tokens whose look-back/look-ahead window is complete are scored
+    once, for both values of the global ALL CAPS differential, and folded
+    into running sums; only the last few tokens are rescored per call. A new
+    'but' pivot re-weights the finished tokens once.
+    """
+
+    def __init__(self, analyzer):
+        self.analyzer = analyzer
+        # rules look at tokens i-3 .. i+2; an idiom can span further
+        widest = 0
+        if analyzer.sentiment_laden_idioms:
+            widest = max(len(idiom.split()) for idiom in SENTIMENT_LADEN_IDIOMS)
+        self._context = max(3, widest - 1)
+        self._lookahead = max(2, widest - 1)
+        self.reset()
+
+    def reset(self):
+        """
+        Forget the text appended so far
+        """
+        self.text = ""
+        # raw text after the last whitespace: its last token may still grow
+        self._tail = ""
+        self._tokens = []
+        self._words_lower = []
+        self._upper = 0
+        self._ep_count = 0
+        self._qm_count = 0
+        # finished tokens: sentiment without / with the caps differential
+        self._finished = ([], [])
+        self._but = None
+        # running sums of the finished tokens, keyed by (weighting, is_cap_diff)
+        self._sums = {
+            (weighting, cap): _ValenceSums()
+            for weighting in ("none", "before_but")
+            for cap in (False, True)
+        }
+
+    def update(self, text):
+        """
+        Take the whole current text; appends the new suffix when `text`
+        extends what was seen so far, otherwise starts over
+        """
+        if not text.startswith(self.text):
+            self.reset()
+        return self.append(text[len(self.text) :])
+
+    def append(self, chunk):
+        """
+        Append `chunk` to the text and return the updated scores
+        """
+        self.text += chunk
+        cut = len(chunk)
+        while cut and not chunk[cut - 1].isspace():
+            cut -= 1
+        if cut:
+            # emoji replacement and splitting never cross whitespace, so the
+            # text up to the last whitespace can be tokenized for good
+            cut += len(self._tail)
+            committed = self.analyzer.emoji_replacer.replace((self._tail + chunk)[:cut])
+            self._tail = (self._tail + chunk)[cut:]
+            self._ep_count += committed.count("!")
+            self._qm_count += committed.count("?")
+            tokens = _split_tokens(committed)
+            self._tokens.extend(tokens)
+            self._words_lower.extend(w.lower() for w in tokens)
+            self._upper += sum(w.isupper() for w in tokens)
+            self._finish(len(self._tokens) - self._lookahead)
+        else:
+            self._tail += chunk
+        return self.scores()
+
+    def _window_sentiments(self, start, tail_tokens=()):
+        # sentiments of the tokens from `start` on (with and without the caps
+        # differential), using the `context` tokens before it as look-back
+        begin = max(0, start - self._context)
+        window = self._tokens[begin:] + list(tail_tokens)
+        sentitext = SentiText("", self.analyzer.lexicon, window)
+        sentitext.is_cap_diff = False
+        plain = self.analyzer._token_sentiments(sentitext)[start - begin :]
+        if not any(sentitext.is_upper):
+            return plain, plain
+        sentitext.is_cap_diff = True
+        capped = self.analyzer._token_sentiments(sentitext)[start - begin :]
+        return plain, capped
+
+    def _finish(self, end):
+        start = len(self._finished[0])
+        if end <= start:
+            return
+        plain, capped = self._window_sentiments(start)
+        for i, low, high in zip(range(start, end), plain, capped):
+            self._finished[0].append(low)
+            self._finished[1].append(high)
+            if self._words_lower[i] == "but" and (
+                self._but is None or self.analyzer.multi_but
+            ):
+                self._but = i
+                self._reweigh()
+                continue
+            for cap, sentiment in ((False, low), (True, high)):
+                self._sums[("none", cap)].add(sentiment)
+                self._sums[("before_but", cap)].add(sentiment * 0.5)
+                if self._but is not None:
+                    self._sums[("after_but", cap)].add(sentiment * 1.5)
+
+    def _reweigh(self):
+        # the finished tokens as _but_check weighs them around self._but
+        pivot = self._but
+        for cap in (False, True):
+            sums = _ValenceSums()
+            finished = self._finished[cap]
+            for sentiment in finished[:pivot]:
+                sums.add(sentiment * 0.5)
+            sums.add(finished[pivot])
+            for sentiment in finished[pivot + 1 :]:
+                sums.add(sentiment * 1.5)
+            self._sums[("after_but", cap)] = sums
+            self._sums[("none", cap)].add(finished[pivot])
+            self._sums[("before_but", cap)].add(finished[pivot] * 0.5)
+
+    def scores(self):
+        """
+        Polarity scores of the text appended so far
+        """
+        analyzer = self.analyzer
+        tail = analyzer.emoji_replacer.replace(self._tail)
+        tail_tokens = _split_tokens(tail)
+        count = len(self._tokens) + len(tail_tokens)
+        if not count:
+            return analyzer.score_valence([], "")
+        upper = self._upper + sum(w.isupper() for w in tail_tokens)
+        is_cap_diff = 0 < count - upper < count
+
+        start = len(self._finished[0])
+        pending = self._window_sentiments(start, tail_tokens)[is_cap_diff]
+        pending_lower = self._words_lower[start:] + [w.lower() for w in tail_tokens]
+
+        # pivot of _but_check: the first 'but' (last one with multi_but)
+        pivot = self._but
+        if "but" in pending_lower and (pivot is None or analyzer.multi_but):
+            if analyzer.multi_but:
+                pivot = len(pending_lower) - 1 - pending_lower[::-1].index("but")
+            else:
+                pivot = pending_lower.index("but")
+            pivot += start
+        if pivot is None:
+            sums = self._sums[("none", is_cap_diff)].copy()
+        elif pivot >= start:
+            sums = self._sums[("before_but", is_cap_diff)].copy()
+        else:
+            sums = self._sums[("after_but", is_cap_diff)].copy()
+        for i, sentiment in enumerate(pending, start):
+            if pivot is None or i == pivot:
+                sums.add(sentiment)
+            elif i < pivot:
+                sums.add(sentiment * 0.5)
+            else:
+                sums.add(sentiment * 1.5)
+
+        # only the capped counts matter to the punctuation emphasis
+        ep_count = min(self._ep_count + tail.count("!"), 4)
+        qm_count = min(self._qm_count + tail.count("?"), 4)
+        punct_emph_amplifier = analyzer._punctuation_emphasis(
+            "!" * ep_count + "?" * qm_count
+        )
+        return analyzer._valence_dict(
+            float(sums.total()),
+            sums.pos_sum,
+            sums.neg_sum,
+            sums.neu,
+            punct_emph_amplifier,
+        )
+
+
+# #Vectorized aggregation# #
+
+
+def score_valence_batch(valences, lengths, ep_counts, qm_counts, alpha=15):
+    """
+    Vectorized SentimentIntensityAnalyzer.score_valence for a batch of texts.
+    `valences` holds the per-token sentiments of every text back to back
+    (a ragged array), `lengths` the token count of each text, and
+    `ep_counts` / `qm_counts` the "!" and "?" counts of each text.
+    Returns unrounded (neg, neu, pos, compound) arrays
+    """
+    values = np.asarray(valences, dtype=np.float64)
+    lengths = np.asarray(lengths, dtype=np.intp)
+    size = len(lengths)
+    text_ids = np.repeat(np.arange(size), lengths)
+    # bincount adds each text's weights in order, matching sum() and the
+    # running sums of _sift_sentiment_scores
+    sum_s = np.bincount(text_ids, values, minlength=size)
+    pos_sum = np.bincount(
+        text_ids, np.where(values > 0, values + 1, 0.0), minlength=size
+    )
+    neg_sum = np.bincount(
+        text_ids, np.where(values < 0, values - 1, 0.0), minlength=size
+    )
+    neu_count = np.bincount(text_ids, values == 0, minlength=size)
+
+    # punctuation emphasis, as in _amplify_ep and _amplify_qm
+    qm_counts = np.asarray(qm_counts)
+    amplifier = np.minimum(np.asarray(ep_counts), 4) * 0.292 + np.where(
+        qm_counts > 3, 0.96, np.where(qm_counts > 1, qm_counts * 0.18, 0.0)
+    )
+
+    sum_s = np.where(
+        sum_s > 0, sum_s + amplifier, np.where(sum_s < 0, sum_s - amplifier, sum_s)
+    )
+    compound = np.clip(sum_s / np.sqrt(sum_s * sum_s + alpha), -1.0, 1.0)
+
+    abs_neg = np.fabs(neg_sum)
+    pos_wins = pos_sum > abs_neg
+    neg_wins = pos_sum < abs_neg
+    pos_sum = np.where(pos_wins, pos_sum + amplifier, pos_sum)
+    neg_sum = np.where(neg_wins, neg_sum - amplifier, neg_sum)
+
+    # texts without tokens score 0 everywhere, like score_valence
+    empty = lengths == 0
+    total = np.where(empty, 1.0, pos_sum + np.fabs(neg_sum) + neu_count)
+    pos = np.where(empty, 0.0, np.fabs(pos_sum / total))
+    neg = np.where(empty, 0.0, np.fabs(neg_sum / total))
+    neu = np.where(empty, 0.0, np.fabs(neu_count / total))
+    compound = np.where(empty, 0.0, compound)
+    return neg, neu, pos, compound
+
+
+# #Corpus scoring# #
+
+# analyzers built in executor worker processes for chunked_scores, by options
+_options_analyzers = {}
+
+
+def _score_with_options(options, texts):
+    key = json.dumps(options, sort_keys=True)
+    analyzer = _options_analyzers.get(key)
+    if analyzer is None:
+        # lexicon overlay swaps change the options; keep only a few analyzers
+        if len(_options_analyzers) >= 4:
+            _options_analyzers.clear()
+        analyzer = _options_analyzers[key] = SentimentIntensityAnalyzer(**options)
+    return analyzer.polarity_scores_batch(texts)
+
+
+# analyzer owned by each score_corpus worker process, built once by the initializer
+_corpus_analyzer = None
+
+
+def _init_corpus_worker(analyzer_kwargs):
+    global _corpus_analyzer
+    _corpus_analyzer = SentimentIntensityAnalyzer(**analyzer_kwargs)
+
+
+def _score_corpus_chunk(texts):
+    return _corpus_analyzer.polarity_scores_batch(texts)
+
+
+def score_corpus(
+    texts, workers=None, chunk_size=256, start_method=None, **analyzer_kwargs
+):
+    """
+    Score an iterable of texts on a process pool and yield the polarity scores
+    in input order. Each worker loads the lexicon once; at most 2 * workers
+    chunks are in flight, so memory stays bounded on arbitrarily long inputs.
+    :param texts: any iterable of strings (consumed lazily)
+    :param workers: process count (default os.cpu_count(); 1 scores in-process)
+    :param chunk_size: texts sent to a worker per task
+    :param start_method: multiprocessing start method ("fork", "spawn", ...)
+    :param analyzer_kwargs: forwarded to SentimentIntensityAnalyzer in each worker
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    texts = iter(texts)
+    if workers <= 1:
+        analyzer = SentimentIntensityAnalyzer(**analyzer_kwargs)
+        for scores in analyzer.iter_polarity_scores(texts):
+            yield scores
+        return
+
+    context = multiprocessing.get_context(start_method)
+    pool = context.Pool(workers, _init_corpus_worker, (analyzer_kwargs,))
+    pending = deque()
+    try:
+        while True:
+            chunk = list(islice(texts, chunk_size))
+            if chunk:
+                pending.append(pool.apply_async(_score_corpus_chunk, (chunk,)))
+            if pending and (not chunk or len(pending) >= 2 * workers):
+                for scores in pending.popleft().get():
+                    yield scores
+            elif not chunk:
+                break
+        pool.close()
+    finally:
+        # also reached when the consumer stops early or a worker fails
+        pool.terminate()
+        pool.join()
+
+
 if __name__ == "__main__":
     # --- examples -------
     sentences = [
@@ -834,21 +2560,14 @@ if __name__ == "__main__":
         )
     )
     print(
-        "  -- You could use NLTK to break the paragraph into sentence tokens for VADER, then average the results for the paragraph like this: \n"
-    )
-    # simple example to tokenize paragraph into sentences for VADER
-    from nltk import tokenize
-
-    sentence_list = tokenize.sent_tokenize(paragraph)
-    paragraphSentiments = 0.0
-    for sentence in sentence_list:
-        vs = analyzer.polarity_scores(sentence)
-        print("{:-<69} {}".format(sentence, str(vs["compound"])))
-        paragraphSentiments += vs["compound"]
-    print(
-        "AVERAGE SENTIMENT FOR PARAGRAPH: \t"
-        + str(round(paragraphSentiments / len(sentence_list), 4))
+        "  -- document_scores splits the paragraph into sentences for VADER, then averages the results for the paragraph like this: \n"
     )
+    document = analyzer.document_scores(paragraph)
+    for sentence in document["sentences"]:
+        print(
+            "{:-<69} {}".format(sentence["text"], str(sentence["scores"]["compound"]))
+        )
+    print("AVERAGE SENTIMENT FOR PARAGRAPH: \t" + str(document["document"]["compound"]))
     print("----------------------------------------------------")
 
     # input("\nPress Enter to continue the demo...\n")  # for DEMO purposes...
@@ -0,0 +1,283 @@
+"""
+In-process write-behind buffer for analysis documents.
+
+Request handlers enqueue documents and a background thread stores them with
+one unordered insert_many per batch, flushing when a batch is full or when its
+oldest document has waited `flush_interval` seconds. The queue is bounded: a
+full queue blocks producers for up to `put_timeout` seconds, then raises
+queue.Full so the caller can shed load. Durability is a per-queue setting:
+"enqueue" returns as soon as a document is queued, "flush" waits until its
+batch has been written.
+
+Usage:
+    writer = WriteBehindQueue(db.analyses, durability="flush").start()
+    install_shutdown_handlers(writer)
+    analysis_id = writer.write(document)
+
+The services build their queue with queue_from_env(), configured by the
+WRITE_BEHIND* variables in env.example (off unless WRITE_BEHIND=1).
+"""
+
+import atexit
+import os
+import queue
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import Future
+
+from bson.objectid import ObjectId
+from pymongo.errors import BulkWriteError
+
+DURABILITY_MODES = ("enqueue", "flush")
+
+# write_many's error message for a document the full queue didn't take
+QUEUE_FULL = "storage queue full"
+
+# marks the end of the queue for the flush thread
+_STOP = object()
+
+
+class WriteError(Exception):
+    """A document of a flushed batch was rejected by the database."""
+
+
+class WriteBehindQueue:  # pylint: disable=too-many-instance-attributes
+    """
+    Bounded queue of documents flushed in bulk by a background thread.
+
+    Args:
+        collection: pymongo collection (anything with insert_many).
+        batch_size (int): Most documents per insert_many.
+        flush_interval (float): Seconds a batch may wait for more documents.
+        max_queue (int): Most documents waiting to be flushed.
+        put_timeout (float): Seconds a producer blocks on a full queue.
+        durability (str): "enqueue" or "flush", see write().
+        flush_timeout (float): Default seconds write() waits in "flush" mode.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        collection,
+        batch_size=500,
+        flush_interval=0.05,
+        max_queue=10000,
+        put_timeout=1.0,
+        durability="enqueue",
+        flush_timeout=10.0,
+    ):
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"unknown durability: {durability}")
+        self.collection = collection
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.put_timeout = put_timeout
+        self.durability = durability
+        self.flush_timeout = flush_timeout
+        self._queue = queue.Queue(max_queue)
+        self._thread = None
+        self._closed = False
+        self._lock = threading.Lock()
+        self._counters = {
+            "enqueued": 0,
+            "rejected": 0,
+            "flushed": 0,
+            "failed": 0,
+            "flushes": 0,
+        }
+        self._flush_ms = {"last": 0.0, "max": 0.0, "total": 0.0}
+
+    def start(self):
+        """Start the flush thread (once)."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="write-behind", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def put(self, document):
+        """
+        Queue `document` (given an ObjectId _id if it has none).
+
+        Returns:
+            Future: Resolves to the inserted id once the batch is flushed, or
+            raises WriteError / the database exception.
+
+        Raises:
+            queue.Full: The queue stayed full for `put_timeout` seconds.
+            RuntimeError: The queue was closed.
+        """
+        if self._closed:
+            raise RuntimeError("write-behind queue is closed")
+        document.setdefault("_id", ObjectId())
+        future = Future()
+        try:
+            self._queue.put((document, future), timeout=self.put_timeout)
+        except queue.Full:
+            self._count("rejected")
+            raise
+        self._count("enqueued")
+        return future
+
+    def write(self, document, timeout=None):
+        """
+        Store `document` according to the durability mode and return its id.
+
+        In "enqueue" mode this returns once the document is queued; in "flush"
+        mode it waits up to `timeout` (default `flush_timeout`) seconds for the
+        batch to be written and raises its error, if any.
+        """
+        future = self.put(document)
+        if self.durability == "flush":
+            return future.result(self.flush_timeout if timeout is None else timeout)
+        return document["_id"]
+
+    def write_many(self, documents, timeout=None):
+        """
+        Queue `documents` and return (id, error message) per document.
+
+        In "flush" mode this waits for every document's batch; in "enqueue"
+        mode only queueing errors are reported.
+        """
+        outcomes = []
+        futures = []
+        for document in documents:
+            try:
+                futures.append(self.put(document))
+                outcomes.append((document["_id"], None))
+            except queue.Full:
+                futures.append(None)
+                outcomes.append((None, QUEUE_FULL))
+        if self.durability != "flush":
+            return outcomes
+        timeout = self.flush_timeout if timeout is None else timeout
+        for i, future in enumerate(futures):
+            if future is None:
+                continue
+            try:
+                outcomes[i] = (future.result(timeout), None)
+            except Exception as storage_error:  # pylint: disable=broad-except
+                outcomes[i] = (None, str(storage_error))
+        return outcomes
+
+    def close(self, timeout=10.0):
+        """Flush everything queued so far and stop the flush thread."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is None:
+            return
+        self._queue.put((_STOP, None))
+        self._thread.join(timeout)
+
+    def stats(self):
+        """Queue depth, counters and flush latency for monitoring."""
+        with self._lock:
+            flushes = self._counters["flushes"]
+            return dict(
+                self._counters,
+                queue_depth=self._queue.qsize(),
+                max_queue=self.max_queue,
+                durability=self.durability,
+                last_flush_ms=self._flush_ms["last"],
+                max_flush_ms=self._flush_ms["max"],
+                mean_flush_ms=self._flush_ms["total"] / flushes if flushes else 0.0,
+                mean_batch=self._counters["flushed"] / flushes if flushes else 0.0,
+            )
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def _next_batch(self):
+        """Block for a document, then gather a batch; True when told to stop."""
+        document, future = self._queue.get()
+        if document is _STOP:
+            return [], True
+        batch = [(document, future)]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                document, future = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if document is _STOP:
+                return batch, True
+            batch.append((document, future))
+        return batch, False
+
+    def _run(self):
+        stop = False
+        while not stop:
+            batch, stop = self._next_batch()
+            if batch:
+                self._flush(batch)
+
+    def _flush(self, batch):
+        failed = {}
+        error = None
+        start = time.perf_counter()
+        try:
+            self.collection.insert_many(
+                [document for document, _ in batch], ordered=False
+            )
+        except BulkWriteError as bulk_error:
+            for write_error in bulk_error.details.get("writeErrors", []):
+                failed[write_error["index"]] = write_error.get("errmsg", "write error")
+        except Exception as storage_error:  # pylint: disable=broad-except
+            error = storage_error
+            print(f"Error flushing {len(batch)} analyses: {storage_error}")
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self._counters["flushes"] += 1
+            self._counters["failed"] += len(batch) if error else len(failed)
+            self._counters["flushed"] += 0 if error else len(batch) - len(failed)
+            self._flush_ms["last"] = elapsed_ms
+            self._flush_ms["max"] = max(self._flush_ms["max"], elapsed_ms)
+            self._flush_ms["total"] += elapsed_ms
+        for i, (document, future) in enumerate(batch):
+            if error is not None:
+                future.set_exception(error)
+            elif i in failed:
+                future.set_exception(WriteError(failed[i]))
+            else:
+                future.set_result(document["_id"])
+
+
+def install_shutdown_handlers(writer):
+    """
+    Flush `writer` at interpreter exit, and turn SIGTERM (docker stop) into
+    a normal exit so that happens there too.
+    """
+    atexit.register(writer.close)
+    if threading.current_thread() is threading.main_thread() and (
+        signal.getsignal(signal.SIGTERM) == signal.SIG_DFL
+    ):
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+
+def queue_from_env(collection, environ=None):
+    """
+    Start a WriteBehindQueue for `collection` configured from the environment,
+    with shutdown handlers installed, or return None unless WRITE_BEHIND=1.
+    """
+    environ = os.environ if environ is None else environ
+    if environ.get("WRITE_BEHIND", "0") != "1":
+        return None
+    writer = WriteBehindQueue(
+        collection,
+        batch_size=int(environ.get("WRITE_BEHIND_BATCH", "500")),
+        flush_interval=int(environ.get("WRITE_BEHIND_INTERVAL_MS", "50")) / 1000,
+        max_queue=int(environ.get("WRITE_BEHIND_MAX_QUEUE", "10000")),
+        put_timeout=int(environ.get("WRITE_BEHIND_PUT_TIMEOUT_MS", "1000")) / 1000,
+        durability=environ.get("WRITE_BEHIND_DURABILITY", "enqueue"),
+        flush_timeout=int(environ.get("WRITE_BEHIND_FLUSH_TIMEOUT_MS", "10000")) / 1000,
+    )
+    install_shutdown_handlers(writer.start())
+    return writer
@@ -0,0 +1,122 @@
+"""
+Concurrency of the ASGI entry point against the Flask app for POST /analyze.
+
+Both run in-process: Flask with one thread per concurrent client through its
+test client, ASGI with one coroutine per client calling the app directly.
+Storage goes to stand-ins that wait --db-latency-ms per insert (time.sleep for
+Flask, asyncio.sleep for ASGI), so a Flask request holds its thread through the
+write while an ASGI request only holds a coroutine.
+
+Run from machine_learning_client/:
+    python benchmarks/bench_asgi.py --texts 4000 --concurrency 1 16 64 256
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from unittest.mock import patch
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "app"))
+
+# pylint: disable=wrong-import-position
+import api
+import asgi_api
+from bench_batch_api import FakeCollection
+
+# bench_microbatch imports the app as app.api; pass it this api's Flask app
+from bench_microbatch import run_clients
+from corpora import tweets
+
+
+class AsyncFakeCollection:  # pylint: disable=too-few-public-methods
+    """Async collection stand-in with a fixed latency per insert."""
+
+    def __init__(self, latency):
+        self.latency = latency
+
+    async def insert_one(self, document):
+        """Insert one document in one round trip."""
+        await asyncio.sleep(self.latency)
+        return document
+
+
+async def asgi_post(body):
+    """POST `body` to /analyze through the ASGI app; returns the status."""
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop()
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "POST", "path": "/analyze"}
+    await asgi_api.app(scope, receive, send)
+    return sent[0]["status"]
+
+
+async def asgi_clients(texts, concurrency):
+    """Post `texts` from `concurrency` coroutines; returns (latencies, seconds)."""
+    latencies = []
+
+    async def client_loop(share):
+        for text in share:
+            body = json.dumps({"text": text}).encode("utf-8")
+            start = time.perf_counter()
+            assert await asgi_post(body) == 200
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(client_loop(texts[i::concurrency]) for i in range(concurrency))
+    )
+    return latencies, time.perf_counter() - start
+
+
+def percentile(values, share):
+    """The `share` quantile of `values`."""
+    return statistics.quantiles(values, n=100, method="inclusive")[int(share * 100) - 1]
+
+
+def main():
+    """Print p50/p99 latency and texts/s per concurrency level for both apps."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--texts", type=int, default=4000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64, 256])
+    parser.add_argument("--db-latency-ms", type=float, default=2)
+    args = parser.parse_args()
+
+    texts = tweets(args.texts, seed=24)
+    latency = args.db_latency_ms / 1000
+    # the cache would serve repeated texts
+    api.analyzer.cache = None
+    print(f"{'clients':>7} {'app':>6} {'p50 ms':>8} {'p99 ms':>8} {'texts/s':>8}")
+    with patch("builtins.print"), patch.object(
+        api, "analyses", FakeCollection(latency)
+    ), patch.object(api, "DB_CONNECTED", True), patch.object(
+        asgi_api, "analyses", AsyncFakeCollection(latency)
+    ), patch.object(
+        asgi_api, "DB_CONNECTED", True
+    ):
+        for concurrency in args.concurrency:
+            runs = {
+                "flask": run_clients(texts, concurrency, api.app),
+                "asgi": asyncio.run(asgi_clients(texts, concurrency)),
+            }
+            for name, (latencies, seconds) in runs.items():
+                sys.stdout.write(
+                    f"{concurrency:>7} {name:>6} "
+                    f"{percentile(latencies, 0.5) * 1000:>8.2f} "
+                    f"{percentile(latencies, 0.99) * 1000:>8.2f} "
+                    f"{len(texts) / seconds:>8.0f}\n"
+                )
+
+
+if __name__ == "__main__":
+    main()
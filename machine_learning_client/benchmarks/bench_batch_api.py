@@ -0,0 +1,132 @@
+"""
+Texts per second through POST /analyze/batch versus N single POST /analyze calls.
+
+Requests go through Flask's test client. Unless --mongo is given, the analyses
+collection is replaced by an in-memory stand-in that sleeps --db-latency-ms per
+round trip, so the comparison includes the insert_one vs insert_many round
+trips without a database. Single calls are also timed through the write-behind
+queue in both durability modes (flush mode waits out --flush-interval-ms).
+
+Run from machine_learning_client/:
+    python benchmarks/bench_batch_api.py --texts 2000 --batch-size 100
+"""
+
+import argparse
+import os
+import sys
+import time
+from unittest.mock import patch
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(BENCH_DIR, ".."))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "app"))
+
+# pylint: disable=wrong-import-position
+from corpora import tweets
+from write_behind import WriteBehindQueue
+from app import api
+
+
+class FakeCollection:
+    """Collection stand-in with a fixed latency per round trip."""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.count = 0
+
+    def _insert(self, document):
+        self.count += 1
+        document["_id"] = self.count
+
+    def insert_one(self, document):
+        """Insert one document in one round trip."""
+        time.sleep(self.latency)
+        self._insert(document)
+        return type("InsertOneResult", (), {"inserted_id": document["_id"]})
+
+    def insert_many(self, documents, ordered=True):  # pylint: disable=unused-argument
+        """Insert all documents in one round trip."""
+        time.sleep(self.latency)
+        for document in documents:
+            self._insert(document)
+
+
+def single_calls(client, texts):
+    """Seconds to post every text to /analyze."""
+    start = time.perf_counter()
+    for text in texts:
+        assert client.post("/analyze", json={"text": text}).status_code == 200
+    return time.perf_counter() - start
+
+
+def batch_calls(client, texts, batch_size):
+    """Seconds to post the texts to /analyze/batch in batches."""
+    start = time.perf_counter()
+    for i in range(0, len(texts), batch_size):
+        batch = texts[i : i + batch_size]
+        assert client.post("/analyze/batch", json={"texts": batch}).status_code == 200
+    return time.perf_counter() - start
+
+
+def write_behind_calls(client, texts, collection, durability, interval):
+    """Seconds for single calls through a write-behind queue, drained at the end."""
+    writer = WriteBehindQueue(
+        collection, flush_interval=interval, durability=durability
+    ).start()
+    with patch.object(api, "write_queue", writer):
+        start = time.perf_counter()
+        for text in texts:
+            assert client.post("/analyze", json={"text": text}).status_code == 200
+        writer.close()
+        return time.perf_counter() - start, writer.stats()
+
+
+def main():
+    """Print requests/s and texts/s for single and batched calls."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--texts", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--db-latency-ms", type=float, default=0.5)
+    parser.add_argument("--flush-interval-ms", type=float, default=5)
+    parser.add_argument("--mongo", action="store_true", help="use MONGODB_URI")
+    args = parser.parse_args()
+
+    texts = tweets(args.texts, seed=21)
+    client = api.app.test_client()
+    # the cache would serve the second pass over the same texts
+    api.analyzer.cache = None
+    collection = api.analyses
+    if not args.mongo:
+        collection = FakeCollection(args.db_latency_ms / 1000)
+    interval = args.flush_interval_ms / 1000
+    with patch("builtins.print"), patch.object(
+        api, "analyses", collection
+    ), patch.object(api, "DB_CONNECTED", True):
+        single = single_calls(client, texts)
+        batched = batch_calls(client, texts, args.batch_size)
+        behind = {
+            durability: write_behind_calls(
+                client, texts, collection, durability, interval
+            )
+            for durability in ("enqueue", "flush")
+        }
+
+    requests = -(-args.texts // args.batch_size)
+    print(f"{'mode':>8} {'requests':>9} {'req/s':>9} {'texts/s':>9}")
+    rate = args.texts / single
+    print(f"{'single':>8} {args.texts:>9} {rate:>9.0f} {rate:>9.0f}")
+    print(
+        f"{'batch':>8} {requests:>9} {requests / batched:>9.0f} "
+        f"{args.texts / batched:>9.0f}  ({single / batched:.1f}x texts/s)"
+    )
+    for durability, (seconds, stats) in behind.items():
+        rate = args.texts / seconds
+        print(
+            f"{durability:>8} {args.texts:>9} {rate:>9.0f} {rate:>9.0f}  "
+            f"({single / seconds:.1f}x texts/s, {stats['flushes']} flushes, "
+            f"{stats['mean_flush_ms']:.2f} ms mean flush)"
+        )
+
+
+if __name__ == "__main__":
+    main()
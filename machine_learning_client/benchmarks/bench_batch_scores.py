@@ -0,0 +1,70 @@
+"""
+Throughput of polarity_scores_batch versus a polarity_scores loop.
+
+Scores generated tweets in which a growing share of the texts repeat earlier
+ones, since the batch API scores each distinct text once. The analyzers run
+without a ScoreCache, so the loop rescores every repeat.
+
+Run from machine_learning_client/:
+    python benchmarks/bench_batch_scores.py --texts 20000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "app"))
+
+# pylint: disable=wrong-import-position
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+from corpora import tweets
+
+
+def with_repeats(count, repeat_share, seed=7):
+    """`count` tweets of which about `repeat_share` repeat earlier ones."""
+    rnd = random.Random(seed)
+    distinct = tweets(max(1, round(count * (1 - repeat_share))))
+    texts = distinct + [rnd.choice(distinct) for _ in range(count - len(distinct))]
+    rnd.shuffle(texts)
+    return texts
+
+
+def best_seconds(score, texts, repeat):
+    """Best-of-`repeat` seconds for score(texts)."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        score(texts)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Print texts/s of the loop and the batch API per repeated share."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--texts", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    analyzer = SentimentIntensityAnalyzer()
+
+    def loop(texts):
+        for text in texts:
+            analyzer.polarity_scores(text)
+
+    print(f"{'repeats':>7} {'loop t/s':>9} {'batch t/s':>9} {'speedup':>8}")
+    for share in (0.0, 0.5, 0.9):
+        texts = with_repeats(args.texts, share)
+        looped = best_seconds(loop, texts, args.repeat)
+        batched = best_seconds(analyzer.polarity_scores_batch, texts, args.repeat)
+        print(
+            f"{share:>7.0%} {args.texts / looped:>9.0f} "
+            f"{args.texts / batched:>9.0f} {looped / batched:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
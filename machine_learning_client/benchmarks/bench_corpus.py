@@ -0,0 +1,68 @@
+"""
+Scaling benchmark for score_corpus from 1 to N worker processes.
+
+Run from machine_learning_client/:
+    python benchmarks/bench_corpus.py --texts 200000 --max-workers 8 --start-method spawn
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app")
+)
+
+# pylint: disable=wrong-import-position
+from vaderSentiment.vaderSentiment import score_corpus
+
+SENTENCES = [
+    "VADER is smart, handsome, and funny.",
+    "The plot was good, but the characters are uncompelling.",
+    "At least it isn't a horrible book.",
+    "Today only kinda sux! But I'll get by, lol",
+    "The weather is nice today.",
+    "I'm so frustrated with this error 😡",
+]
+
+
+def make_corpus(size, seed=11):
+    """Yield `size` short texts lazily, like rows streamed from a database."""
+    rnd = random.Random(seed)
+    for i in range(size):
+        yield f"{rnd.choice(SENTENCES)} #{i}"
+
+
+def main():
+    """Run the benchmark and print texts/s per worker count."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--texts", type=int, default=50_000)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=512)
+    parser.add_argument("--start-method", default=None)
+    args = parser.parse_args()
+
+    baseline = None
+    print(f"{'workers':>7} {'seconds':>8} {'texts/s':>10} {'speedup':>8}")
+    for workers in range(1, args.max_workers + 1):
+        start = time.perf_counter()
+        count = 0
+        for _ in score_corpus(
+            make_corpus(args.texts),
+            workers=workers,
+            chunk_size=args.chunk_size,
+            start_method=args.start_method,
+        ):
+            count += 1
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(
+            f"{workers:>7} {elapsed:>8.2f} {count / elapsed:>10.0f} "
+            f"{baseline / elapsed:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Bytes written per analysis with full copies versus the deduplicated texts store.
+
+Builds a stream of submissions in which a few popular texts repeat (Zipf-like
+draws from a pool of generated tweets), then sums the BSON sizes of what each
+storage mode writes: one full analysis per submission, or one reference per
+submission plus one texts entry per distinct text.
+
+Run from machine_learning_client/:
+    python benchmarks/bench_dedup_store.py --submissions 20000 --pool 2000
+"""
+
+import argparse
+import os
+import random
+import sys
+from datetime import datetime, timezone
+
+import bson
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "app"))
+
+# pylint: disable=wrong-import-position
+from api import analysis_result, score_labels
+from corpora import tweets
+from text_store import TextStore, lexicon_key, text_hash
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+
+def submissions(count, pool_size, zipf):
+    """`count` texts drawn Zipf-like from `pool_size` generated tweets."""
+    pool = tweets(pool_size, seed=25)
+    weights = [1 / (rank + 1) ** zipf for rank in range(pool_size)]
+    return random.Random(25).choices(pool, weights, k=count)
+
+
+def entry_size(digest, text, scores, fingerprint, now):
+    """BSON bytes of the texts entry for `text`."""
+    entry = dict(
+        score_labels(scores),
+        text_id=digest,
+        text=text,
+        scores=scores,
+        lexicon_fingerprint=fingerprint,
+        first_seen=now,
+    )
+    return len(bson.encode(entry))
+
+
+def main():
+    """Print bytes written and texts scored for both storage modes."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--submissions", type=int, default=20_000)
+    parser.add_argument("--pool", type=int, default=2000)
+    parser.add_argument("--zipf", type=float, default=1.1)
+    args = parser.parse_args()
+
+    stream = submissions(args.submissions, args.pool, args.zipf)
+
+    analyzer = SentimentIntensityAnalyzer()
+    version = analyzer.lexicon_version
+    now = datetime.now(timezone.utc)
+    full = 0
+    references = 0
+    entries = {}
+    for text in stream:
+        scores = analyzer.polarity_scores(text)
+        full += len(
+            bson.encode(
+                dict(
+                    analysis_result(text, scores),
+                    lexicon_version=version,
+                    timestamp=now,
+                )
+            )
+        )
+        references += len(bson.encode(TextStore.reference(text, analyzer, now)))
+        digest = text_hash(text)
+        if digest not in entries:
+            entries[digest] = entry_size(
+                digest, text, scores, lexicon_key(analyzer), now
+            )
+    dedup = references + sum(entries.values())
+    print(f"submissions {args.submissions}, distinct texts {len(entries)}")
+    print(f"{'mode':>6} {'bytes':>11} {'per analysis':>13} {'scored':>7}")
+    print(f"{'full':>6} {full:>11} {full / args.submissions:>13.0f} {len(stream):>7}")
+    print(
+        f"{'dedup':>6} {dedup:>11} {dedup / args.submissions:>13.0f} "
+        f"{len(entries):>7}  ({full / dedup:.1f}x fewer bytes)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark emoji substitution on 10 KB emoji-heavy chat messages.
+
+Compares the original character-by-character loop against EmojiReplacer.
+Run from machine_learning_client/:  python benchmarks/bench_emoji.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app")
+)
+
+# pylint: disable=wrong-import-position
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+WORDS = "lol this is so good omg can't wait see you soon haha no way ok".split()
+
+
+def legacy_replace(text, emojis):
+    """The pre-EmojiReplacer substitution loop, kept for comparison."""
+    text_no_emoji = ""
+    prev_space = True
+    for character in text:
+        if character in emojis:
+            if not prev_space:
+                text_no_emoji += " "
+            text_no_emoji += emojis[character]
+            prev_space = False
+        else:
+            text_no_emoji += character
+            prev_space = character == " "
+    return text_no_emoji
+
+
+def make_messages(emojis, count=50, size=10_000, seed=7):
+    """Build `count` chat messages of roughly `size` characters each."""
+    rnd = random.Random(seed)
+    keys = sorted(emojis)
+    messages = []
+    for _ in range(count):
+        parts = []
+        length = 0
+        while length < size:
+            part = rnd.choice(WORDS) if rnd.random() < 0.6 else rnd.choice(keys)
+            parts.append(part)
+            length += len(part) + 1
+        messages.append(" ".join(parts))
+    return messages
+
+
+def time_it(func, messages, repeat=3):
+    """Best-of-`repeat` wall time for running `func` over all messages."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for message in messages:
+            func(message)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Run the benchmark and print a small report."""
+    analyzer = SentimentIntensityAnalyzer()
+    messages = make_messages(analyzer.emojis)
+    total_kb = sum(len(m.encode("utf-8")) for m in messages) / 1024
+    legacy = time_it(lambda m: legacy_replace(m, analyzer.emojis), messages)
+    current = time_it(analyzer.emoji_replacer.replace, messages)
+    print(f"{len(messages)} messages, {total_kb:.0f} KB total")
+    print(f"legacy loop   : {legacy * 1000:8.1f} ms  ({total_kb / legacy:8.0f} KB/s)")
+    print(f"EmojiReplacer : {current * 1000:8.1f} ms  ({total_kb / current:8.0f} KB/s)")
+    print(f"speedup       : {legacy / current:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Cost of rule-stage instrumentation, and where scoring time goes.
+
+Compares an analyzer that was never instrumented, one whose instrumentation
+was switched off again, and an instrumented one, then prints the stage table.
+
+Run from machine_learning_client/:
+    python benchmarks/bench_instrumentation.py --texts 20000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app")
+)
+
+# pylint: disable=wrong-import-position
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+SENTENCES = [
+    "VADER is smart, handsome, and funny.",
+    "The plot was good, but the characters are uncompelling.",
+    "At least it isn't a horrible book.",
+    "Today only kinda sux! But I'll get by, lol",
+    "The weather is nice today.",
+    "I'm so frustrated with this error 😡",
+]
+
+
+def best_of(analyzer, texts, rounds=5):
+    """Best wall time over `rounds` passes of polarity_scores."""
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for text in texts:
+            analyzer.polarity_scores(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    """Print the overhead of each mode and the per-stage breakdown."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--texts", type=int, default=20_000)
+    args = parser.parse_args()
+
+    rnd = random.Random(5)
+    texts = [f"{rnd.choice(SENTENCES)} #{i}" for i in range(args.texts)]
+
+    plain = SentimentIntensityAnalyzer()
+    switched_off = SentimentIntensityAnalyzer(instrument=True)
+    switched_off.disable_instrumentation()
+    instrumented = SentimentIntensityAnalyzer(instrument=True)
+
+    baseline = best_of(plain, texts)
+    for label, analyzer in (("off", switched_off), ("on", instrumented)):
+        elapsed = best_of(analyzer, texts)
+        print(f"{label:>4}: {elapsed:.3f}s ({(elapsed / baseline - 1) * 100:+.1f}%)")
+
+    snapshot = instrumented.instrumentation_snapshot()
+    print(f"\n{'stage':>10} {'calls':>9} {'ms':>9} {'share':>6}")
+    for stage, counters in snapshot["stages"].items():
+        share = counters["ns"] / snapshot["total_ns"]
+        print(
+            f"{stage:>10} {counters['calls']:9d} {counters['ns'] / 1e6:9.1f} "
+            f"{share:6.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Memory footprint and lookup speed of the dict, compact and mmap lexicons.
+
+Footprint is measured twice: the backends' own estimate (lexicon_memory_bytes)
+and the Python heap bytes tracemalloc sees held after building the backend from
+the lexicon file (the mmap backend's pages are outside the Python heap).
+
+Run from machine_learning_client/:
+    python benchmarks/bench_lexicon_footprint.py
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app")
+)
+
+# pylint: disable=wrong-import-position
+from vaderSentiment.vaderSentiment import (
+    CompactLexicon,
+    SentimentIntensityAnalyzer,
+    lexicon_memory_bytes,
+    mapped_lexicon_path,
+    MappedLexicon,
+)
+
+TEXT = (
+    "VADER is VERY SMART, uber handsome, and FRIGGIN FUNNY!!! "
+    "The plot was good, but the characters are uncompelling."
+)
+
+
+def traced_bytes(build):
+    """Python heap bytes still held by the lexicon returned from `build()`."""
+    tracemalloc.start()
+    lexicon = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del lexicon
+    return current
+
+
+def lookup_ns(lexicon, words, repeat=2000):
+    """Nanoseconds per token for the SentiText valence lookup."""
+    lookup_many = getattr(lexicon, "lookup_many", None)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        if lookup_many is None:
+            _ = [lexicon.get(w) for w in words]
+        else:
+            _ = lookup_many(words)
+    return (time.perf_counter() - start) / (repeat * len(words)) * 1e9
+
+
+def main():
+    """Print one row per backend."""
+    analyzer = SentimentIntensityAnalyzer(lexicon_backend="mmap")
+    lexicon_path = os.path.join(
+        os.path.dirname(sys.modules[SentimentIntensityAnalyzer.__module__].__file__),
+        "vader_lexicon.txt",
+    )
+    with open(lexicon_path, encoding="utf-8") as f:
+        lexicon_text = f.read()
+    builders = {
+        "dict": lambda: analyzer.make_lex_dict(lexicon_text),
+        "compact": lambda: CompactLexicon(analyzer.make_lex_dict(lexicon_text)),
+        "mmap": lambda: MappedLexicon(
+            mapped_lexicon_path(analyzer.lexicon_fingerprint)
+        ),
+    }
+
+    words = TEXT.lower().split()
+    dict_bytes = None
+    print(
+        f"{'backend':>8} {'estimate':>10} {'traced':>10} {'vs dict':>8} {'ns/tok':>7}"
+    )
+    for backend, build in builders.items():
+        # trace first: interned keys of an earlier build would be reused
+        traced = traced_bytes(build)
+        lexicon = build()
+        estimate = lexicon_memory_bytes(lexicon)
+        if dict_bytes is None:
+            dict_bytes = estimate
+        print(
+            f"{backend:>8} {estimate:10d} {traced:10d} "
+            f"{estimate / dict_bytes:8.2f} {lookup_ns(lexicon, words):7.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Latency and throughput of POST /analyze with and without micro-batching.
+
+Each concurrency level runs that many client threads, each posting texts one
+at a time through its own Flask test client, and reports p50/p99 request
+latency and total texts/s. Storage goes to the in-memory collection of
+bench_batch_api.py, which sleeps --db-latency-ms per round trip.
+
+Run from machine_learning_client/:
+    python benchmarks/bench_microbatch.py --texts 4000 --concurrency 1 4 16 64
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(BENCH_DIR, ".."))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "app"))
+
+# pylint: disable=wrong-import-position
+from bench_batch_api import FakeCollection
+from corpora import tweets
+from microbatch import MicroBatcher
+from app import api
+
+
+def run_clients(texts, concurrency, flask_app=None):
+    """Post `texts` from `concurrency` threads; returns (latencies, seconds)."""
+    flask_app = flask_app or api.app
+    latencies = []
+    lock = threading.Lock()
+
+    def client_loop(share):
+        client = flask_app.test_client()
+        mine = []
+        for text in share:
+            start = time.perf_counter()
+            assert client.post("/analyze", json={"text": text}).status_code == 200
+            mine.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(mine)
+
+    threads = [
+        threading.Thread(target=client_loop, args=(texts[i::concurrency],))
+        for i in range(concurrency)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, time.perf_counter() - start
+
+
+def percentile(values, share):
+    """The `share` quantile of `values`."""
+    return statistics.quantiles(values, n=100, method="inclusive")[int(share * 100) - 1]
+
+
+def main():
+    """Print p50/p99 latency and texts/s per concurrency level, off and on."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--texts", type=int, default=4000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--db-latency-ms", type=float, default=0.5)
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--wait-ms", type=float, default=2)
+    args = parser.parse_args()
+
+    texts = tweets(args.texts, seed=23)
+    # the cache would serve repeated texts
+    api.analyzer.cache = None
+    collection = FakeCollection(args.db_latency_ms / 1000)
+    print(
+        f"{'clients':>7} {'mode':>6} {'p50 ms':>8} {'p99 ms':>8} {'texts/s':>8} "
+        f"{'batch':>6}"
+    )
+    with patch("builtins.print"), patch.object(
+        api, "analyses", collection
+    ), patch.object(api, "DB_CONNECTED", True):
+        for concurrency in args.concurrency:
+            for mode in ("off", "on"):
+                batcher = None
+                if mode == "on":
+                    batcher = MicroBatcher(
+                        api.analyze_many, args.max_batch, args.wait_ms / 1000
+                    )
+                with patch.object(api, "batcher", batcher):
+                    latencies, seconds = run_clients(texts, concurrency)
+                mean_batch = batcher.stats()["mean_batch"] if batcher else 1.0
+                sys.stdout.write(
+                    f"{concurrency:>7} {mode:>6} "
+                    f"{percentile(latencies, 0.5) * 1000:>8.2f} "
+                    f"{percentile(latencies, 0.99) * 1000:>8.2f} "
+                    f"{len(texts) / seconds:>8.0f} {mean_batch:>6.1f}\n"
+                )
+
+
+if __name__ == "__main__":
+    main()
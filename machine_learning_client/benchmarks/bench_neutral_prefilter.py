@@ -0,0 +1,58 @@
+"""
+Throughput of polarity_scores with and without the neutral prefilter.
+
+Scores mixes of generated tweets and neutral chatter (messages with no
+lexicon, emoji or idiom hits) at several neutral shares, and reports how often
+the fast path fired.
+
+Run from machine_learning_client/:
+    python benchmarks/bench_neutral_prefilter.py --texts 20000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "app"))
+
+# pylint: disable=wrong-import-position
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+from corpora import neutral_mix
+
+
+def texts_per_second(analyzer, texts, repeat):
+    """Best-of-`repeat` texts per second for polarity_scores over `texts`."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            analyzer.polarity_scores(text)
+        best = min(best, time.perf_counter() - start)
+    return len(texts) / best
+
+
+def main():
+    """Print texts/s with the prefilter off and on per neutral share."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--texts", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    full = SentimentIntensityAnalyzer()
+    full.prefilter_neutral = False
+    print(
+        f"{'neutral':>7} {'off t/s':>9} {'on t/s':>9} {'speedup':>8} {'fast path':>9}"
+    )
+    for share in (0.0, 0.5, 0.7, 0.9, 1.0):
+        texts = neutral_mix(args.texts, share)
+        fast = SentimentIntensityAnalyzer()
+        off = texts_per_second(full, texts, args.repeat)
+        on = texts_per_second(fast, texts, args.repeat)
+        rate = fast.scoring_stats()["fast_path_rate"]
+        print(f"{share:>7.0%} {off:>9.0f} {on:>9.0f} {on / off:>7.2f}x {rate:>9.1%}")
+
+
+if __name__ == "__main__":
+    main()
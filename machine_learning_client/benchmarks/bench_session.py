@@ -0,0 +1,57 @@
+"""
+Typing simulation: rescoring the whole message per keystroke vs a session.
+
+Run from machine_learning_client/:
+    python benchmarks/bench_session.py --words 400
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app")
+)
+
+# pylint: disable=wrong-import-position
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+WORDS = (
+    "the movie was good but the ending felt VERY rushed and kind of sad "
+    "I am not happy with it at least the music was great !! lol 😁"
+).split()
+
+
+def main():
+    """Feed a message one character at a time both ways and compare."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--words", type=int, default=400)
+    args = parser.parse_args()
+
+    rnd = random.Random(3)
+    message = " ".join(rnd.choice(WORDS) for _ in range(args.words))
+    analyzer = SentimentIntensityAnalyzer()
+
+    start = time.perf_counter()
+    for end in range(1, len(message) + 1):
+        expected = analyzer.polarity_scores(message[:end])
+    rescan = time.perf_counter() - start
+
+    session = analyzer.session()
+    start = time.perf_counter()
+    for end in range(1, len(message) + 1):
+        scores = session.update(message[:end])
+    incremental = time.perf_counter() - start
+
+    assert scores == expected
+    keystrokes = len(message)
+    print(
+        f"{keystrokes} keystrokes: full rescore {rescan / keystrokes * 1e6:.0f} us/key, "
+        f"session {incremental / keystrokes * 1e6:.0f} us/key"
+    )
+
+
+if __name__ == "__main__":
+    main()
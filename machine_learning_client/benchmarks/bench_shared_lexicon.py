@@ -0,0 +1,113 @@
+"""
+Per-worker memory and lookup speed of the dict vs memory-mapped lexicon.
+
+Forks N workers that each build their own analyzer (as pre-forked API workers
+without --preload do), score a few thousand texts and report RSS and PSS
+(proportional set size, which splits shared pages between the processes that
+map them). Linux only, since it reads /proc/self/smaps_rollup.
+
+Run from machine_learning_client/:
+    python benchmarks/bench_shared_lexicon.py --workers 8
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app")
+)
+
+# pylint: disable=wrong-import-position
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+SENTENCES = [
+    "VADER is smart, handsome, and funny.",
+    "The plot was good, but the characters are uncompelling.",
+    "At least it isn't a horrible book.",
+    "Today only kinda sux! But I'll get by, lol",
+    "The weather is nice today.",
+    "I'm so frustrated with this error 😡",
+]
+
+
+def memory_kib():
+    """Return (rss, pss) of the current process in KiB."""
+    values = {}
+    with open("/proc/self/smaps_rollup", encoding="ascii") as f:
+        for line in f:
+            parts = line.split()
+            if parts[0] in ("Rss:", "Pss:"):
+                values[parts[0]] = int(parts[1])
+    return values["Rss:"], values["Pss:"]
+
+
+def worker(backend, barrier, results):
+    """Build an analyzer, score texts, then report memory while all workers live."""
+    before = memory_kib()
+    analyzer = SentimentIntensityAnalyzer(lexicon_backend=backend)
+    for i in range(5000):
+        analyzer.polarity_scores(f"{SENTENCES[i % len(SENTENCES)]} #{i}")
+    barrier.wait()
+    after = memory_kib()
+    results.put((after[0], after[1], after[0] - before[0], after[1] - before[1]))
+    barrier.wait()
+
+
+def measure(backend, workers):
+    """Return averaged (rss, pss, rss delta, pss delta) over `workers` processes."""
+    ctx = multiprocessing.get_context("fork")
+    barrier = ctx.Barrier(workers)
+    results = ctx.Queue()
+    processes = [
+        ctx.Process(target=worker, args=(backend, barrier, results))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    samples = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return [sum(column) / workers for column in zip(*samples)]
+
+
+def lookup_ns(analyzer, words, repeat=200):
+    """Nanoseconds per token for the SentiText valence lookup."""
+    lexicon = analyzer.lexicon
+    lookup_many = getattr(lexicon, "lookup_many", None)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        if lookup_many is None:
+            _ = [lexicon.get(w) for w in words]
+        else:
+            _ = lookup_many(words)
+    return (time.perf_counter() - start) / (repeat * len(words)) * 1e9
+
+
+def main():
+    """Print per-worker memory and lookup speed for each backend."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    # make sure both compiled artifacts exist so workers only load them
+    SentimentIntensityAnalyzer(lexicon_backend="mmap")
+
+    words = " ".join(SENTENCES).lower().split() * 20
+    print(f"{args.workers} workers, KiB per worker (delta = analyzer + scoring)")
+    print(
+        f"{'backend':>8} {'RSS':>8} {'PSS':>8} {'RSS d':>8} {'PSS d':>8} {'ns/tok':>7}"
+    )
+    for backend in ("dict", "mmap"):
+        rss, pss, rss_delta, pss_delta = measure(backend, args.workers)
+        speed = lookup_ns(SentimentIntensityAnalyzer(lexicon_backend=backend), words)
+        print(
+            f"{backend:>8} {rss:8.0f} {pss:8.0f} {rss_delta:8.0f} {pss_delta:8.0f} "
+            f"{speed:7.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Offline benchmark suite for the VADER engine, with baseline save/compare.
+
+Measures polarity_scores throughput on the generated corpora in corpora.py
+(short tweets, long reviews, emoji-heavy and ALL CAPS-heavy texts) and the
+construction time and Python heap memory of each lexicon backend. Cold
+construction runs in a fresh process with an empty lexicon cache directory,
+warm construction in a fresh process that finds the compiled artifacts.
+
+Run from machine_learning_client/:
+    python benchmarks/bench_suite.py --save baseline.json
+    python benchmarks/bench_suite.py --compare baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "app"))
+
+# pylint: disable=wrong-import-position
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+from corpora import CORPORA
+
+BACKENDS = ("dict", "compact", "mmap")
+CORPUS_SIZES = {"tweets": 2000, "reviews": 100, "emoji_heavy": 2000, "caps_heavy": 2000}
+# metrics measured in these units are better when lower
+LOWER_IS_BETTER = ("ms", "KiB")
+
+
+def throughput(analyzer, texts, repeat):
+    """Best-of-`repeat` texts per second for polarity_scores over `texts`."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            analyzer.polarity_scores(text)
+        best = min(best, time.perf_counter() - start)
+    return len(texts) / best
+
+
+def construct(backend):
+    """Build one analyzer and return (milliseconds, traced KiB held after it)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    analyzer = SentimentIntensityAnalyzer(lexicon_backend=backend)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del analyzer
+    return elapsed * 1000, current / 1024
+
+
+def construct_in_subprocess(backend, cache_dir):
+    """Run construct() in a fresh interpreter using `cache_dir` as the lexicon cache."""
+    env = dict(os.environ, VADER_LEXICON_CACHE=cache_dir)
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--construct", backend],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def run_suite(scale, repeat):
+    """Return {metric: [value, unit]} for the whole suite."""
+    results = {}
+    analyzer = SentimentIntensityAnalyzer()
+    for name, generate in CORPORA.items():
+        texts = generate(max(1, int(CORPUS_SIZES[name] * scale)))
+        results[f"{name} polarity_scores"] = [
+            throughput(analyzer, texts, repeat),
+            "texts/s",
+        ]
+    for backend in BACKENDS:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cold_ms, _ = construct_in_subprocess(backend, cache_dir)
+            warm = [construct_in_subprocess(backend, cache_dir) for _ in range(repeat)]
+        results[f"{backend} construct cold"] = [cold_ms, "ms"]
+        results[f"{backend} construct warm"] = [min(ms for ms, _ in warm), "ms"]
+        results[f"{backend} heap after construct"] = [warm[0][1], "KiB"]
+    return results
+
+
+def print_table(results, baseline=None):
+    """Print the results, with a ratio column when a baseline is given."""
+    header = f"{'metric':<32} {'value':>12} {'unit':<8}"
+    if baseline is not None:
+        header += f" {'baseline':>12} {'ratio':>7}"
+    print(header)
+    for metric, (value, unit) in results.items():
+        row = f"{metric:<32} {value:12.1f} {unit:<8}"
+        if baseline is not None and metric in baseline:
+            base = baseline[metric][0]
+            # ratio > 1 always means "better than the baseline"
+            if unit in LOWER_IS_BETTER:
+                ratio = base / value if value else float("inf")
+            else:
+                ratio = value / base if base else float("inf")
+            row += f" {base:12.1f} {ratio:6.2f}x"
+        print(row)
+
+
+def main():
+    """Run the suite, then optionally save or compare against a baseline."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scale", type=float, default=1.0, help="corpus size factor")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save", metavar="PATH", help="write results as a baseline")
+    parser.add_argument("--compare", metavar="PATH", help="baseline to compare with")
+    parser.add_argument("--construct", choices=BACKENDS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.construct:
+        print(json.dumps(construct(args.construct)))
+        return
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+    results = run_suite(args.scale, args.repeat)
+    print(f"Python {platform.python_version()}")
+    print_table(results, baseline)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(
+                {"python": platform.python_version(), "results": results}, f, indent=2
+            )
+
+
+if __name__ == "__main__":
+    main()
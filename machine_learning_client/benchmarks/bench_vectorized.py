@@ -0,0 +1,71 @@
+"""
+Per-text score_valence vs the NumPy score_valence_batch aggregation stage.
+
+Run from machine_learning_client/:
+    python benchmarks/bench_vectorized.py --texts 20000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app")
+)
+
+# pylint: disable=wrong-import-position
+from vaderSentiment.vaderSentiment import (
+    SentimentIntensityAnalyzer,
+    score_valence_batch,
+)
+
+SENTENCES = [
+    "VADER is smart, handsome, and funny.",
+    "The plot was good, but the characters are uncompelling.",
+    "At least it isn't a horrible book!!",
+    "Today only kinda sux! But I'll get by, lol",
+    "The weather is nice today.",
+    "Is this really the best you can do???",
+]
+
+
+def main():
+    """Time the aggregation stage alone and the whole batch both ways."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--texts", type=int, default=20_000)
+    args = parser.parse_args()
+
+    rnd = random.Random(13)
+    texts = [f"{rnd.choice(SENTENCES)} #{i}" for i in range(args.texts)]
+    analyzer = SentimentIntensityAnalyzer()
+    # pylint: disable-next=protected-access
+    runs = [analyzer._sentiments(text) for text in texts]
+
+    start = time.perf_counter()
+    for sentiments, text in runs:
+        analyzer.score_valence(sentiments, text)
+    scalar = time.perf_counter() - start
+
+    start = time.perf_counter()
+    score_valence_batch(
+        [value for sentiments, _ in runs for value in sentiments],
+        [len(sentiments) for sentiments, _ in runs],
+        [text.count("!") for _, text in runs],
+        [text.count("?") for _, text in runs],
+    )
+    vectorized = time.perf_counter() - start
+    print(f"aggregation: per text {scalar:.3f}s, vectorized {vectorized:.3f}s")
+
+    start = time.perf_counter()
+    analyzer.polarity_scores_batch(texts)
+    batch = time.perf_counter() - start
+    start = time.perf_counter()
+    analyzer.polarity_scores_vectorized(texts)
+    whole = time.perf_counter() - start
+    print(f"end to end:  polarity_scores_batch {batch:.3f}s, vectorized {whole:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Deterministic, offline text corpora for the benchmark suite and the golden file.
+
+Words come from the bundled lexicons plus a fixed list of function words, so
+the corpora need no downloads and are identical on every run for a given seed.
+"""
+
+import os
+import random
+
+VADER_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "app", "vaderSentiment"
+)
+
+FILLERS = (
+    "the a an this that it i you we they he she movie film food service phone "
+    "hotel staff room battery screen plot ending price was is were are be been "
+    "and or so very really quite just too also still not never no without "
+    "but though yet kind of sort of at least most least more than ever today "
+    "again here there with for to of in on about after before because"
+).split()
+
+SPECIAL = [
+    "kind of",
+    "sort of",
+    "at least",
+    "without doubt",
+    "never so",
+    "the bomb",
+    "yeah right",
+    "cut the mustard",
+    "under the weather",
+    "no or nor",
+]
+
+PUNCTUATION = ["", "", "", ".", ",", "!", "!!", "?", "???", "!?", "..."]
+
+
+def _read_keys(filename):
+    with open(os.path.join(VADER_DIR, filename), encoding="utf-8") as f:
+        return [line.split("\t", 1)[0] for line in f if line.strip()]
+
+
+LEXICON_WORDS = _read_keys("vader_lexicon.txt")
+EMOJI = _read_keys("emoji_utf8_lexicon.txt")
+# ZWJ sequences, skin tones, flags and keycaps
+MULTI_CODEPOINT_EMOJI = [emoji for emoji in EMOJI if len(emoji) > 1]
+
+
+def _token(rnd, lexicon_share, emoji_share):
+    roll = rnd.random()
+    if roll < emoji_share:
+        pool = MULTI_CODEPOINT_EMOJI if rnd.random() < 0.3 else EMOJI
+        return rnd.choice(pool)
+    if roll < emoji_share + lexicon_share:
+        return rnd.choice(LEXICON_WORDS)
+    if roll < emoji_share + lexicon_share + 0.05:
+        return rnd.choice(SPECIAL)
+    return rnd.choice(FILLERS)
+
+
+def _sentence(rnd, length, lexicon_share=0.25, emoji_share=0.03, caps_share=0.02):
+    words = []
+    for _ in range(length):
+        word = _token(rnd, lexicon_share, emoji_share)
+        if rnd.random() < caps_share:
+            word = word.upper()
+        words.append(word)
+    words[0] = words[0][:1].upper() + words[0][1:]
+    return " ".join(words) + rnd.choice(PUNCTUATION)
+
+
+def tweets(count, seed=1):
+    """Short texts with hashtags, mentions and a few emoji."""
+    rnd = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        text = _sentence(rnd, rnd.randint(4, 18), emoji_share=0.08)
+        if rnd.random() < 0.3:
+            text += " #" + rnd.choice(LEXICON_WORDS + FILLERS)
+        if rnd.random() < 0.2:
+            text = "@" + rnd.choice(FILLERS) + " " + text
+        texts.append(text)
+    return texts
+
+
+def reviews(count, seed=2):
+    """Long multi-sentence reviews."""
+    rnd = random.Random(seed)
+    return [
+        " ".join(_sentence(rnd, rnd.randint(8, 25)) for _ in range(rnd.randint(4, 12)))
+        for _ in range(count)
+    ]
+
+
+def emoji_heavy(count, seed=3):
+    """Short texts where about half the tokens are emoji."""
+    rnd = random.Random(seed)
+    return [_sentence(rnd, rnd.randint(3, 10), emoji_share=0.5) for _ in range(count)]
+
+
+def caps_heavy(count, seed=4):
+    """Texts with many ALL CAPS words, some entirely upper case."""
+    rnd = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        text = _sentence(rnd, rnd.randint(4, 18), caps_share=0.4)
+        texts.append(text.upper() if rnd.random() < 0.15 else text)
+    return texts
+
+
+CHATTER = (
+    "ok meeting at 3pm tomorrow in room 204 see you there bus leaves 8:15 "
+    "from the station did anyone take notes on the call send me the link "
+    "file is on the shared drive update on ticket 4821 lunch downstairs "
+    "@team #standup https://example.com/docs/42 noon 10 minutes pls thx"
+).split()
+
+
+def neutral_chatter(count, seed=5):
+    """Short messages with no lexicon, emoji or idiom hits."""
+    rnd = random.Random(seed)
+    lexicon = set(LEXICON_WORDS)
+    words = [w for w in CHATTER + FILLERS if w.lower() not in lexicon]
+    return [
+        " ".join(rnd.choice(words) for _ in range(rnd.randint(3, 16)))
+        + rnd.choice(["", "", ".", "?"])
+        for _ in range(count)
+    ]
+
+
+def neutral_mix(count, neutral_share, seed=6):
+    """Tweets interleaved with neutral chatter, `neutral_share` of them neutral."""
+    rnd = random.Random(seed)
+    neutral = iter(neutral_chatter(count, seed))
+    scored = iter(tweets(count, seed))
+    return [
+        next(neutral) if rnd.random() < neutral_share else next(scored)
+        for _ in range(count)
+    ]
+
+
+CORPORA = {
+    "tweets": tweets,
+    "reviews": reviews,
+    "emoji_heavy": emoji_heavy,
+    "caps_heavy": caps_heavy,
+}
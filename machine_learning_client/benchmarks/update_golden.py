@@ -0,0 +1,99 @@
+"""
+Regenerate tests/data/golden_corpus.json from the current VADER engine.
+
+The golden file pins the exact scores of a fixed corpus, so tests/test_golden.py
+fails on any change to the output, down to the last bit. Only rerun this when a
+change to the scores is intended, and say so in the commit. Python 3.12 changed
+sum() to a compensated summation, which flips the sign of a few zero compound
+scores, so the file records which flavour of sum() produced it.
+
+Run from machine_learning_client/:
+    python benchmarks/update_golden.py
+"""
+
+import argparse
+import json
+import os
+import sys
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "app"))
+
+# pylint: disable=wrong-import-position
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+from corpora import CORPORA
+
+GOLDEN_PATH = os.path.join(BENCH_DIR, "..", "tests", "data", "golden_corpus.json")
+GOLDEN_SIZES = {"tweets": 300, "reviews": 30, "emoji_heavy": 150, "caps_heavy": 150}
+# analyzer options pinned alongside the defaults
+VARIANTS = {
+    "default": {},
+    "multi_but": {"multi_but": True},
+    "sentiment_laden_idioms": {"sentiment_laden_idioms": True},
+}
+EDGE_CASES = [
+    "",
+    " ",
+    "!!!",
+    "?",
+    "BUT",
+    "but but but",
+    "not",
+    "kind of",
+    "at least",
+    "the bomb",
+    "never so good",
+    "without doubt great",
+    "VADER is smart, handsome, and funny.",
+    "VADER is VERY SMART, uber handsome, and FRIGGIN FUNNY!!!",
+    "At least it isn't a horrible book.",
+    "The plot was good, but the characters are uncompelling.",
+    "Today only kinda sux! But I'll get by, lol",
+    "Catch utf-8 emoji such as 💘 and 💋 and 😁",
+    "Make sure you :) or :D today!",
+    "Not bad at all",
+    "Yeah right, that was great.",
+]
+
+
+def golden_texts():
+    """The fixed corpus: edge cases first, then each generated corpus."""
+    texts = list(EDGE_CASES)
+    for name, generate in CORPORA.items():
+        texts.extend(generate(GOLDEN_SIZES[name]))
+    return texts
+
+
+def main():
+    """Score the golden corpus under every variant and write the JSON file."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("-o", "--output", default=GOLDEN_PATH)
+    args = parser.parse_args()
+
+    texts = golden_texts()
+    scores = {}
+    for variant, options in VARIANTS.items():
+        analyzer = SentimentIntensityAnalyzer(**options)
+        scores[variant] = [
+            [result["neg"], result["neu"], result["pos"], result["compound"]]
+            for result in map(analyzer.polarity_scores, texts)
+        ]
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "compensated_sum": sys.version_info >= (3, 12),
+                "variants": VARIANTS,
+                "texts": texts,
+                "scores": scores,
+            },
+            f,
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        f.write("\n")
+    print(f"wrote {len(texts)} texts x {len(VARIANTS)} variants to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+"""Shared pytest setup for the machine learning client tests."""
+
+import os
+import sys
+
+# The services import the bundled engine as a top-level `vaderSentiment`
+# package, the way app/ is laid out inside the container. Put app/ first so
+# it wins over a vaderSentiment installed from PyPI.
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app")
+)
@@ -1,7 +1,9 @@
 """Unit tests for API routes and behavior."""
 
+import runpy
 from unittest.mock import patch
 import werkzeug
+from pymongo.errors import BulkWriteError
 from app.api import app
 
 # Workaround: set dummy version if missing (for pytest compatibility with werkzeug)
@@ -94,3 +96,301 @@ def test_analyze_db_error():
         assert resp.status_code == 200
         data = resp.get_json()
         assert data["text"] == "trigger db error"
+
+
+def test_stats_reports_score_cache_counters():
+    """/stats exposes the result cache counters."""
+    from app import api  # pylint: disable=import-outside-toplevel
+
+    client = api.app.test_client()
+    resp = client.get("/stats")
+    assert resp.status_code == 200
+    assert {"hits", "misses", "evictions"} <= set(resp.get_json()["score_cache"])
+    assert resp.get_json()["rule_stages"] is None
+    assert {"neutral_fast_path", "rule_passes"} <= set(resp.get_json()["scoring"])
+
+
+def test_stats_reports_rule_stage_timings_when_instrumented():
+    """With instrumentation on, /stats includes per-stage counters."""
+    from app import api  # pylint: disable=import-outside-toplevel
+
+    api.analyzer.enable_instrumentation()
+    try:
+        client = api.app.test_client()
+        api.analyzer.polarity_scores("The book was not bad at all!")
+        stages = client.get("/stats").get_json()["rule_stages"]["stages"]
+        assert stages["emoji"]["calls"] >= 1
+        assert stages["aggregate"]["ns"] > 0
+    finally:
+        api.analyzer.disable_instrumentation()
+
+
+def test_vectorized_buckets_match_scalar_mapping():
+    """Batch color/interpretation bucketing agrees with the scalar functions."""
+    from app import api  # pylint: disable=import-outside-toplevel
+
+    scores = [-1.0, -0.6, -0.59, -0.2, -0.19, 0.0, 0.19, 0.2, 0.59, 0.6, 1.0]
+    assert api.scores_to_colors(scores) == [api.score_to_color(s) for s in scores]
+    assert api.scores_to_interpretations(scores) == [
+        api.sentiment_to_interpretation(s) for s in scores
+    ]
+    with patch("app.api.np", None):
+        assert api.scores_to_colors(scores) == [api.score_to_color(s) for s in scores]
+
+
+def test_lexicon_overlay_swap_is_versioned_and_stored():
+    """PUT /lexicon/overlay swaps the analyzer and analyses record its version."""
+    from app import api  # pylint: disable=import-outside-toplevel
+
+    original = api.analyzer
+    client = api.app.test_client()
+    overlay = {"overrides": {"sick": 2.0}, "version": "slang-1"}
+    assert client.put("/lexicon/overlay", json=overlay).status_code == 403
+    with patch.object(api, "LEXICON_ADMIN_TOKEN", "secret"):
+        headers = {"Authorization": "Bearer secret"}
+        for bad in ({"overrides": {"sick": "very"}}, ["sick", 2.0], 3):
+            resp = client.put("/lexicon/overlay", json=bad, headers=headers)
+            assert resp.status_code == 400
+        resp = client.put("/lexicon/overlay", json=overlay, headers=headers)
+    try:
+        assert resp.get_json() == {"lexicon_version": "slang-1", "overrides": 1}
+        assert api.analyzer.base_lexicon is original.lexicon
+        with patch.object(api, "DB_CONNECTED", True), patch.object(
+            api.analyses, "insert_one"
+        ) as mock_insert:
+            data = client.post("/analyze", json={"text": "so sick"}).get_json()
+        assert data["scores"]["compound"] > 0
+        assert mock_insert.call_args[0][0]["lexicon_version"] == "slang-1"
+        assert client.get("/stats").get_json()["lexicon_version"] == "slang-1"
+    finally:
+        api.swap_analyzer(original)
+
+
+def test_lexicon_overlay_keys_are_lowercased():
+    """Mixed-case override keys apply to the lowercased tokens they match."""
+    from app import api  # pylint: disable=import-outside-toplevel
+
+    original = api.analyzer
+    client = api.app.test_client()
+    with patch.object(api, "LEXICON_ADMIN_TOKEN", "secret"):
+        headers = {"Authorization": "Bearer secret"}
+        clash = {"overrides": {"Sick": 2.0, "sick": -2.0}}
+        assert (
+            client.put("/lexicon/overlay", json=clash, headers=headers).status_code
+            == 400
+        )
+        overlay = {"overrides": {"Sick": 2.0}}
+        assert (
+            client.put("/lexicon/overlay", json=overlay, headers=headers).status_code
+            == 200
+        )
+    try:
+        assert api.analyzer.lexicon.overrides == {"sick": 2.0}
+        with patch.object(api, "DB_CONNECTED", False):
+            data = client.post("/analyze", json={"text": "so SICK"}).get_json()
+        assert data["scores"]["compound"] > 0
+    finally:
+        api.swap_analyzer(original)
+
+
+def test_analyze_limits_and_chunks_long_texts():
+    """Oversized texts get 413, long ones a chunked (or budget-exceeded) result."""
+    from app import api  # pylint: disable=import-outside-toplevel
+
+    client = api.app.test_client()
+    text = "The plot was good. " * 20
+    with patch.object(api, "MAX_TEXT_CHARS", 100):
+        assert client.post("/analyze", json={"text": text}).status_code == 413
+    with patch.object(api, "DB_CONNECTED", False), patch.object(
+        api, "CHUNK_THRESHOLD_CHARS", 100
+    ), patch.object(api, "CHUNK_CHARS", 100):
+        data = client.post("/analyze", json={"text": text}).get_json()
+        assert data["chunked"] == {"chunks": 4, "scored_chunks": 4, "complete": True}
+        assert data["color"] == api.score_to_color(data["scores"]["compound"])
+        with patch.object(api, "SCORE_BUDGET_MS", -1000):
+            resp = client.post("/analyze", json={"text": text})
+            assert resp.status_code == 503
+
+
+def test_spawned_chunk_workers_skip_server_setup():
+    """Re-run as __mp_main__ (a spawned worker), api.py connects and builds nothing."""
+    from app import api  # pylint: disable=import-outside-toplevel
+
+    with patch("pymongo.MongoClient") as mongo_client:
+        worker = runpy.run_path(api.__file__, run_name="__mp_main__")
+    mongo_client.assert_not_called()
+    assert not worker["DB_CONNECTED"] and worker["analyzer"] is None
+    assert worker["write_queue"] is worker["text_store"] is worker["batcher"] is None
+
+
+def _fake_insert_many(failing=()):
+    """insert_many stand-in that assigns ids and fails the `failing` indexes."""
+
+    def insert_many(documents, ordered=True):
+        assert not ordered
+        for i, document in enumerate(documents):
+            document["_id"] = f"id-{i}"
+        if failing:
+            raise BulkWriteError(
+                {"writeErrors": [{"index": i, "errmsg": "E11000"} for i in failing]}
+            )
+
+    return insert_many
+
+
+def test_analyze_batch_scores_and_bulk_inserts():
+    """One batch call scores every text, stores them unordered and returns ids."""
+    from app import api  # pylint: disable=import-outside-toplevel
+
+    client = api.app.test_client()
+    texts = ["The plot was good.", "", "The ending was horrible!", 42]
+    with patch.object(api, "DB_CONNECTED", True), patch.object(
+        api.analyses, "insert_many", side_effect=_fake_insert_many((1,))
+    ) as mock_insert:
+        resp = client.post("/analyze/batch", json={"texts": texts})
+    body = resp.get_json()
+    assert resp.status_code == 200 and body["stored"] == 1
+    assert mock_insert.call_count == 1
+    good, empty, bad, number = body["results"]
+    assert good["id"] == "id-0" and good["color"] == "blue"
+    assert good["scores"] == api.analyzer.polarity_scores(texts[0])
+    assert empty == number == {"error": "No text provided"}
+    assert bad["id"] is None and bad["storage_error"] == "E11000"
+    assert bad["interpretation"].startswith("🟥")
+
+
+def test_analyze_batch_rejects_bad_payloads():
+    """Missing batches, or too many texts or characters, are rejected as a whole."""
+    from app import api  # pylint: disable=import-outside-toplevel
+
+    client = api.app.test_client()
+    for bad in ({"texts": "hi"}, ["hi"], "hi"):
+        assert client.post("/analyze/batch", json=bad).status_code == 400
+    with patch.object(api, "BATCH_MAX_TEXTS", 2):
+        resp = client.post("/analyze/batch", json={"texts": ["a", "b", "c"]})
+        assert resp.status_code == 413
+    with patch.object(api, "BATCH_MAX_CHARS", 5):
+        resp = client.post("/analyze/batch", json={"texts": ["abc", "def"]})
+        assert resp.status_code == 413
+
+
+def test_analyze_stores_through_write_behind_queue():
+    """With the write-behind queue on, analyses are batched and counted in /stats."""
+    from app import api, write_behind  # pylint: disable=import-outside-toplevel
+
+    client = api.app.test_client()
+    writer = write_behind.WriteBehindQueue(api.analyses, durability="flush").start()
+    with patch.object(api, "DB_CONNECTED", True), patch.object(
+        api, "write_queue", writer
+    ), patch.object(
+        api.analyses, "insert_many", side_effect=_fake_insert_many(())
+    ) as mock_insert:
+        assert client.post("/analyze", json={"text": "so good"}).status_code == 200
+        body = client.post("/analyze/batch", json={"texts": ["a", "b"]}).get_json()
+        assert body["stored"] == 2
+        assert client.get("/stats").get_json()["write_behind"]["flushed"] == 3
+        writer.close()
+    assert mock_insert.call_count == 2
+
+    full = write_behind.WriteBehindQueue(api.analyses, max_queue=1, put_timeout=0)
+    full.put({})
+    with patch.object(api, "DB_CONNECTED", True), patch.object(
+        api, "write_queue", full
+    ):
+        resp = client.post("/analyze", json={"text": "so good"})
+    assert resp.status_code == 503 and resp.headers["Retry-After"] == "1"
+
+
+def test_analyze_microbatched_matches_single_path():
+    """A micro-batched /analyze returns what the unbatched path returns."""
+    from app import api, microbatch  # pylint: disable=import-outside-toplevel
+
+    client = api.app.test_client()
+    text = "The food was great, the service was not!"
+    with patch.object(api, "DB_CONNECTED", False):
+        expected = client.post("/analyze", json={"text": text}).get_json()
+    batcher = microbatch.MicroBatcher(api.analyze_many)
+    with patch.object(api, "batcher", batcher), patch.object(
+        api, "DB_CONNECTED", True
+    ), patch.object(
+        api.analyses, "insert_many", side_effect=_fake_insert_many(())
+    ) as mock_insert:
+        assert client.post("/analyze", json={"text": text}).get_json() == expected
+        assert client.get("/stats").get_json()["microbatch"]["items"] == 1
+    assert mock_insert.call_count == 1
+
+
+def test_analyze_microbatched_answers_503_when_the_queue_is_full():
+    """A micro-batched analysis the write-behind queue drops gets 503."""
+    from app import api, microbatch  # pylint: disable=import-outside-toplevel
+    from app import write_behind  # pylint: disable=import-outside-toplevel
+
+    full = write_behind.WriteBehindQueue(api.analyses, max_queue=1, put_timeout=0)
+    full.put({})
+    with patch.object(
+        api, "batcher", microbatch.MicroBatcher(api.analyze_many)
+    ), patch.object(api, "DB_CONNECTED", True), patch.object(api, "write_queue", full):
+        resp = api.app.test_client().post("/analyze", json={"text": "so good"})
+    assert resp.status_code == 503 and resp.headers["Retry-After"] == "1"
+
+
+def test_analyze_stores_references_when_deduplicating():
+    """With the texts collection on, analyses store a hash reference only."""
+    from app import api, text_store  # pylint: disable=import-outside-toplevel
+
+    store = text_store.TextStore(api.db.texts, api.score_labels)
+    stored = {}
+
+    def save(entries, _):
+        stored.update((digest, scores) for digest, _, scores in entries)
+        return {digest for digest, _, _ in entries}
+
+    with patch.object(api, "DB_CONNECTED", True), patch.object(
+        api, "text_store", store
+    ), patch.object(store, "lookup", side_effect=lambda *_: dict(stored)), patch.object(
+        store, "save", side_effect=save
+    ), patch.object(
+        api.analyses, "insert_one"
+    ) as mock_insert:
+        client = api.app.test_client()
+        first = client.post("/analyze", json={"text": "so good"}).get_json()
+        with patch.object(api.analyzer, "polarity_scores") as mock_scores:
+            assert client.post("/analyze", json={"text": "so good"}).get_json() == first
+            mock_scores.assert_not_called()
+        # a lone surrogate is valid JSON and must not turn into a 500
+        resp = client.post(
+            "/analyze",
+            data='{"text": "so \\ud800 good"}',
+            content_type="application/json",
+        )
+        assert resp.status_code == 200
+    document = mock_insert.call_args_list[0][0][0]
+    assert set(document) == {
+        "text_id",
+        "lexicon_fingerprint",
+        "lexicon_version",
+        "timestamp",
+    }
+    assert document["text_id"] == text_store.text_hash("so good")
+
+
+def test_analyze_stores_full_copies_when_saving_the_text_fails():
+    """An analysis only references a text that made it into the collection."""
+    from app import api, text_store  # pylint: disable=import-outside-toplevel
+
+    store = text_store.TextStore(api.db.texts, api.score_labels)
+    with patch.object(api, "DB_CONNECTED", True), patch.object(
+        api, "text_store", store
+    ), patch.object(store, "lookup", return_value={}), patch.object(
+        store, "save", side_effect=RuntimeError("Mock DB fail")
+    ), patch.object(
+        api.analyses, "insert_one"
+    ) as mock_insert, patch.object(
+        api.analyses, "insert_many", side_effect=_fake_insert_many()
+    ) as mock_insert_many:
+        client = api.app.test_client()
+        result = client.post("/analyze", json={"text": "so good"}).get_json()
+        client.post("/analyze/batch", json={"texts": ["so bad"]})
+    document = mock_insert.call_args[0][0]
+    assert document["text"] == "so good" and document["scores"] == result["scores"]
+    assert mock_insert_many.call_args[0][0][0]["text"] == "so bad"
@@ -0,0 +1,105 @@
+"""Unit tests for the ASGI entry point in app/asgi_api.py"""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+from app import asgi_api
+
+
+class MemoryCollection:  # pylint: disable=too-few-public-methods
+    """Async stand-in for the analyses collection."""
+
+    def __init__(self, fail=False):
+        self.documents = []
+        self.fail = fail
+
+    async def insert_one(self, document):
+        """Store `document` after yielding to the event loop."""
+        await asyncio.sleep(0)
+        if self.fail:
+            raise RuntimeError("Mock DB fail")
+        self.documents.append(document)
+
+
+def call(method, path, body=b"", chunk_size=None):
+    """Run one request through the ASGI app; returns (status, headers, JSON)."""
+    chunk_size = chunk_size or max(len(body), 1)
+    chunks = [body[i : i + chunk_size] for i in range(0, len(body), chunk_size)]
+    messages = [
+        {"type": "http.request", "body": chunk, "more_body": i < len(chunks) - 1}
+        for i, chunk in enumerate(chunks or [b""])
+    ]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": method, "path": path}
+    asyncio.run(asgi_api.app(scope, receive, send))
+    assert [message["type"] for message in sent] == [
+        "http.response.start",
+        "http.response.body",
+    ]
+    return sent[0]["status"], dict(sent[0]["headers"]), json.loads(sent[1]["body"])
+
+
+def test_analyze_matches_flask_contract_and_stores():
+    """POST /analyze answers like the Flask app and stores the analysis."""
+    text = "The food was great, the service was not!"
+    collection = MemoryCollection()
+    with patch.object(asgi_api, "analyses", collection), patch.object(
+        asgi_api, "DB_CONNECTED", True
+    ), patch.object(asgi_api.api, "DB_CONNECTED", False):
+        status, headers, body = call(
+            "POST", "/analyze", json.dumps({"text": text}).encode(), chunk_size=7
+        )
+        expected = (
+            asgi_api.api.app.test_client().post("/analyze", json={"text": text})
+        ).get_json()
+    assert status == 200 and headers[b"content-type"] == b"application/json"
+    assert body == expected
+    assert len(collection.documents) == 1
+    assert collection.documents[0]["text"] == text
+    assert collection.documents[0]["lexicon_version"]
+
+
+def test_analyze_errors():
+    """Bad requests get the Flask app's status codes; storage errors don't fail."""
+    with patch.object(asgi_api, "DB_CONNECTED", False):
+        assert call("POST", "/analyze", b'{"text": ""}')[0] == 400
+        assert call("POST", "/analyze", b"not json")[0] == 400
+        assert call("GET", "/analyze")[0] == 405
+        assert call("POST", "/stats", b"{}")[0] == 404
+        with patch.object(asgi_api.api, "MAX_TEXT_CHARS", 3):
+            assert call("POST", "/analyze", b'{"text": "long"}')[0] == 413
+    with patch.object(asgi_api, "analyses", MemoryCollection(fail=True)), patch.object(
+        asgi_api, "DB_CONNECTED", True
+    ):
+        status, _, body = call("POST", "/analyze", b'{"text": "still fine"}')
+    assert status == 200 and body["text"] == "still fine"
+
+
+def test_body_limit_and_client_disconnect():
+    """Oversized bodies get 413; a client that leaves mid-body gets no answer."""
+    limit = asgi_api.api.app.config["MAX_CONTENT_LENGTH"]
+    assert call("POST", "/analyze", b"x" * (limit + 1), chunk_size=limit)[0] == 413
+
+    messages = [
+        {"type": "http.request", "body": b'{"text": ', "more_body": True},
+        {"type": "http.disconnect"},
+    ]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "POST", "path": "/analyze"}
+    asyncio.run(asgi_api.app(scope, receive, send))
+    assert not sent and not messages
@@ -0,0 +1,83 @@
+"""
+Golden-output guard: every scoring path must reproduce the pinned scores exactly.
+
+The corpus and its scores live in tests/data/golden_corpus.json and are
+regenerated with benchmarks/update_golden.py only when a score change is
+intended. Scores are compared by their float bits, so -0.0 and 0.0 differ.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+from app.vaderSentiment import vaderSentiment
+from app.vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+GOLDEN_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "data", "golden_corpus.json"
+)
+
+with open(GOLDEN_PATH, encoding="utf-8") as golden_file:
+    GOLDEN = json.load(golden_file)
+
+TEXTS = GOLDEN["texts"]
+# sum() became compensated in Python 3.12, which can flip the sign of a zero
+# compound score; across that boundary only the values are compared
+SAME_SUM = GOLDEN["compensated_sum"] == (sys.version_info >= (3, 12))
+
+
+def _pinned(results):
+    """Score dicts as comparable tuples, by bits when the sum() flavour matches."""
+    keys = ("neg", "neu", "pos", "compound")
+    if SAME_SUM:
+        return [tuple(float.hex(float(r[key])) for key in keys) for r in results]
+    return [tuple(r[key] for key in keys) for r in results]
+
+
+def _expected(variant):
+    keys = ("neg", "neu", "pos", "compound")
+    return _pinned(dict(zip(keys, scores)) for scores in GOLDEN["scores"][variant])
+
+
+@pytest.fixture(scope="module", name="mapped_cache")
+def fixture_mapped_cache(tmp_path_factory):
+    """A private lexicon cache directory for the mmap backend."""
+    return str(tmp_path_factory.mktemp("lexicon_cache"))
+
+
+@pytest.mark.parametrize("backend", ["dict", "compact", "mmap"])
+@pytest.mark.parametrize("variant", sorted(GOLDEN["variants"]))
+def test_polarity_scores_match_golden(variant, backend, mapped_cache, monkeypatch):
+    """polarity_scores reproduces the golden corpus on every lexicon backend."""
+    monkeypatch.setattr(vaderSentiment, "LEXICON_CACHE_DIR", mapped_cache)
+    scorer = SentimentIntensityAnalyzer(
+        lexicon_backend=backend, **GOLDEN["variants"][variant]
+    )
+    assert _pinned(map(scorer.polarity_scores, TEXTS)) == _expected(variant)
+
+
+@pytest.mark.parametrize("variant", sorted(GOLDEN["variants"]))
+def test_batch_and_session_paths_match_golden(variant):
+    """Batch, cached and incremental scoring reproduce the golden corpus."""
+    options = GOLDEN["variants"][variant]
+    scorer = SentimentIntensityAnalyzer(**options)
+    cached = SentimentIntensityAnalyzer(cache=vaderSentiment.ScoreCache(), **options)
+    expected = _expected(variant)
+    assert _pinned(scorer.polarity_scores_batch(TEXTS)) == expected
+    assert _pinned(cached.polarity_scores_batch(TEXTS + TEXTS)) == expected + expected
+
+    session_scores = []
+    for text in TEXTS:
+        session = scorer.session()
+        session.append(text)
+        session_scores.append(session.scores())
+    assert _pinned(session_scores) == expected
+
+
+def test_vectorized_path_matches_golden():
+    """polarity_scores_vectorized reproduces the golden corpus."""
+    pytest.importorskip("numpy")
+    scorer = SentimentIntensityAnalyzer()
+    assert _pinned(scorer.polarity_scores_vectorized(TEXTS)) == _expected("default")
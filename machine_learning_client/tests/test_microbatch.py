@@ -0,0 +1,68 @@
+"""Unit tests for the adaptive micro-batcher in app/microbatch.py"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.microbatch import MicroBatcher
+
+
+def test_concurrent_submits_share_batches_and_get_their_own_results():
+    """Items arriving together go to one handler call, results in order."""
+    calls = []
+
+    def handler(items):
+        calls.append(list(items))
+        return [item * 10 for item in items]
+
+    batcher = MicroBatcher(handler, max_batch=8, max_wait=0.2)
+    # pretend a busy arrival rate so every batch waits to fill up
+    batcher._mean_gap = 0.0  # pylint: disable=protected-access
+    with ThreadPoolExecutor(20) as pool:
+        results = list(pool.map(batcher.submit, range(20)))
+    assert results == [n * 10 for n in range(20)]
+    assert sorted(item for call in calls for item in call) == list(range(20))
+    assert max(len(call) for call in calls) == 8
+    assert batcher.stats()["batches"] == len(calls) < 20
+
+
+def test_window_closes_at_low_load():
+    """Sequential submits never wait, and fruitless waits shrink the window."""
+    batcher = MicroBatcher(lambda items: items, max_batch=8, max_wait=0.05)
+    assert batcher.window() == 0.0
+    for n in range(5):
+        assert batcher.submit(n) == n
+    stats = batcher.stats()
+    assert stats["waited"] == 0 and stats["largest"] == 1
+
+    # at a high arrival rate a partial batch waits; gathering nothing halves it
+    batcher._mean_gap = 0.0  # pylint: disable=protected-access
+    batcher.submit(1)
+    assert batcher.stats()["waited"] == 1
+    assert batcher._window == 0.025  # pylint: disable=protected-access
+
+
+def test_handler_errors_reach_every_caller():
+    """An exception in the handler is raised from each submit of the batch."""
+
+    def handler(items):
+        raise ValueError(f"bad batch of {len(items)}")
+
+    batcher = MicroBatcher(handler)
+    with pytest.raises(ValueError):
+        batcher.submit("x")
+
+
+def test_exception_results_are_raised_for_their_item_only():
+    """A handler can fail single items by returning an exception for them."""
+
+    def handler(items):
+        return [KeyError(item) if item == "bad" else item.upper() for item in items]
+
+    batcher = MicroBatcher(handler, max_batch=8, max_wait=0.2)
+    batcher._mean_gap = 0.0  # pylint: disable=protected-access
+    with ThreadPoolExecutor(3) as pool:
+        futures = [pool.submit(batcher.submit, item) for item in ("a", "bad", "c")]
+    assert [futures[0].result(), futures[2].result()] == ["A", "C"]
+    with pytest.raises(KeyError):
+        futures[1].result()
@@ -0,0 +1,60 @@
+"""Unit tests for the streaming bulk-scoring pipeline in app/stream_score.py"""
+
+import csv
+import io
+import json
+
+from app import stream_score
+
+
+def test_ndjson_round_trip_keeps_input_fields(tmp_path, capsys):
+    """NDJSON records keep their fields and gain scores, color and interpretation."""
+    source = tmp_path / "in.ndjson"
+    source.write_text(
+        '{"id": 1, "text": "I love this"}\n\n"this is awful!!"\n', encoding="utf-8"
+    )
+    target = tmp_path / "out.ndjson"
+
+    stream_score.main([str(source), "-o", str(target)])
+
+    rows = [
+        json.loads(line) for line in target.read_text(encoding="utf-8").splitlines()
+    ]
+    assert [row.get("id") for row in rows] == [1, None]
+    assert rows[0]["color"] == "orange"
+    assert rows[1]["scores"]["compound"] < 0
+    assert "done: 2 texts" in capsys.readouterr().err
+
+
+def test_csv_in_csv_out_flattens_scores(tmp_path):
+    """CSV input with a custom text column is written back with score columns."""
+    source = tmp_path / "in.csv"
+    source.write_text('id,body\n1,great day\n2,"bad, sad"\n', encoding="utf-8")
+    target = tmp_path / "out.csv"
+
+    stream_score.main(
+        [str(source), "-o", str(target), "--text-field", "body"]
+        + ["--output-format", "csv"]
+    )
+
+    with open(target, encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["id"] for row in rows] == ["1", "2"]
+    assert set(rows[0]) >= {"neg", "neu", "pos", "compound", "color"}
+    assert rows[1]["color"] == "black"
+
+
+def test_read_records_is_lazy():
+    """Records are produced one line at a time from the stream."""
+    stream = io.StringIO("first\nsecond\n")
+    records = stream_score.read_records(stream, "text")
+    assert next(records) == {"text": "first"}
+    assert stream.tell() < len("first\nsecond\n")
+
+
+def test_malformed_ndjson_lines_are_skipped(capsys):
+    """Lines that are not JSON are reported with their number and skipped."""
+    stream = io.StringIO('{"text": "good"}\n{"text": \n\n"fine"\n')
+    records = list(stream_score.read_records(stream, "ndjson"))
+    assert records == [{"text": "good"}, {"text": "fine"}]
+    assert "skipping line 2:" in capsys.readouterr().err
@@ -0,0 +1,118 @@
+"""Unit tests for the deduplicated score store in app/text_store.py"""
+
+from datetime import datetime, timezone
+
+from pymongo.errors import BulkWriteError
+
+from app.text_store import TextStore, lexicon_key, text_hash
+from app.vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+
+class MemoryTexts:
+    """In-memory stand-in for the texts collection (find and bulk_write)."""
+
+    def __init__(self, failing=()):
+        self.entries = {}
+        self.writes = 0
+        self.failing = failing
+
+    def find(self, query, projection=None):  # pylint: disable=unused-argument
+        """Entries whose text_id is in the $in list and fingerprint matches."""
+        return [
+            entry
+            for (digest, fingerprint), entry in self.entries.items()
+            if digest in query["text_id"]["$in"]
+            and fingerprint == query["lexicon_fingerprint"]
+        ]
+
+    def bulk_write(self, requests, ordered=True):
+        """Apply UpdateOne upserts."""
+        assert not ordered
+        self.writes += len(requests)
+        for i, request in enumerate(requests):
+            if i in self.failing:
+                continue
+            document = request._doc  # pylint: disable=protected-access
+            key = request._filter  # pylint: disable=protected-access
+            assert set(document) == {"$setOnInsert"}
+            self.entries.setdefault(
+                (key["text_id"], key["lexicon_fingerprint"]),
+                dict(document["$setOnInsert"], **key),
+            )
+        if self.failing:
+            raise BulkWriteError(
+                {"writeErrors": [{"index": i, "errmsg": "E"} for i in self.failing]}
+            )
+
+
+def test_scores_each_distinct_text_once_per_lexicon():
+    """Repeats and later calls read stored scores; a new lexicon rescores."""
+    collection = MemoryTexts()
+    store = TextStore(collection, lambda scores: {"label": scores["compound"] > 0})
+    analyzer = SentimentIntensityAnalyzer()
+    texts = ["I love it", "I hate it", "I love it"]
+
+    first, stored = store.scores(analyzer, texts)
+    assert first == analyzer.polarity_scores_batch(texts)
+    assert stored == {text_hash("I love it"), text_hash("I hate it")}
+    assert collection.writes == 2
+    entry = collection.entries[(text_hash("I love it"), lexicon_key(analyzer))]
+    assert entry["text"] == "I love it" and entry["label"] is True
+
+    assert store.scores(analyzer, texts) == (first, stored)
+    assert collection.writes == 2
+
+    swapped = analyzer.with_lexicon_overlay({"love": -3.0}, "v2")
+    rescored, _ = store.scores(swapped, ["I love it"])
+    assert rescored[0]["compound"] < 0 and collection.writes == 3
+    # the old lexicon's entry, which older analyses reference, is untouched
+    assert entry["scores"] == first[0] and entry["label"] is True
+    key = (text_hash("I love it"), lexicon_key(swapped))
+    assert collection.entries[key]["label"] is False
+    assert store.scores(analyzer, ["I love it"])[0] == first[:1]
+
+    # a reused version label with other overrides doesn't serve stale scores
+    relabeled = analyzer.with_lexicon_overlay({"love": 3.0}, "v2")
+    assert store.scores(relabeled, ["I love it"])[0][0]["compound"] > 0
+
+
+def test_lone_surrogates_hash_and_score():
+    """Texts with lone surrogates (valid JSON escapes) don't raise."""
+    collection = MemoryTexts()
+    analyzer = SentimentIntensityAnalyzer()
+    text = "good \ud800 day"
+    assert text_hash(text) != text_hash("good  day")
+    assert TextStore(collection).scores(analyzer, [text]) == (
+        [analyzer.polarity_scores(text)],
+        {text_hash(text)},
+    )
+
+
+def test_database_errors_fall_back_to_scoring():
+    """A failing collection still yields scores, and references are tiny."""
+
+    class BrokenTexts:  # pylint: disable=too-few-public-methods
+        """Collection whose every call fails."""
+
+        def __getattr__(self, name):
+            raise RuntimeError("Mock DB fail")
+
+    analyzer = SentimentIntensityAnalyzer()
+    scores, stored = TextStore(BrokenTexts()).scores(analyzer, ["fine"])
+    assert scores == [analyzer.polarity_scores("fine")] and not stored
+    timestamp = datetime.now(timezone.utc)
+    assert TextStore.reference("fine", analyzer, timestamp) == {
+        "text_id": text_hash("fine"),
+        "lexicon_fingerprint": lexicon_key(analyzer),
+        "lexicon_version": analyzer.lexicon_version,
+        "timestamp": timestamp,
+    }
+
+
+def test_only_saved_texts_are_reported_stored():
+    """Entries the bulk write rejected are left out of the stored digests."""
+    collection = MemoryTexts(failing={1})
+    analyzer = SentimentIntensityAnalyzer()
+    scores, stored = TextStore(collection).scores(analyzer, ["good", "bad"])
+    assert scores == analyzer.polarity_scores_batch(["good", "bad"])
+    assert stored == {text_hash("good")}
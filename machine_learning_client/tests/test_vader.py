@@ -0,0 +1,526 @@
+"""Unit tests for the bundled VADER engine in app/vaderSentiment."""
+
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from pytest import approx
+
+from app.vaderSentiment import vaderSentiment
+from app.vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+analyzer = SentimentIntensityAnalyzer()
+
+SAMPLES = [
+    "VADER is smart, handsome, and funny.",
+    "VADER is VERY SMART, uber handsome, and FRIGGIN FUNNY!!!",
+    "At least it isn't a horrible book.",
+    "The plot was good, but the characters are uncompelling.",
+    "Today only kinda sux! But I'll get by, lol",
+    "Catch utf-8 emoji such as 💘 and 💋 and 😁",
+    "",
+    "The book was good.",
+]
+
+
+def test_batch_matches_single_text_path():
+    """polarity_scores_batch returns the single-text results in input order."""
+    texts = SAMPLES + SAMPLES[::-1]
+    expected = [analyzer.polarity_scores(text) for text in texts]
+    assert analyzer.polarity_scores_batch(texts) == expected
+
+
+def test_iter_polarity_scores_is_lazy_and_copies_results():
+    """Repeated texts yield independent dicts and the iterator is lazy."""
+    results = analyzer.iter_polarity_scores(iter(["good", "good"]))
+    first = next(results)
+    first["compound"] = 99
+    assert next(results) == analyzer.polarity_scores("good")
+
+
+def _write_lexicons(tmp_path, lexicon_text):
+    """Write a tiny lexicon/emoji pair and return their paths."""
+    lexicon = tmp_path / "lexicon.txt"
+    lexicon.write_text(lexicon_text, encoding="utf-8")
+    emojis = tmp_path / "emoji.txt"
+    emojis.write_text("😁\tbeaming face\n", encoding="utf-8")
+    return str(lexicon), str(emojis)
+
+
+def test_compiled_lexicon_is_rebuilt_when_sources_change(tmp_path, monkeypatch):
+    """The compiled artifact is keyed by source hash, so edits are picked up."""
+    monkeypatch.setattr(vaderSentiment, "LEXICON_CACHE_DIR", str(tmp_path / "cache"))
+    lexicon, emojis = _write_lexicons(tmp_path, "good\t1.9\t0.9\t[1]\n")
+
+    first = SentimentIntensityAnalyzer(lexicon, emojis)
+    cached = SentimentIntensityAnalyzer(lexicon, emojis)
+    assert first.lexicon == cached.lexicon == {"good": 1.9}
+    assert len(list((tmp_path / "cache").iterdir())) == 1
+    assert not hasattr(cached, "lexicon_full_filepath")
+    # without text, the make_*_dict helpers still read the analyzer's files
+    assert cached.make_lex_dict() == {"good": 1.9}
+    assert cached.make_emoji_dict() == {"😁": "beaming face"}
+
+    _write_lexicons(tmp_path, "good\t-2.0\t0.9\t[1]\n")
+    changed = SentimentIntensityAnalyzer(lexicon, emojis)
+    assert changed.lexicon == {"good": -2.0}
+    assert changed.lexicon_fingerprint != first.lexicon_fingerprint
+
+
+def test_emoji_replacer_matches_multi_codepoint_emoji():
+    """ZWJ sequences, skin tones and flags map to a single description."""
+    replace = analyzer.emoji_replacer.replace
+    assert replace("👩‍💻").split() == ["woman", "technologist"]
+    assert replace("👍🏽").split() == ["thumbs", "up:", "medium", "skin", "tone"]
+    assert replace("🇺🇸🇫🇷").split() == ["United", "States", "France"]
+    assert replace("❤️love").split() == ["red", "heartlove"]
+
+
+def test_emoji_replacer_keeps_single_codepoint_spacing():
+    """A description is glued to following text but spaced from preceding text."""
+    replace = analyzer.emoji_replacer.replace
+    assert replace("a😁b").split() == [
+        "a",
+        "beaming",
+        "face",
+        "with",
+        "smiling",
+        "eyesb",
+    ]
+    assert replace("no emoji here 2025") == "no emoji here 2025"
+
+
+def test_sentitext_precomputes_token_features():
+    """SentiText exposes per-token lowercase, caps, lexicon, booster and negation."""
+    sentitext = vaderSentiment.SentiText("NOT very GOOD, kinda okay", analyzer.lexicon)
+    assert sentitext.words_lower == ["not", "very", "good", "kinda", "okay"]
+    assert sentitext.is_upper == [True, False, True, False, False]
+    assert sentitext.valences[2] == analyzer.lexicon["good"]
+    assert sentitext.valences[1] is None
+    assert sentitext.boosters[1] == vaderSentiment.B_INCR
+    assert sentitext.boosters[3] == vaderSentiment.B_DECR
+    assert sentitext.is_negation == [True, False, False, False, False]
+    assert sentitext.is_cap_diff
+
+
+def test_but_check_scales_by_position_not_value():
+    """Equal valences on both sides of 'but' are scaled by their own position."""
+    words = ["good", "but", "good"]
+    assert SentimentIntensityAnalyzer._but_check(  # pylint: disable=protected-access
+        words, [1.9, 0, 1.9]
+    ) == [0.95, 0, 1.9 * 1.5]
+
+
+def test_multi_but_pivots_on_last_but():
+    """multi_but lets the clause after the final 'but' dominate."""
+    words = ["good", "but", "bad", "but", "great"]
+    sentiments = [1.9, 0, -2.5, 0, 3.1]
+    classic = SentimentIntensityAnalyzer._but_check(  # pylint: disable=protected-access
+        words, list(sentiments)
+    )
+    multi = SentimentIntensityAnalyzer._but_check(  # pylint: disable=protected-access
+        words, list(sentiments), multi_but=True
+    )
+    assert classic == [0.95, 0, -3.75, 0, 3.1 * 1.5]
+    assert multi == [0.95, 0, -1.25, 0, 3.1 * 1.5]
+    text = "good but bad but great"
+    assert (
+        SentimentIntensityAnalyzer(multi_but=True).polarity_scores(text)["compound"]
+        > analyzer.polarity_scores(text)["compound"]
+    )
+
+
+def test_negated_keeps_its_public_behavior():
+    """negated() still accepts any word list and honours include_nt."""
+    assert vaderSentiment.negated(["I", "NEVER", "do"])
+    assert vaderSentiment.negated(["it", "mayn't"])
+    assert not vaderSentiment.negated(["it", "mayn't"], include_nt=False)
+    assert not vaderSentiment.negated(["fine", "by", "me"])
+    assert vaderSentiment.NEGATE_SET == frozenset(vaderSentiment.NEGATE)
+
+
+def test_score_cache_lru_eviction_and_counters():
+    """The cache evicts least recently used entries and counts hits/misses."""
+    cache = vaderSentiment.ScoreCache(max_entries=2)
+    scores = {"neg": 0.0, "neu": 1.0, "pos": 0.0, "compound": 0.0}
+    cache.put("a", "v1", scores)
+    cache.put("b", "v1", scores)
+    assert cache.get("a", "v1") == scores
+    cache.put("c", "v1", scores)
+    assert cache.get("b", "v1") is None
+    assert cache.get("c", "v1") == scores
+    stats = cache.stats()
+    assert (stats["entries"], stats["hits"], stats["misses"]) == (2, 2, 1)
+    assert stats["evictions"] == 1
+    assert 0 < stats["bytes"] <= stats["max_bytes"]
+
+
+def test_score_cache_respects_byte_budget_and_lexicon_changes():
+    """A tight byte budget bounds entries; a new fingerprint empties the cache."""
+    scores = {"neg": 0.0, "neu": 1.0, "pos": 0.0, "compound": 0.0}
+    cache = vaderSentiment.ScoreCache(max_entries=100, max_bytes=1000)
+    for i in range(20):
+        cache.put(str(i), "v1", scores)
+    assert cache.stats()["bytes"] <= 1000
+    assert cache.stats()["entries"] < 20
+    assert cache.get("19", "v2") is None
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_analyzer_serves_repeats_from_cache():
+    """polarity_scores consults the cache and returns independent copies."""
+    cached = SentimentIntensityAnalyzer(cache=vaderSentiment.ScoreCache())
+    first = cached.polarity_scores("The book was good.")
+    first["compound"] = 99
+    assert cached.polarity_scores("The book was good.") == analyzer.polarity_scores(
+        "The book was good."
+    )
+    assert cached.cache.stats()["hits"] == 1
+
+
+def test_shared_cache_keeps_scoring_options_apart():
+    """Analyzers with other multi_but or idiom settings never share entries."""
+    cache = vaderSentiment.ScoreCache()
+    text = "The food was good but the service was bad but the view was great"
+    for options in ({}, {"multi_but": True}, {"sentiment_laden_idioms": True}):
+        scorer = SentimentIntensityAnalyzer(cache=cache, **options)
+        uncached = SentimentIntensityAnalyzer(**options)
+        assert scorer.polarity_scores(text) == uncached.polarity_scores(text)
+    assert cache.stats()["hits"] == 0
+
+
+def test_phrase_matcher_finds_every_span_in_one_pass():
+    """Spans are reported per table as (start, length) -> value."""
+    matcher = analyzer.phrase_matcher
+    spans = matcher.match("that was kind of the bomb".split())
+    assert spans["special_cases"] == {(4, 2): 3}
+    assert spans["boosters"] == {(2, 2): vaderSentiment.B_DECR}
+    assert spans["idioms"] == {}
+
+
+def test_sentiment_laden_idioms_are_opt_in(capsys):
+    """Idioms without lexicon words only score when enabled, and never print."""
+    text = "I am under the weather today"
+    idiomatic = SentimentIntensityAnalyzer(sentiment_laden_idioms=True)
+    assert analyzer.polarity_scores(text)["compound"] == 0.0
+    assert idiomatic.polarity_scores(text)["compound"] < 0
+    assert idiomatic._sentiment_laden_idioms_check(  # pylint: disable=protected-access
+        0.0, "cooking with gas and on the ball"
+    ) == approx(2.0)
+    assert capsys.readouterr().out == ""
+
+
+@pytest.mark.parametrize("start_method", ["fork", "spawn"])
+def test_score_corpus_streams_results_in_order(start_method):
+    """score_corpus matches the in-process path under fork and spawn."""
+    texts = (SAMPLES[i % len(SAMPLES)] + f" #{i}" for i in range(300))
+    expected = [
+        analyzer.polarity_scores(SAMPLES[i % len(SAMPLES)] + f" #{i}")
+        for i in range(300)
+    ]
+    results = vaderSentiment.score_corpus(
+        texts, workers=2, chunk_size=16, start_method=start_method
+    )
+    assert list(results) == expected
+
+
+def test_score_corpus_single_worker_runs_in_process():
+    """workers=1 skips the pool entirely."""
+    assert list(vaderSentiment.score_corpus(iter(SAMPLES), workers=1)) == [
+        analyzer.polarity_scores(text) for text in SAMPLES
+    ]
+
+
+def test_mapped_lexicon_round_trips_the_dict(tmp_path):
+    """The mapped file answers lookups, membership and iteration like the dict."""
+    lexicon = {"good": 1.9, "bad": -2.5, "¡olé!": 0.3}
+    path = str(tmp_path / "lexicon.vlex")
+    vaderSentiment.MappedLexicon.build(lexicon, path)
+    mapped = vaderSentiment.MappedLexicon(path, memo_size=2)
+    assert mapped == lexicon
+    assert mapped["¡olé!"] == 0.3
+    assert "meh" not in mapped and mapped.get("meh", 0) == 0
+    assert mapped.lookup_many(["bad", "meh", "good", "bad"]) == [-2.5, None, 1.9, -2.5]
+    with pytest.raises(KeyError):
+        _ = mapped["meh"]
+
+
+def test_packed_lexicon_lookups_are_thread_safe(tmp_path):
+    """Threads clearing the shared memo don't break each other's lookups."""
+    words = sorted(analyzer.lexicon)[:2000] + ["qwerty", "zxcvb"]
+    path = str(tmp_path / "lexicon.vlex")
+    vaderSentiment.MappedLexicon.build(analyzer.lexicon, path)
+    lexicons = [
+        vaderSentiment.CompactLexicon(analyzer.lexicon, memo_size=64),
+        vaderSentiment.MappedLexicon(path, memo_size=64),
+    ]
+
+    def hammer(lexicon, seed):
+        rng = random.Random(seed)
+        for _ in range(300):
+            batch = rng.sample(words, 40)
+            expected = [analyzer.lexicon.get(word) for word in batch]
+            assert lexicon.lookup_many(batch) == expected
+
+    for lexicon in lexicons:
+        with ThreadPoolExecutor(8) as pool:
+            for future in [pool.submit(hammer, lexicon, seed) for seed in range(8)]:
+                future.result()
+
+
+def test_mmap_backend_scores_like_the_dict_backend(tmp_path, monkeypatch):
+    """lexicon_backend="mmap" maps a shared file and keeps every score."""
+    monkeypatch.setattr(vaderSentiment, "LEXICON_CACHE_DIR", str(tmp_path))
+    built = SentimentIntensityAnalyzer(lexicon_backend="mmap")
+    mapped = SentimentIntensityAnalyzer(lexicon_backend="mmap")
+    assert isinstance(mapped.lexicon, vaderSentiment.MappedLexicon)
+    assert mapped.lexicon == built.lexicon == analyzer.lexicon
+    assert mapped.polarity_scores_batch(SAMPLES) == analyzer.polarity_scores_batch(
+        SAMPLES
+    )
+    with pytest.raises(ValueError):
+        SentimentIntensityAnalyzer(lexicon_backend="shelve")
+
+
+def test_compact_lexicon_is_smaller_and_scores_the_same():
+    """The compact backend keeps lookups, scores and reports a smaller footprint."""
+    compact = SentimentIntensityAnalyzer(lexicon_backend="compact")
+    assert isinstance(compact.lexicon, vaderSentiment.CompactLexicon)
+    assert compact.lexicon == analyzer.lexicon
+    assert "good" in compact.lexicon and "qwerty" not in compact.lexicon
+    assert compact.lexicon["good"] == analyzer.lexicon["good"]
+    assert vaderSentiment.lexicon_memory_bytes(
+        compact.lexicon
+    ) < vaderSentiment.lexicon_memory_bytes(analyzer.lexicon)
+    assert compact.polarity_scores_batch(SAMPLES) == analyzer.polarity_scores_batch(
+        SAMPLES
+    )
+
+
+def test_vectorized_aggregation_matches_score_valence():
+    """score_valence_batch agrees with score_valence per text to 1e-12."""
+    pytest.importorskip("numpy")
+    texts = SAMPLES + ["Wow!!!! great??", "bad?? no!!", "meh ???? ok"]
+    assert analyzer.polarity_scores_vectorized(texts) == [
+        analyzer.polarity_scores(text) for text in texts
+    ]
+    runs = [
+        analyzer._sentiments(text) for text in texts  # pylint: disable=protected-access
+    ]
+    neg, neu, pos, compound = vaderSentiment.score_valence_batch(
+        [value for sentiments, _ in runs for value in sentiments],
+        [len(sentiments) for sentiments, _ in runs],
+        [text.count("!") for _, text in runs],
+        [text.count("?") for _, text in runs],
+    )
+    for i, (sentiments, text) in enumerate(runs):
+        if not sentiments:
+            continue
+        sum_s = float(sum(sentiments))
+        amplifier = analyzer._punctuation_emphasis(  # pylint: disable=protected-access
+            text
+        )
+        sum_s += amplifier if sum_s > 0 else -amplifier if sum_s < 0 else 0
+        assert compound[i] == approx(vaderSentiment.normalize(sum_s), abs=1e-12)
+        assert neg[i] + neu[i] + pos[i] == approx(1.0, abs=1e-12)
+
+
+@pytest.mark.parametrize(
+    "options", [{}, {"multi_but": True}, {"sentiment_laden_idioms": True}]
+)
+def test_session_matches_full_rescore_after_every_chunk(options):
+    """Appending chunks gives the same scores as rescoring the whole prefix."""
+    scorer = SentimentIntensityAnalyzer(**options)
+    text = (
+        "It was GOOD but not great!! No no good 😁👍🏽 kind of the bomb, "
+        "under the weather but at least it isn't horrible??? but ok"
+    )
+    session = scorer.session()
+    for end in range(0, len(text), 3):
+        assert session.append(text[end : end + 3]) == scorer.polarity_scores(
+            text[: end + 3]
+        )
+
+
+def test_session_update_restarts_when_text_is_edited():
+    """update() appends the new suffix, or starts over after an edit."""
+    session = analyzer.session()
+    assert session.update("The book was") == analyzer.polarity_scores("The book was")
+    assert session.update("The book was good") == analyzer.polarity_scores(
+        "The book was good"
+    )
+    assert session.update("The book was bad") == analyzer.polarity_scores(
+        "The book was bad"
+    )
+    assert session.text == "The book was bad"
+
+
+def test_split_sentences_handles_abbreviations_and_paragraphs():
+    """Terminators split sentences; abbreviations, initials and decimals don't."""
+    text = (
+        'Mr. Smith met Dr. J. Doe at 3.14 pm... "Wow!" she said. Great!!\n\n'
+        "no period here\nstill the same paragraph"
+    )
+    assert vaderSentiment.split_sentences(text) == [
+        "Mr. Smith met Dr. J. Doe at 3.14 pm...",
+        '"Wow!" she said.',
+        "Great!!",
+        "no period here\nstill the same paragraph",
+    ]
+    assert not vaderSentiment.split_sentences("  \n\n ")
+
+
+@pytest.mark.parametrize(
+    "options", [{}, {"workers": 2}, {"workers": 2, "pool": "process"}]
+)
+def test_document_scores_per_sentence_and_aggregated(options):
+    """Sentence scores equal polarity_scores; the document aggregates them."""
+    paragraph = "The movie was bad. Very bad movie. VERY GOOD popcorn though!"
+    document = analyzer.document_scores(paragraph, **options)
+    sentences = [item["text"] for item in document["sentences"]]
+    assert sentences == vaderSentiment.split_sentences(paragraph)
+    compounds = [analyzer.polarity_scores(s)["compound"] for s in sentences]
+    assert [item["scores"]["compound"] for item in document["sentences"]] == compounds
+    assert document["document"]["compound"] == round(sum(compounds) / 3, 4)
+
+
+def test_document_aggregates():
+    """length_weighted weights by tokens; max_magnitude keeps the strongest."""
+    weak = {"neg": 0.0, "neu": 1.0, "pos": 0.0, "compound": 0.1}
+    strong = {"neg": 0.8, "neu": 0.2, "pos": 0.0, "compound": -0.9}
+    aggregate = vaderSentiment.aggregate_scores
+    assert aggregate([weak, strong], [3, 1], "length_weighted")["compound"] == -0.15
+    assert aggregate([weak, strong], [3, 1], "max_magnitude") == strong
+    assert aggregate([], [], "mean")["compound"] == 0.0
+    with pytest.raises(ValueError):
+        analyzer.document_scores("Fine.", aggregate="median")
+    with pytest.raises(ValueError):
+        analyzer.document_scores("Fine.", workers=0)
+
+
+def test_instrumentation_counts_stages_and_is_removable():
+    """Instrumented scores are unchanged; disabling restores the plain methods."""
+    instrumented = SentimentIntensityAnalyzer(instrument=True)
+    assert instrumented.polarity_scores_batch(
+        SAMPLES
+    ) == analyzer.polarity_scores_batch(SAMPLES)
+    snapshot = instrumented.instrumentation_snapshot(reset=True)
+    stages = snapshot["stages"]
+    assert set(stages) == set(vaderSentiment.RuleTimer.STAGES)
+    assert stages["emoji"]["calls"] == len(SAMPLES)
+    # splitting and the neutral prefilter have their stages, not "other"
+    assert stages["tokenize"]["calls"] >= len(SAMPLES)
+    assert stages["lexicon"]["calls"] >= len(SAMPLES)
+    # texts answered by the neutral prefilter skip the rule stages
+    neutral = instrumented.scoring_stats()["neutral_fast_path"]
+    assert stages["aggregate"]["calls"] == len(SAMPLES) - neutral
+    assert stages["rules"]["calls"] > len(SAMPLES)
+    assert snapshot["total_ns"] == sum(stage["ns"] for stage in stages.values())
+    assert instrumented.instrumentation_snapshot()["total_ns"] == 0
+
+    assert instrumented.disable_instrumentation() is not None
+    assert isinstance(instrumented.lexicon, dict)
+    assert "sentiment_valence" not in vars(instrumented)
+    assert instrumented.instrumentation_snapshot() is None
+
+
+def test_lexicon_overlay_shares_the_base_and_changes_only_overrides():
+    """Overlays patch a few words, keep the base shared and key the cache apart."""
+    cached = SentimentIntensityAnalyzer(cache=vaderSentiment.ScoreCache())
+    before = cached.polarity_scores("The service was sick")
+    overlaid = cached.with_lexicon_overlay(
+        {"sick": 2, "good": None, "qwerty": 1.5}, version="v2"
+    )
+    lexicon = overlaid.lexicon
+    assert overlaid.base_lexicon is cached.lexicon
+    assert overlaid.lexicon_version == "v2"
+    assert overlaid.lexicon_fingerprint != cached.lexicon_fingerprint
+    assert lexicon["sick"] == 2.0 and "good" not in lexicon and "qwerty" in lexicon
+    assert len(lexicon) == len(list(lexicon)) == len(cached.lexicon)
+    assert lexicon.lookup_many(["good", "sick", "bad"]) == [
+        None,
+        2.0,
+        cached.lexicon["bad"],
+    ]
+    assert overlaid.polarity_scores("The service was sick")["compound"] > 0
+    assert cached.polarity_scores("The service was sick") == before
+    rebuilt = SentimentIntensityAnalyzer(lexicon_overlay={"sick": 2.0, "good": None})
+    assert overlaid.with_lexicon_overlay({"sick": 2.0, "good": None}).polarity_scores(
+        "good, sick qwerty"
+    ) == rebuilt.polarity_scores("good, sick qwerty")
+    assert overlaid.with_lexicon_overlay({}).lexicon is cached.lexicon
+
+
+def test_split_chunks_bounds_length_and_prefers_sentence_ends():
+    """Chunks fit the limit, end at sentences or tokens and keep every token."""
+    text = "Good movie. Bad plot!  Great cast, awful ending? " + "x" * 25 + " fine"
+    chunks = vaderSentiment.split_chunks(text, 20)
+    assert chunks == [
+        "Good movie.",
+        "Bad plot!",
+        "Great cast, awful",
+        "ending?",
+        "x" * 20,
+        "xxxxx fine",
+    ]
+    assert vaderSentiment.split_chunks("  \n ", 5) == []
+    # long runs without whitespace or of punctuation are split in linear time
+    assert vaderSentiment.split_sentences("a" * 100000 + " " + "." * 100000) == [
+        "a" * 100000 + " " + "." * 100000
+    ]
+
+
+def test_chunked_scores_combine_chunks_and_stop_at_the_deadline():
+    """Chunks are length-weighted; past the deadline only a prefix is scored."""
+    text = "The plot was good. " * 40 + "The ending was horrible! " * 10
+    full = analyzer.chunked_scores(text, max_chunk_chars=100)
+    assert full["complete"] and full["scored_chunks"] == full["chunks"] > 1
+    assert full["document"]["compound"] > 0
+    with ThreadPoolExecutor(2) as executor:
+        assert analyzer.chunked_scores(text, 100, executor=executor) == full
+    expired = analyzer.chunked_scores(text, 100, deadline=time.monotonic() - 1)
+    assert expired["scored_chunks"] == 0 and not expired["complete"]
+
+
+class _CountingExecutor(ThreadPoolExecutor):
+    """Thread pool that counts the calls submitted to it."""
+
+    submitted = 0
+
+    def submit(self, *args, **kwargs):  # pylint: disable=arguments-differ
+        self.submitted += 1
+        return super().submit(*args, **kwargs)
+
+
+def test_chunked_scores_bound_the_work_submitted_past_the_deadline():
+    """At most one batch per worker is in flight when the deadline passes."""
+    # distinct chunks, so the score cache can't answer them
+    text = " ".join(f"The plot {i} was good." for i in range(8000))
+    with _CountingExecutor(2) as executor:
+        result = analyzer.chunked_scores(
+            text, 100, deadline=time.monotonic() + 0.01, executor=executor
+        )
+    assert result["chunks"] > 8 * executor.submitted
+    assert executor.submitted <= -(-result["scored_chunks"] // 8) + 2
+
+
+def test_neutral_prefilter_matches_the_full_rule_pass():
+    """Texts without sentiment tokens skip the rule pass with identical scores."""
+    texts = [
+        "",
+        "The meeting is at 3pm in room B, but bring the slides.",
+        "very very kind of not",
+        "under the weather",
+        "📅 tomorrow",
+        "The plot was good.",
+    ]
+    # with idioms on, "in" and "under" may start one and take the full pass
+    for options, neutral in (({}, 4), ({"sentiment_laden_idioms": True}, 2)):
+        fast = SentimentIntensityAnalyzer(**options)
+        full = SentimentIntensityAnalyzer(**options)
+        full.prefilter_neutral = False
+        assert fast.polarity_scores_batch(texts) == full.polarity_scores_batch(texts)
+        assert fast.scoring_stats()["neutral_fast_path"] == neutral
+        assert fast.scoring_stats()["rule_passes"] == len(texts) - neutral
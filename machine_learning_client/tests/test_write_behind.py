@@ -0,0 +1,92 @@
+"""Unit tests for the write-behind storage queue in app/write_behind.py"""
+
+import queue
+import threading
+
+import pytest
+from pymongo.errors import BulkWriteError
+
+from app import write_behind
+from app.write_behind import WriteBehindQueue, WriteError
+
+
+class FakeCollection:  # pylint: disable=too-few-public-methods
+    """Records every insert_many batch; can fail some indexes or block."""
+
+    def __init__(self, failing=(), gate=None):
+        self.batches = []
+        self.failing = failing
+        self.gate = gate
+
+    def insert_many(self, documents, ordered=True):
+        """Record the batch, then fail the configured indexes."""
+        assert not ordered
+        if self.gate is not None:
+            self.gate.wait()
+        self.batches.append(list(documents))
+        if self.failing:
+            raise BulkWriteError(
+                {
+                    "writeErrors": [
+                        {"index": i, "errmsg": "E11000"} for i in self.failing
+                    ]
+                }
+            )
+
+
+def test_flushes_full_batches_and_drains_on_close():
+    """Documents go out in batch_size chunks; close() flushes the remainder."""
+    collection = FakeCollection()
+    writer = WriteBehindQueue(collection, batch_size=4, flush_interval=60).start()
+    ids = [writer.write({"n": n}) for n in range(10)]
+    writer.close()
+    assert [len(batch) for batch in collection.batches] == [4, 4, 2]
+    assert [doc["_id"] for batch in collection.batches for doc in batch] == ids
+    stats = writer.stats()
+    assert stats["flushed"] == 10 and stats["flushes"] == 3
+    assert stats["queue_depth"] == 0 and stats["mean_batch"] == pytest.approx(10 / 3)
+    with pytest.raises(RuntimeError):
+        writer.put({"n": 10})
+
+
+def test_flush_durability_waits_and_reports_write_errors():
+    """In flush mode write() returns after the insert and raises per-item errors."""
+    collection = FakeCollection(failing=(1,))
+    writer = WriteBehindQueue(
+        collection, batch_size=3, flush_interval=0.01, durability="flush"
+    ).start()
+    outcomes = writer.write_many([{"n": n} for n in range(3)])
+    assert collection.batches and outcomes[1] == (None, "E11000")
+    assert outcomes[0][0] == collection.batches[0][0]["_id"]
+    collection.failing = (0,)
+    with pytest.raises(WriteError):
+        writer.write({"n": 3})
+    writer.close()
+    assert writer.stats()["failed"] == 2
+
+
+def test_full_queue_blocks_then_rejects():
+    """A stalled database fills the queue, and producers get queue.Full."""
+    gate = threading.Event()
+    collection = FakeCollection(gate=gate)
+    writer = WriteBehindQueue(
+        collection, batch_size=1, max_queue=2, put_timeout=0.01
+    ).start()
+    with pytest.raises(queue.Full):
+        for n in range(4):
+            writer.write({"n": n})
+    assert writer.stats()["rejected"] == 1
+    gate.set()
+    writer.close()
+    assert len(collection.batches) == 3
+
+
+def test_queue_from_env_is_off_by_default():
+    """Only WRITE_BEHIND=1 starts a queue, configured from the environment."""
+    assert write_behind.queue_from_env(FakeCollection(), environ={}) is None
+    writer = write_behind.queue_from_env(
+        FakeCollection(),
+        environ={"WRITE_BEHIND": "1", "WRITE_BEHIND_DURABILITY": "flush"},
+    )
+    assert writer.durability == "flush" and writer.flush_interval == 0.05
+    writer.close()
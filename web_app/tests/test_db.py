@@ -31,9 +31,7 @@ def test_get_recent_analyses_returns_expected_list():
     with patch("web_app.db_connector.MongoClient") as mock_client:
         mock_collection = MagicMock()
         mock_cursor = [{"text": "recent analysis"}]
-        mock_collection.find.return_value.sort.return_value.limit.return_value = (
-            mock_cursor
-        )
+        mock_collection.aggregate.return_value = mock_cursor
 
         mock_db_instance = MagicMock()
         mock_db_instance.analyses = mock_collection
@@ -43,11 +41,43 @@ def test_get_recent_analyses_returns_expected_list():
         result = db.get_recent_analyses(1)
 
         assert result == mock_cursor
-        mock_collection.find.assert_called_once()
-        mock_collection.find.return_value.sort.assert_called_once_with("timestamp", -1)
-        mock_collection.find.return_value.sort.return_value.limit.assert_called_once_with(
-            1
+        mock_collection.aggregate.assert_called_once()
+        pipeline = mock_collection.aggregate.call_args[0][0]
+        assert pipeline[:2] == [{"$sort": {"timestamp": -1}}, {"$limit": 1}]
+        lookup = pipeline[2]["$lookup"]
+        assert lookup["from"] == "texts"
+        assert lookup["let"] == {
+            "text_id": "$text_id",
+            "fingerprint": "$lexicon_fingerprint",
+        }
+
+
+def test_get_analysis_by_id_fills_in_referenced_text():
+    """Test that an analysis holding a text_id gets the stored text's fields."""
+    with patch("web_app.db_connector.MongoClient") as mock_client:
+        mock_db_instance = MagicMock()
+        mock_db_instance.analyses.find_one.return_value = {
+            "_id": "a1",
+            "text_id": "h1",
+            "lexicon_fingerprint": "f1",
+            "lexicon_version": "v1",
+            "timestamp": 1,
+        }
+        mock_db_instance.texts.find_one.return_value = {
+            "text_id": "h1",
+            "lexicon_fingerprint": "f1",
+            "text": "stored once",
+            "color": "blue",
+        }
+        mock_client.return_value.__getitem__.return_value = mock_db_instance
+
+        result = SentimentDB().get_analysis_by_id("65f000000000000000000000")
+
+        mock_db_instance.texts.find_one.assert_called_once_with(
+            {"text_id": "h1", "lexicon_fingerprint": "f1"}, {"_id": 0}
         )
+        assert result["_id"] == "a1" and result["text"] == "stored once"
+        assert result["color"] == "blue" and result["timestamp"] == 1
 
 
 def test_get_analysis_by_id_calls_find_one():